@@ -0,0 +1,238 @@
+"""Turn latency, allocations and DB calls of the game loop, fully offline.
+
+Drives game.setup_game() and N GameSession.play_turn() calls with scripted
+fake crews that answer every task in config/tasks.yaml with canned JSON, and
+either the recording Neo4j stub from bench_scribe_writes (default, counts
+round-trips) or the in-memory / SQLite story store. Nothing touches the
+network, and the same arguments always play the same game, so the numbers
+track the cost of the orchestration code itself.
+
+    python benchmarks/bench_game_loop.py [--turns 50] [--llm-ms 0] [--free-text 0.3] [--speculate] [--graph-context] [--recall 5] [--parallel-setup 4] [--store recording|memory|sqlite]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+from bench_scribe_writes import RecordingDriver
+from dungeons_and_dragons.choice_matcher import ChoiceMatcher
+from dungeons_and_dragons.game import Crews, GameSession, setup_game
+from dungeons_and_dragons.speculation import SceneSpeculator
+from dungeons_and_dragons.story_context import estimate_tokens
+from dungeons_and_dragons.tools import scribe_tools
+from dungeons_and_dragons.tools.neo4j_store import Neo4jStore
+from dungeons_and_dragons.tools.story_store import open_store
+
+KICKOFFS: Counter = Counter()
+
+
+class _FakeOutput:
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.token_usage = None
+
+
+class FakeCrew:
+    """Answers kickoff() with canned output for one task, after ``latency`` seconds."""
+
+    def __init__(self, task: str, latency: float):
+        self.task = task
+        self.latency = latency
+
+    def copy(self) -> "FakeCrew":
+        return FakeCrew(self.task, self.latency)
+
+    def kickoff(self, inputs=None):
+        KICKOFFS[self.task] += 1
+        n = KICKOFFS[self.task]
+        time.sleep(self.latency)
+        return _FakeOutput(_RESPONSES[self.task](n, inputs or {}))
+
+
+def _world(n, inputs):
+    return "```json\n" + json.dumps({
+        "world_id": "bench_world",
+        "name": "Vael",
+        "theme": "low fantasy",
+        "terrain_desc": "marsh and basalt cliffs",
+        "starting_region": "Saltmere",
+        "lore": "The tide once sang. " * 20,
+        "factions": [{"faction_id": f"faction_{i}", "name": f"Order of {i}", "ranks": ["novice", "adept"]} for i in range(3)],
+        "npcs": [
+            {"npc_id": f"npc_{i}", "name": f"Keeper {i}", "desc": "a tide keeper",
+             "faction": {"faction_id": f"faction_{i % 3}", "name": f"Order of {i % 3}"}}
+            for i in range(6)
+        ],
+    }) + "\n```"
+
+
+def _skeleton(n, inputs):
+    return json.dumps({
+        "name": "Vael",
+        "theme": "low fantasy",
+        "terrain_desc": "marsh and basalt cliffs",
+        "starting_region": "Saltmere",
+        "lore": "The tide once sang. " * 20,
+        "factions": [{"faction_id": f"faction_{i}", "name": f"Order of {i}", "summary": "keepers of the tide"} for i in range(3)],
+        "npcs": [{"npc_id": f"npc_{i}", "name": f"Keeper {i}", "faction_id": f"faction_{i % 3}", "summary": "a tide keeper"}
+                 for i in range(6)],
+    })
+
+
+def _detail_faction(n, inputs):
+    faction = json.loads(inputs["faction"])
+    return json.dumps({**faction, "description": "They read the tides. " * 3, "ranks": ["novice", "adept"]})
+
+
+def _detail_npc(n, inputs):
+    npc = json.loads(inputs["npc"])
+    return json.dumps({**npc, "desc": "a tide keeper", "motivation": "hear the tide sing again", "characteristics": ["patient", "wary"]})
+
+
+def _scene(n, inputs):
+    return json.dumps({
+        "scene_id": f"scene_{n}",
+        "title": f"The {n}th tide",
+        "description": "Fog rolls over the flats. " * 5,
+        "narration": "You wade deeper into the marsh. " * 10,
+        "npcs": [{"npc_id": f"npc_{n % 6}", "name": f"Keeper {n % 6}", "desc": "a tide keeper",
+                  "faction": {"faction_id": f"faction_{n % 3}", "name": f"Order of {n % 3}"}}],
+    })
+
+
+def _choices(n, inputs):
+    verbs = ["follow", "climb", "bargain", "hide"]
+    return json.dumps([
+        {
+            "choice_id": f"choice_{n}_{i}",
+            "title": f"{verb.capitalize()} the keeper",
+            "description": f"You {verb} the keeper.",
+            "narration": f"You decide to {verb}.",
+            "consequence": f"The keeper notices you {verb}.",
+        }
+        for i, verb in enumerate(verbs[:3])
+    ])
+
+
+def _resolve(n, inputs):
+    choices = inputs.get("available_choices") or []
+    return json.dumps({"status": "success", "choice": choices[n % len(choices)]} if choices else {"status": "retry"})
+
+
+_RESPONSES = {
+    "structure_world": _world,
+    "world_skeleton": _skeleton,
+    "detail_faction": _detail_faction,
+    "detail_npc": _detail_npc,
+    "structure_scene": _scene,
+    "structure_choice": _choices,
+    "resolve_player_choice": _resolve,
+    "summarize_story_progression": lambda n, inputs: f"Summary #{n}: the player crossed the marsh. " * 5,
+    "generate_plot_skeleton": lambda n, inputs: f"Act {n}: the keepers' secret surfaces.",
+    "npc_interaction": lambda n, inputs: json.dumps({
+        "reply": f"\"The tide remembers what you did,\" the keeper says. ({n})",
+        "disposition_delta": 1,
+        "relationship": "a stranger earning trust",
+    }),
+}
+
+
+def fake_crews(latency: float) -> Crews:
+    # Each real crew's last task produces the output main.py parses. The
+    # setup crews run two LLM tasks (writer + scribe) where the skeleton and
+    # detail crews run one, so they take twice as long to compare the two setups
+    return Crews(
+        world_setup=FakeCrew("structure_world", 2 * latency),
+        pregame_scene_setup=FakeCrew("structure_scene", 2 * latency),
+        pregame_choices_setup=FakeCrew("structure_choice", 2 * latency),
+        player_interaction=FakeCrew("resolve_player_choice", latency),
+        story_scene_progression=FakeCrew("structure_scene", latency),
+        story_choices_progression=FakeCrew("structure_choice", latency),
+        story_summary=FakeCrew("summarize_story_progression", latency),
+        story_convergence=FakeCrew("generate_plot_skeleton", latency),
+        npc_interactions=FakeCrew("npc_interaction", latency),
+        world_skeleton=FakeCrew("world_skeleton", latency),
+        faction_detail=FakeCrew("detail_faction", latency),
+        npc_detail=FakeCrew("detail_npc", latency),
+    )
+
+
+def _percentile(values, p):
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1] if len(values) > 1 else values[0]
+
+
+def run(turns: int, llm_ms: float, rtt_ms: float, free_text: float, speculate: bool, seed: int, store: str, graph_context: bool = False, recall_k: int = 0, parallel_setup: int = 0) -> None:
+    rng = random.Random(seed)
+    driver = RecordingDriver(rtt_ms / 1000.0)
+    if store == "recording":
+        scribe_tools.use_store(Neo4jStore(driver))
+    else:
+        os.environ.setdefault("ORION_SQLITE_PATH", os.path.join(tempfile.mkdtemp(), "bench.sqlite"))
+        scribe_tools.use_store(open_store(store))
+    if recall_k:
+        scribe_tools.enable_semantic_index()
+    crews = fake_crews(llm_ms / 1000.0)
+    speculator = SceneSpeculator(crews.story_scene_progression.copy, crews.story_choices_progression.copy) if speculate else None
+
+    latencies, allocated, round_trips, context_tokens = [], [], [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        world_data, scene_data = setup_game(crews, parallelism=parallel_setup)
+        setup_ms = (time.perf_counter() - t0) * 1000
+        tracemalloc.start()
+        session = GameSession(crews, world_data, scene_data, choice_matcher=ChoiceMatcher(), speculator=speculator,
+                              graph_context=graph_context, recall_k=recall_k)
+
+        for _ in range(turns):
+            choices = scribe_tools.get_choices_for_scene()
+            if rng.random() < free_text:
+                action = "I do whatever feels right"
+            else:
+                action = rng.choice(choices)["title"]
+
+            driver.round_trips = 0
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            t0 = time.perf_counter()
+            session.play_turn(action)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            allocated.append(tracemalloc.get_traced_memory()[1] - before)
+            round_trips.append(driver.round_trips)
+            context_tokens.append(estimate_tokens(session.story.render("progress_scene")))
+
+        session.close()
+    tracemalloc.stop()
+
+    print(f"turns={turns} store={store} llm={llm_ms}ms rtt={rtt_ms}ms free_text={free_text:.0%} speculate={speculate} graph_context={graph_context} recall_k={recall_k}")
+    print(f"game setup ms      {setup_ms:.2f} (parallel_setup={parallel_setup})")
+    print(f"turn latency ms   p50={_percentile(latencies, 50):.2f} p90={_percentile(latencies, 90):.2f} "
+          f"p99={_percentile(latencies, 99):.2f} max={max(latencies):.2f}")
+    print(f"peak alloc / turn  mean={statistics.mean(allocated) / 1024:.1f} KiB max={max(allocated) / 1024:.1f} KiB")
+    if store == "recording":
+        print(f"DB round-trips     mean={statistics.mean(round_trips):.1f} max={max(round_trips)}")
+    print(f"scene context      mean={statistics.mean(context_tokens):.0f} max={max(context_tokens)} tokens (estimated)")
+    print(f"crew kickoffs      {dict(KICKOFFS)}")
+    print(f"local match rate   {session.choice_matcher.hit_rate:.0%} {dict(session.choice_matcher.stats)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--llm-ms", type=float, default=0.0, help="simulated latency of every crew kickoff")
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="simulated Neo4j round-trip latency")
+    parser.add_argument("--free-text", type=float, default=0.3, help="share of actions the local matcher can't resolve")
+    parser.add_argument("--speculate", action="store_true", help="pre-generate branches like ORION_SPECULATE=1")
+    parser.add_argument("--store", choices=["recording", "memory", "sqlite"], default="recording")
+    parser.add_argument("--graph-context", action="store_true", help="add story-graph retrieval like ORION_GRAPH_CONTEXT=1")
+    parser.add_argument("--recall", type=int, default=0, metavar="K", help="recall top-K facts like ORION_RECALL_K")
+    parser.add_argument("--parallel-setup", type=int, default=0, metavar="N", help="fan-out world setup like ORION_WORLD_PARALLELISM")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.turns, args.llm_ms, args.rtt_ms, args.free_text, args.speculate, args.seed, args.store, args.graph_context, args.recall, args.parallel_setup)
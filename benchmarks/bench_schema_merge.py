@@ -0,0 +1,73 @@
+"""MERGE latency on a keyed label with and without a uniqueness constraint.
+
+Needs the Neo4j server configured in .env. Nodes are written under a
+throwaway ``BenchScene`` label (mirroring the ``Scene`` MERGE the scribe
+issues) and removed afterwards, so game data is left alone.
+
+    python benchmarks/bench_schema_merge.py [--sizes 10000 100000] [--merges 200]
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from dungeons_and_dragons.tools.graph_driver import close_driver, get_driver
+
+CONSTRAINT = "bench_scene_id_unique"
+
+
+def _seed(session, n: int, batch: int = 10000) -> None:
+    for start in range(0, n, batch):
+        session.run(
+            "UNWIND range($start, $end - 1) AS i CREATE (:BenchScene {scene_id: 'seed.' + toString(i)})",
+            start=start,
+            end=min(start + batch, n),
+        ).consume()
+
+
+def _time_merges(session, merges: int) -> list[float]:
+    timings = []
+    for _ in range(merges):
+        scene_id = f"bench.{uuid.uuid4()}"
+        start = time.perf_counter()
+        session.run(
+            "MERGE (s:BenchScene {scene_id: $scene_id}) SET s.title = 'bench'",
+            scene_id=scene_id,
+        ).consume()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _cleanup(session) -> None:
+    session.run(f"DROP CONSTRAINT {CONSTRAINT} IF EXISTS").consume()
+    session.run(
+        "MATCH (s:BenchScene) CALL { WITH s DETACH DELETE s } IN TRANSACTIONS OF 10000 ROWS"
+    ).consume()
+
+
+def run(sizes, merges: int) -> None:
+    print(f"{'scenes':>8} {'constraint':>10} {'p50 ms':>8} {'p95 ms':>8}")
+    with get_driver().session() as session:
+        for n in sizes:
+            _cleanup(session)
+            _seed(session, n)
+            for constrained in (False, True):
+                if constrained:
+                    session.run(
+                        f"CREATE CONSTRAINT {CONSTRAINT} IF NOT EXISTS "
+                        "FOR (s:BenchScene) REQUIRE s.scene_id IS UNIQUE"
+                    ).consume()
+                    session.run("CALL db.awaitIndexes()").consume()
+                timings = sorted(_time_merges(session, merges))
+                p95 = timings[int(len(timings) * 0.95) - 1]
+                print(f"{n:>8} {str(constrained):>10} {statistics.median(timings):>8.2f} {p95:>8.2f}")
+        _cleanup(session)
+    close_driver()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--merges", type=int, default=200)
+    args = parser.parse_args()
+    run(args.sizes, args.merges)
@@ -0,0 +1,127 @@
+"""Round-trips and wall time of scribe_tools persistence vs. entity count.
+
+By default the Neo4j driver is replaced with a recording stub that charges a
+fixed simulated network round-trip per statement, so the numbers are
+reproducible on a laptop. Pass ``--live`` to run against the server
+configured in .env instead (writes throwaway worlds).
+
+    python benchmarks/bench_scribe_writes.py [--rtt-ms 1.0] [--live]
+"""
+import argparse
+import time
+import uuid
+
+from dungeons_and_dragons.tools import scribe_tools
+from dungeons_and_dragons.tools.graph_schema import ensure_schema
+from dungeons_and_dragons.tools.neo4j_store import Neo4jStore
+
+
+class _Result:
+    def single(self):
+        return None
+
+    def consume(self):
+        return None
+
+
+class _RecordingTx:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def run(self, query, **params):
+        self._driver.round_trips += 1
+        time.sleep(self._driver.rtt)
+        return _Result()
+
+
+class _RecordingSession:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        return _RecordingTx(self._driver).run(query, **params)
+
+    def execute_write(self, work, *args, **kwargs):
+        # BEGIN is pipelined with the first RUN; COMMIT costs one extra round-trip
+        self._driver.round_trips += 1
+        time.sleep(self._driver.rtt)
+        return work(_RecordingTx(self._driver), *args, **kwargs)
+
+
+class RecordingDriver:
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def session(self, **kwargs):
+        return _RecordingSession(self)
+
+
+def _legacy_round_trips(factions: int, npcs: int, choices: int) -> int:
+    # One statement per entity (and two per choice) in auto-commit mode
+    return (2 + factions + npcs) + (1) + (2 * choices)
+
+
+def _make_world(n: int) -> dict:
+    return {
+        "world_id": str(uuid.uuid4()),
+        "name": "Bench World",
+        "theme": "benchmark",
+        "terrain_desc": "flat",
+        "starting_region": "origin",
+        "lore": "none",
+        "factions": [{"faction_id": f"f{i}", "name": f"Faction {i}", "ranks": ["a", "b"]} for i in range(n)],
+        "npcs": [{"npc_id": f"n{i}", "name": f"NPC {i}", "desc": "bench"} for i in range(n)],
+    }
+
+
+def _make_choices(n: int) -> list:
+    return [
+        {
+            "choice_id": f"c{i}",
+            "title": f"Choice {i}",
+            "description": "bench",
+            "narration": "bench",
+            "consequence": "bench",
+        }
+        for i in range(n)
+    ]
+
+
+def run(sizes, rtt_ms: float, live: bool) -> None:
+    driver = None
+    if live:
+        scribe_tools.use_store(Neo4jStore())
+    else:
+        driver = RecordingDriver(rtt_ms / 1000.0)
+        scribe_tools.use_store(Neo4jStore(driver))
+        ensure_schema(driver) # Migrations run once per process; keep them out of the first row
+
+    print(f"{'entities':>8} {'legacy RT':>10} {'batched RT':>11} {'wall ms':>9}")
+    for n in sizes:
+        if driver:
+            driver.round_trips = 0
+
+        start = time.perf_counter()
+        scribe_tools._save_world_impl(_make_world(n))
+        scribe_tools._save_scene_impl({"scene_id": "s", "title": "t", "description": "d", "narration": "n"})
+        scribe_tools._save_choices_impl(_make_choices(n))
+        elapsed = (time.perf_counter() - start) * 1000
+
+        batched = driver.round_trips if driver else "n/a"
+        print(f"{n:>8} {_legacy_round_trips(n, n, n):>10} {batched:>11} {elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated round-trip latency")
+    parser.add_argument("--live", action="store_true", help="write to the configured Neo4j server")
+    args = parser.parse_args()
+    run(args.sizes, args.rtt_ms, args.live)
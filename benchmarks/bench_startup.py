@@ -0,0 +1,77 @@
+"""Process startup: import time of the CLI and server entry points, with a budget.
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters,
+takes the median cumulative time of the module over several runs and lists
+the slowest imports behind it. Heavy dependencies (crewai, neo4j,
+jsonschema, http.server) must stay out of this path — they are loaded when
+a game actually starts — so the script also fails if any of them is
+imported. It exits non-zero when the median is over budget, so CI can run
+it as a check.
+
+    python benchmarks/bench_startup.py [--module dungeons_and_dragons.main] [--runs 5] [--budget-ms 400]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Imported on first use; seeing one here means a module-level import crept back in
+DEFERRED = ("crewai", "neo4j", "jsonschema", "http.server")
+
+
+def import_times(module: str) -> dict:
+    """{module name: (self µs, cumulative µs)} from one fresh interpreter."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, ["src", os.environ.get("PYTHONPATH")]))}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        sys.exit(f"❌ import {module} failed:\n{proc.stderr}")
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times.setdefault(name.strip(), (int(own), int(cumulative)))
+    return times
+
+
+def run(module: str, runs: int, budget_ms: float, top: int) -> bool:
+    samples = [import_times(module) for _ in range(runs)]
+    totals = [s[module][1] / 1000 for s in samples]
+    median = statistics.median(totals)
+
+    print(f"⏱️ import {module}: median {median:.1f} ms over {runs} runs (min {min(totals):.1f}, max {max(totals):.1f})")
+
+    last = samples[-1]
+    print("\nSlowest imports (self time, last run):")
+    for name, (own, cumulative) in sorted(last.items(), key=lambda kv: -kv[1][0])[:top]:
+        print(f"  {own / 1000:7.1f} ms  (cumulative {cumulative / 1000:7.1f} ms)  {name}")
+
+    ok = True
+    leaked = sorted({name for name in last for d in DEFERRED if name == d or name.startswith(d + ".")})
+    if leaked:
+        print(f"\n❌ Deferred dependencies imported at startup: {', '.join(leaked)}")
+        ok = False
+    if median > budget_ms:
+        print(f"\n❌ Over budget: {median:.1f} ms > {budget_ms:.0f} ms")
+        ok = False
+    elif ok:
+        print(f"\n✅ Within budget ({budget_ms:.0f} ms)")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", action="append", help="module to import (repeatable; default: main and server)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("ORION_STARTUP_BUDGET_MS", "400")))
+    parser.add_argument("--top", type=int, default=10, help="how many of the slowest imports to list")
+    args = parser.parse_args()
+
+    modules = args.module or ["dungeons_and_dragons.main", "dungeons_and_dragons.server"]
+    results = [run(module, args.runs, args.budget_ms, args.top) for module in modules]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,73 @@
+"""Validation throughput: jsonschema.validate() per call vs. the cached validators.
+
+    python benchmarks/bench_validation.py [--iterations 2000]
+"""
+import argparse
+import json
+import time
+
+import jsonschema
+
+from dungeons_and_dragons.schemas.validation import SCHEMAS, get_validator, normalize_and_validate
+
+SAMPLES = {
+    "world": {
+        "world_id": "w1",
+        "name": "Orion",
+        "theme": "dark fantasy",
+        "terrain_desc": "marsh and mountain",
+        "starting_region": "Fenhold",
+        "lore": "An old war sleeps beneath the fens.",
+        "factions": [{"faction_id": f"f{i}", "name": f"Faction {i}"} for i in range(5)],
+        "npcs": [
+            {
+                "npc_id": f"n{i}",
+                "name": f"NPC {i}",
+                "desc": "A watcher",
+                "faction": {"faction_id": "f0", "name": "Faction 0"},
+                "characteristics": ["wary", "loyal"],
+            }
+            for i in range(10)
+        ],
+    },
+    "scene": {"scene_id": "s1", "title": "Gate", "description": "At the gate", "narration": "Rain falls."},
+    "choice": {"choice_id": "c1", "title": "Knock", "description": "d", "narration": "n", "consequence": "c"},
+    "npc": {"npc_id": "n1", "name": "Mara", "desc": "Ferrywoman", "characteristics": ["quiet"]},
+    "faction": {"faction_id": "f1", "name": "Lantern Guild"},
+    "player": {
+        "id": "p1",
+        "display_name": "Player",
+        "character": {"id": "c1", "name": "Ash", "characteristics": ["bold"]},
+    },
+    "character": {"id": "c1", "name": "Ash", "characteristics": ["bold"]},
+}
+
+
+def _rate(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def run(iterations: int) -> None:
+    print(f"{'schema':>10} {'validate()/s':>13} {'cached/s':>10} {'speedup':>8}")
+    for kind, sample in SAMPLES.items():
+        schema = SCHEMAS[kind]
+        get_validator(kind)  # warm the cache outside the timed loop
+
+        legacy = _rate(lambda: jsonschema.validate(instance=sample, schema=schema), iterations)
+        cached = _rate(lambda: get_validator(kind).validate(sample), iterations)
+        print(f"{kind:>10} {legacy:>13.0f} {cached:>10.0f} {cached / legacy:>7.1f}x")
+
+    # End-to-end: a JSON string of three choices, as the scribe receives it
+    payload = json.dumps({"choices": [SAMPLES["choice"]] * 3})
+    rate = _rate(lambda: normalize_and_validate("choice", payload, many=True), iterations)
+    print(f"\nnormalize_and_validate(3 choices from JSON): {rate:.0f}/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.iterations)
@@ -0,0 +1,138 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = {
+    "a", "an", "the", "i", "me", "my", "we", "to", "of", "and", "or", "in", "on", "at", "into",
+    "with", "for", "up", "it", "this", "that", "is", "be", "will", "want", "wish", "would",
+    "like", "let", "lets", "go", "choose", "pick", "select", "option", "choice", "one", "do",
+}
+
+_ORDINALS = {
+    "1": 0, "first": 0, "1st": 0,
+    "2": 1, "second": 1, "2nd": 1,
+    "3": 2, "third": 2, "3rd": 2,
+    "4": 3, "fourth": 3, "4th": 3,
+    "5": 4, "fifth": 4, "5th": 4,
+    "last": -1,
+}
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def _tokens(text: str) -> List[str]:
+    return [_stem(w) for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def _vector(text: str) -> Counter:
+    """Bag of stemmed words plus character trigrams (robust to typos)."""
+    vec = Counter(_tokens(text))
+    padded = f" {_normalize(text)} "
+    vec.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return vec
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b[key] for key, count in a.items() if key in b)
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+
+@dataclass
+class MatchResult:
+    choice: Dict
+    confidence: float
+    method: str
+
+
+class ChoiceMatcher:
+    """
+    Resolves a player's free text to one of the offered choices locally,
+    without an LLM call, when the answer is unambiguous:
+
+      1. exact title or choice_id
+      2. ordinal ("2", "the second one", "option 3")
+      3. token overlap with the choice title
+      4. cosine similarity of word + trigram vectors over title and description
+
+    match() returns None when the best candidate is below ``threshold`` or
+    not ahead of the runner-up by ``margin``; the caller then falls back to
+    the resolve_player_choice crew. ``stats`` counts hits per stage and
+    fallbacks.
+    """
+
+    def __init__(self, threshold: float = 0.6, margin: float = 0.15):
+        self.threshold = threshold
+        self.margin = margin
+        self.stats: Counter = Counter()
+
+    @property
+    def hit_rate(self) -> float:
+        total = sum(self.stats.values())
+        return (total - self.stats["fallback"]) / total if total else 0.0
+
+    def _hit(self, choice: Dict, confidence: float, method: str) -> MatchResult:
+        self.stats[method] += 1
+        return MatchResult(choice=choice, confidence=confidence, method=method)
+
+    def match(self, action: str, choices: List[Dict]) -> MatchResult | None:
+        normalized = _normalize(action)
+        if not choices or not normalized:
+            self.stats["fallback"] += 1
+            return None
+
+        # --- Exact title / id ---
+        raw = action.strip().lower()
+        for choice in choices:
+            # Stored ids are "<world>.<scene>.<id>"; players may type either form
+            choice_id = str(choice.get("choice_id", "")).lower()
+            if normalized == _normalize(choice.get("title") or "") or raw in (choice_id, choice_id.rsplit(".", 1)[-1]):
+                return self._hit(choice, 1.0, "exact")
+
+        # --- Ordinal ---
+        tokens = _tokens(action)
+        if len(tokens) == 1 and tokens[0] in _ORDINALS:
+            index = _ORDINALS[tokens[0]]
+            if -len(choices) <= index < len(choices):
+                return self._hit(choices[index], 1.0, "ordinal")
+
+        # --- Token overlap / vector similarity ---
+        action_tokens = set(tokens)
+        action_vec = _vector(action)
+        scored = []
+        for choice in choices:
+            title_tokens = set(_tokens(choice.get("title") or ""))
+            overlap = len(action_tokens & title_tokens) / len(title_tokens) if title_tokens else 0.0
+            similarity = _cosine(
+                action_vec,
+                _vector(f"{choice.get('title') or ''} {choice.get('description') or ''}"),
+            )
+            if overlap >= similarity:
+                scored.append((overlap, "overlap", choice))
+            else:
+                scored.append((similarity, "similarity", choice))
+
+        scored.sort(key=lambda s: s[0], reverse=True)
+        best_score, method, best = scored[0]
+        runner_up = scored[1][0] if len(scored) > 1 else 0.0
+
+        if best_score >= self.threshold and best_score - runner_up >= self.margin:
+            return self._hit(best, best_score, method)
+
+        self.stats["fallback"] += 1
+        return None
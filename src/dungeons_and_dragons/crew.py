@@ -1,11 +1,18 @@
+import os
+
 from crewai import Agent, Crew, Process, Task
 from crewai.tools import tool
 from crewai.project import CrewBase, agent, task, crew
 from crewai.agents.agent_builder.base_agent import BaseAgent
 
+from dungeons_and_dragons import narration
+from dungeons_and_dragons.game import Crews, LazyCrew
 from dungeons_and_dragons.tools.scribe_tools import save_world
 
-from typing import List
+from typing import Any, Callable, List
+
+# ORION_QUIET=1 silences crewai's step-by-step console output
+VERBOSE = os.getenv("ORION_QUIET") != "1"
 
 @CrewBase
 class DungeonMasterCrew():
@@ -19,35 +26,36 @@ class DungeonMasterCrew():
     def world_agent(self) -> Agent:
         return Agent(
             config=self.agents_config['world_agent'], 
-            verbose=True
+            verbose=VERBOSE
         )
 
     @agent
     def npc_agent(self) -> Agent:
         return Agent(
             config=self.agents_config['npc_agent'], 
-            verbose=True
+            verbose=VERBOSE
         )
 
     @agent
     def npc_setup(self) -> Agent:
         return Agent(
             config=self.agents_config['npc_setup'], 
-            verbose=True
+            verbose=VERBOSE
         )
 
     @agent
     def dungeon_master(self) -> Agent:
         return Agent(
             config=self.agents_config['dungeon_master'],
-            verbose=True
+            verbose=VERBOSE,
+            **narration.llm_options(), # ORION_STREAM=1: narrate token by token
         )
     
     @agent
     def scribe_agent(self) -> Agent:
         return Agent(
             config=self.agents_config['scribe_agent'],
-            verbose=True,
+            verbose=VERBOSE,
             llm_config={
                 "temperature": 0.2
             }
@@ -57,7 +65,7 @@ class DungeonMasterCrew():
     def choice_agent(self) -> Agent:
         return Agent(
             config=self.agents_config['choice_agent'],
-            verbose=True
+            verbose=VERBOSE
         )
 
     # === Tasks ===
@@ -69,6 +77,18 @@ class DungeonMasterCrew():
     def structure_world(self) -> Task:
         return Task(config=self.tasks_config['structure_world'])
 
+    @task
+    def world_skeleton(self) -> Task:
+        return Task(config=self.tasks_config['world_skeleton'])
+
+    @task
+    def detail_faction(self) -> Task:
+        return Task(config=self.tasks_config['detail_faction'])
+
+    @task
+    def detail_npc(self) -> Task:
+        return Task(config=self.tasks_config['detail_npc'])
+
     @task
     def pregame_scene(self) -> Task:
         return Task(config=self.tasks_config['pregame_scene'])
@@ -130,9 +150,39 @@ class DungeonMasterCrew():
             agents=[self.world_agent(), self.scribe_agent()],
             tasks=[self.setup_world(), self.structure_world()],
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
     
+    @crew
+    def world_skeleton_crew(self) -> Crew:
+        """Fixes name, theme, terrain, starting region, lore and a one-line cast (parallel setup)"""
+        return Crew(
+            agents=[self.world_agent()],
+            tasks=[self.world_skeleton()],
+            process=Process.sequential,
+            verbose=VERBOSE,
+        )
+
+    @crew
+    def faction_detail_crew(self) -> Crew:
+        """Details one faction of a world skeleton"""
+        return Crew(
+            agents=[self.world_agent()],
+            tasks=[self.detail_faction()],
+            process=Process.sequential,
+            verbose=VERBOSE,
+        )
+
+    @crew
+    def npc_detail_crew(self) -> Crew:
+        """Details one NPC of a world skeleton"""
+        return Crew(
+            agents=[self.npc_setup()],
+            tasks=[self.detail_npc()],
+            process=Process.sequential,
+            verbose=VERBOSE,
+        )
+
     @crew
     def pregame_scene_setup_crew(self) -> Crew:
         """Handles initial scene setup"""
@@ -140,7 +190,7 @@ class DungeonMasterCrew():
             agents=[self.dungeon_master(), self.scribe_agent()],
             tasks=[self.pregame_scene(), self.structure_scene()],
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
     
     @crew
@@ -150,7 +200,7 @@ class DungeonMasterCrew():
             agents=[self.dungeon_master(), self.scribe_agent()],
             tasks=[self.pregame_choices(), self.structure_choice()],
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
     
     @crew
@@ -160,7 +210,7 @@ class DungeonMasterCrew():
             agents=[self.choice_agent()],
             tasks=[self.resolve_player_choice()],
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
     
     @crew
@@ -170,7 +220,7 @@ class DungeonMasterCrew():
             agents=[self.dungeon_master(), self.scribe_agent()],
             tasks=[self.progress_scene(), self.structure_scene()],
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
     
     @crew
@@ -180,7 +230,7 @@ class DungeonMasterCrew():
             agents=[self.dungeon_master(), self.scribe_agent()],
             tasks=[self.progress_choices(), self.structure_choice()],
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
     
     @crew
@@ -190,7 +240,7 @@ class DungeonMasterCrew():
             agents=[self.dungeon_master()],
             tasks=[self.summarize_story_progression()],
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
     
     @crew
@@ -200,7 +250,7 @@ class DungeonMasterCrew():
             agents=[self.dungeon_master()],
             tasks=[self.generate_plot_skeleton()],
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
     
     @crew
@@ -210,15 +260,43 @@ class DungeonMasterCrew():
             agents=[self.dungeon_master()],
             tasks=[self.overarching_plot(), self.ending()],
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
 
     @crew
     def npc_interactions_crew(self) -> Crew:
-        """Handles NPC creation, role assignment, and interactions"""
+        """Handles NPC interactions, played from the NPC's persisted memory"""
         return Crew(
-            agents=[self.npc_agent(), self.npc_setup()],
-            tasks=[self.role_assignment(), self.npc_interaction()],
+            agents=[self.npc_agent()],
+            tasks=[self.npc_interaction()],
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
+
+
+def build_crews(dm: DungeonMasterCrew | None = None, wrap: Callable[[str, Any], Any] | None = None) -> Crews:
+    """
+    One set of every crew. ``wrap(name, crew)`` can decorate each (cache, metrics).
+    Crews are LazyCrews, built (with the DungeonMasterCrew behind them) on first use.
+    """
+    wrap = wrap or (lambda name, crew: crew)
+    owner = LazyCrew(lambda: dm or DungeonMasterCrew())
+
+    def lazy(name: str) -> LazyCrew:
+        return LazyCrew(lambda: wrap(name, getattr(owner.get(), name)()))
+
+    return Crews(
+        world_setup=lazy("world_setup_crew"),
+        pregame_scene_setup=lazy("pregame_scene_setup_crew"),
+        pregame_choices_setup=lazy("pregame_choices_setup_crew"),
+        player_interaction=lazy("player_interaction_crew"),
+        story_scene_progression=lazy("story_scene_progression_crew"),
+        story_choices_progression=lazy("story_choices_progression_crew"),
+        story_summary=lazy("story_summary_crew"),
+        story_convergence=lazy("story_convergence_crew"),
+        npc_interactions=lazy("npc_interactions_crew"),
+        story_ending=lazy("story_ending_crew"),
+        world_skeleton=lazy("world_skeleton_crew"),
+        faction_detail=lazy("faction_detail_crew"),
+        npc_detail=lazy("npc_detail_crew"),
+    )
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from dungeons_and_dragons import metrics
+from dungeons_and_dragons.output_parser import extract_json
+
+
+class CachedCrewOutput:
+    """Stand-in for CrewOutput when a kickoff is served from the cache."""
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.cached = True
+
+    def __str__(self) -> str:
+        return self.raw
+
+
+class CrewResponseCache:
+    """
+    Persistent SQLite store of crew outputs keyed by a content hash.
+
+    Entries older than ``ttl_seconds`` are treated as misses and deleted.
+    When the stored outputs exceed ``max_bytes`` the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024, ttl_seconds: float = 7 * 24 * 3600):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crew_cache (
+                key TEXT PRIMARY KEY,
+                raw TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS crew_cache_accessed ON crew_cache (accessed_at)")
+        self._db.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT raw, created_at FROM crew_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._db.execute("DELETE FROM crew_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE crew_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, raw: str) -> None:
+        now = time.time()
+        size = len(raw.encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO crew_cache (key, raw, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, raw, size, now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM crew_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM crew_cache ORDER BY accessed_at").fetchall():
+            self._db.execute("DELETE FROM crew_cache WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _render(template: str, inputs: Dict[str, Any]) -> str:
+    for key, value in inputs.items():
+        template = template.replace("{" + key + "}", str(value))
+    return template
+
+
+def _llm_params(agent: Any) -> Dict[str, Any]:
+    llm = getattr(agent, "llm", None)
+    if llm is None or isinstance(llm, str):
+        return {"model": llm}
+    return {
+        "model": getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+        "top_p": getattr(llm, "top_p", None),
+        "max_tokens": getattr(llm, "max_tokens", None),
+    }
+
+
+def crew_fingerprint(crew: Any, inputs: Dict[str, Any] | None) -> str:
+    """Hash of every rendered task prompt, its agent's config and model parameters."""
+    inputs = inputs or {}
+    parts = []
+    for task in crew.tasks:
+        agent = task.agent
+        # kickoff() interpolates templates in place; hash the originals
+        description = getattr(task, "_original_description", None) or task.description
+        expected_output = getattr(task, "_original_expected_output", None) or task.expected_output
+        parts.append({
+            "description": _render(description, inputs),
+            "expected_output": _render(expected_output, inputs),
+            "agent": {
+                "role": getattr(agent, "role", None),
+                "goal": getattr(agent, "goal", None),
+                "backstory": getattr(agent, "backstory", None),
+                "llm": _llm_params(agent),
+            },
+        })
+    payload = json.dumps({"process": str(crew.process), "tasks": parts}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def parses_as(kind: str | None, many: bool = False) -> Callable[[str], bool]:
+    """A CachedCrew ``accept``: the output holds JSON, matching ``kind``'s schema when given."""
+    def accept(raw: str) -> bool:
+        try:
+            return extract_json(raw, kind=kind, many=many).schema_valid
+        except ValueError:
+            return False
+    return accept
+
+
+class CachedCrew:
+    """
+    Wraps a Crew so identical kickoffs are answered from a CrewResponseCache.
+    Only outputs passing ``accept(raw)`` are stored, so a malformed response
+    is regenerated on the next try instead of replayed until it expires.
+    """
+
+    def __init__(self, crew: Any, cache: CrewResponseCache, accept: Callable[[str], bool] | None = None):
+        self._crew = crew
+        self._cache = cache
+        self._accept = accept
+
+    def kickoff(self, inputs: Dict[str, Any] | None = None):
+        key = crew_fingerprint(self._crew, inputs)
+        raw = self._cache.get(key)
+        if raw is not None:
+            return CachedCrewOutput(raw)
+
+        output = self._crew.kickoff(inputs=inputs)
+        if isinstance(output.raw, str) and output.raw and (self._accept is None or self._accept(output.raw)):
+            self._cache.put(key, output.raw)
+        return output
+
+    def copy(self) -> "CachedCrew":
+        return CachedCrew(self._crew.copy(), self._cache, self._accept)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._crew, name)
+
+
+# ----------------------
+# Wiring (shared by main and server)
+# ----------------------
+# Setup crews are kicked off without (or with per-world) inputs: one cache key
+# for all of them would replay the same world and opening choices in every game
+UNCACHED_CREWS = ("world_setup_crew", "world_skeleton_crew", "pregame_scene_setup_crew", "pregame_choices_setup_crew")
+# What a crew's output must parse as before it is cached (others: any non-empty text)
+CACHED_SCHEMAS = {
+    "player_interaction_crew": parses_as(None),
+    "story_scene_progression_crew": parses_as("scene"),
+    "story_choices_progression_crew": parses_as("choice", many=True),
+    "faction_detail_crew": parses_as("faction"),
+    "npc_detail_crew": parses_as("npc"),
+}
+
+
+def open_crew_cache() -> CrewResponseCache | None:
+    """The cache configured by ORION_CREW_CACHE*, or None when it is off."""
+    if os.getenv("ORION_CREW_CACHE") != "1":
+        return None
+    return CrewResponseCache(
+        os.getenv("ORION_CREW_CACHE_PATH", ".orion/crew_cache.sqlite"),
+        max_bytes=int(os.getenv("ORION_CREW_CACHE_MAX_MB", "100")) * 1024 * 1024,
+        ttl_seconds=float(os.getenv("ORION_CREW_CACHE_TTL_HOURS", "168")) * 3600,
+    )
+
+
+def crew_wrapper(cache: CrewResponseCache | None) -> Callable[[str, Any], Any]:
+    """The ``wrap`` for build_crews(): caching with ``cache`` (if any) and ORION_METRICS instrumentation."""
+    def wrap(name: str, crew: Any) -> Any:
+        # Instrumentation sits outside the cache so cache hits show up as fast kickoffs
+        if cache and name not in UNCACHED_CREWS:
+            crew = CachedCrew(crew, cache, accept=CACHED_SCHEMAS.get(name))
+        return metrics.InstrumentedCrew(name, crew) if metrics.ENABLED else crew
+    return wrap
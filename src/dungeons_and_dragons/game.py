@@ -0,0 +1,475 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from dungeons_and_dragons import narration
+from dungeons_and_dragons.choice_matcher import ChoiceMatcher
+from dungeons_and_dragons.output_parser import extract_json
+from dungeons_and_dragons.plot_skeleton import PlotSkeletonPlanner
+from dungeons_and_dragons.retrieval import recall_facts, retrieve_story_graph
+from dungeons_and_dragons.speculation import SceneSpeculator
+from dungeons_and_dragons.story_context import StoryContext
+from dungeons_and_dragons.summarizer import BackgroundSummarizer
+from dungeons_and_dragons.tools.scribe_tools import ScribeState, TurnCommit, attach_pregame_scene, current_state, forget_world, save_world, save_scene, save_choices, get_choices_for_scene, get_npc_memory, record_npc_interaction, use_state
+
+
+@dataclass
+class Crews:
+    """The crews a game is played with (real DungeonMasterCrew ones, or fakes in benchmarks)."""
+    world_setup: Any
+    pregame_scene_setup: Any
+    pregame_choices_setup: Any
+    player_interaction: Any
+    story_scene_progression: Any
+    story_choices_progression: Any
+    story_summary: Any
+    story_convergence: Any
+    npc_interactions: Any = None
+    story_ending: Any = None
+    # Parallel world setup (setup_game with parallelism > 0)
+    world_skeleton: Any = None
+    faction_detail: Any = None
+    npc_detail: Any = None
+
+
+class LazyCrew:
+    """
+    Stands in for a crew until it is first used: ``factory()`` builds it on
+    the first kickoff (or attribute access) and the result is kept. A copy
+    is lazy too, so handing copies to sessions or speculators builds nothing.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._crew = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._crew is not None
+
+    def get(self):
+        if self._crew is None:
+            with self._lock:
+                if self._crew is None:
+                    self._crew = self._factory()
+        return self._crew
+
+    def kickoff(self, *args, **kwargs):
+        return self.get().kickoff(*args, **kwargs)
+
+    def copy(self):
+        return LazyCrew(lambda: self.get().copy())
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+def crewOutputToJSON(crew_output, kind=None, many=False):
+    """Utility to convert Crew output to JSON dict (see output_parser.extract_json)"""
+    output = crew_output.raw
+
+    if isinstance(output, str):
+        result = extract_json(output, kind=kind, many=many)
+        if result.repairs:
+            print(f"🩹 Repaired {kind or 'crew'} output: {', '.join(result.repairs)}")
+        return result.value
+
+    return output
+
+
+# =========================
+# Step 1: Setup the Game
+# =========================
+def world_brief(world: Dict) -> str:
+    """The world as the opening scene is told about it: essentials, then one line per faction and NPC."""
+    lines = [
+        f"{world.get('name')} — {world.get('theme')}. Starting region: {world.get('starting_region')}.",
+        f"Terrain: {world.get('terrain_desc')}",
+        f"Lore: {world.get('lore')}",
+    ]
+    for faction in world.get("factions") or []:
+        lines.append(f"Faction {faction.get('name')}: {faction.get('summary') or faction.get('description') or ''}".rstrip(": "))
+    for npc in (world.get("npcs") or []) + (world.get("npc") or []):
+        lines.append(f"NPC {npc.get('name')}: {npc.get('summary') or npc.get('desc') or npc.get('role') or ''}".rstrip(": "))
+    return "\n".join(lines)
+
+
+def _opening(crews: Crews, world_context: str, on_narration) -> Tuple[Dict, Any, bool]:
+    """Opening scene, then its choices: (scene_data, raw choices output, streamed)."""
+    with narration.stream(crews.pregame_scene_setup, on_narration) as live:
+        pregame_scene = crews.pregame_scene_setup.kickoff(inputs={"world_context": world_context})
+    scene_data = crewOutputToJSON(pregame_scene, kind="scene")
+
+    choices = crews.pregame_choices_setup.kickoff()
+    return scene_data, choices, live.streamed
+
+
+def _with_ids(items: List, kind: str) -> List[Dict]:
+    # The ids are what NPCs reference their faction by, so every stub needs one
+    stubs = []
+    for i, item in enumerate(items or []):
+        if isinstance(item, dict) and item.get("name"):
+            stubs.append({**item, f"{kind}_id": str(item.get(f"{kind}_id") or f"{kind}_{i}")})
+    return stubs
+
+
+def _detail(crew, kind: str, brief: str, stub: Dict, faction_names: Dict[str, str] | None = None) -> Dict:
+    """
+    One faction/NPC fleshed out by its own crew copy; the skeleton entry if
+    that fails. An NPC keeps the skeleton's faction, or may name one of
+    ``faction_names`` (faction_id → name) if the skeleton gave it none.
+    """
+    try:
+        detailed = crewOutputToJSON(crew.kickoff(inputs={"world_skeleton": brief, kind: json.dumps(stub)}), kind=kind)
+    except Exception as e:
+        print(f"⚠️ Detailing {kind} '{stub['name']}' failed ({e}) — keeping its skeleton entry")
+        detailed = None
+    if not isinstance(detailed, dict):
+        detailed = {}
+    # The skeleton's id, name and faction win, so references between entries stay valid
+    merged = {**stub, **detailed, f"{kind}_id": stub[f"{kind}_id"], "name": stub["name"]}
+    if kind == "npc":
+        faction = detailed.get("faction")
+        faction_id = faction.get("faction_id") if isinstance(faction, dict) else None
+        if "faction" in stub:
+            merged["faction"] = stub["faction"]
+        elif faction_id in (faction_names or {}):
+            merged["faction"] = {"faction_id": faction_id, "name": faction_names[faction_id]}
+        else:
+            merged.pop("faction", None)
+    return merged
+
+
+def _setup_world_parallel(crews: Crews, parallelism: int, on_narration) -> Tuple[Dict, Tuple[Dict, Any, bool]]:
+    """
+    World setup as a fan-out: the skeleton crew fixes name, theme, terrain,
+    starting region, lore and a one-line cast; then every faction and NPC is
+    detailed by its own crew copy, at most ``parallelism`` at a time, while
+    the opening scene and its choices are generated from the skeleton
+    alongside. Returns the assembled world and the _opening() result.
+    """
+    skeleton = crewOutputToJSON(crews.world_skeleton.kickoff())
+    if not isinstance(skeleton, dict) or not skeleton.get("starting_region"):
+        raise ValueError("World skeleton has no starting_region")
+    factions = _with_ids(skeleton.get("factions"), "faction")
+    npcs = _with_ids((skeleton.get("npcs") or []) + (skeleton.get("npc") or []), "npc")
+    skeleton.update(factions=factions, npcs=npcs)
+    skeleton.pop("npc", None)
+    brief = world_brief(skeleton)
+    print(f"\n🌍 World skeleton: {skeleton.get('name')} — {len(factions)} factions, {len(npcs)} NPCs to detail")
+
+    faction_names = {f["faction_id"]: f["name"] for f in factions}
+    for npc in npcs:
+        faction_id = npc.pop("faction_id", None)
+        if faction_id in faction_names and "faction" not in npc:
+            npc["faction"] = {"faction_id": faction_id, "name": faction_names[faction_id]}
+        npc.setdefault("desc", npc.get("summary") or "")
+
+    # The opening scene needs only the starting region; it gets its own
+    # thread so detailing never queues in front of it. Jobs run in a copy of
+    # this context, so their kickoffs count toward the setup's metrics.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="opening") as opening_pool, \
+            ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="world-detail") as pool:
+        opening = opening_pool.submit(copy_context().run, _opening, crews, brief, on_narration)
+        faction_jobs = [pool.submit(copy_context().run, _detail, crews.faction_detail.copy(), "faction", brief, f) for f in factions]
+        npc_jobs = [pool.submit(copy_context().run, _detail, crews.npc_detail.copy(), "npc", brief, n, faction_names) for n in npcs]
+
+        world_data = {k: skeleton[k] for k in ("name", "theme", "terrain_desc", "starting_region", "lore") if k in skeleton}
+        world_data["factions"] = [job.result() for job in faction_jobs]
+        world_data["npcs"] = [job.result() for job in npc_jobs]
+        return world_data, opening.result()
+
+
+def setup_game(crews: Crews, on_narration=None, parallelism: int = 0):
+    """
+    ``on_narration(chunk)`` receives the opening scene's narration as it streams (ORION_STREAM=1).
+    With ``parallelism`` > 0 and the skeleton/detail crews available, the world
+    is built by _setup_world_parallel() instead of the single world_setup crew.
+    """
+    print("🎲 Setting up the world...")
+
+    if parallelism > 0 and crews.world_skeleton is not None:
+        world_data, (scene_data, choices, streamed) = _setup_world_parallel(crews, parallelism, on_narration)
+        print("\n🌍 World structured:", json.dumps(world_data))
+    else:
+        structured_world = crews.world_setup.kickoff()
+        print("\n🌍 World structured:", structured_world.raw)
+        world_data = crewOutputToJSON(structured_world, kind="world")
+        scene_data, choices, streamed = None, None, False
+
+    save_world(world_data)
+
+    if scene_data is None:
+        scene_data, choices, streamed = _opening(crews, world_brief(world_data), on_narration)
+
+    save_scene(scene_data)
+    attach_pregame_scene()
+
+    choices_data = crewOutputToJSON(choices, kind="choice", many=True)
+
+    save_choices(choices_data)
+
+    if not streamed:
+        print("\n🌍 Opening Scene:", scene_data["narration"])
+    print("\n🌍 Player Choices:", choices)
+
+    return world_data, scene_data
+
+
+# =========================
+# Step 2: Turns
+# =========================
+def _npc_reply(raw: str) -> Tuple[str, int, str | None]:
+    """(reply, disposition_delta, relationship) from npc_interaction output; plain prose is a reply that changes nothing."""
+    try:
+        parsed = extract_json(raw).value
+    except ValueError:
+        parsed = None
+    if not isinstance(parsed, dict) or not isinstance(parsed.get("reply"), str):
+        return raw, 0, None
+    try:
+        delta = max(-2, min(2, int(parsed.get("disposition_delta") or 0)))
+    except (TypeError, ValueError):
+        delta = 0
+    relationship = parsed.get("relationship")
+    return parsed["reply"], delta, relationship if isinstance(relationship, str) and relationship.strip() else None
+
+
+class GameSession:
+    """
+    State of one game after setup: its ScribeState (world/scene position),
+    the story context, its background workers and the optional local
+    matcher / speculator. play_turn() runs one player action through to the
+    committed next scene.
+
+    Sessions are isolated from each other: every scribe call inside
+    play_turn() is bound to this session's ScribeState, so many games can
+    share one process, store and crew pool.
+    """
+
+    def __init__(
+        self,
+        crews: Crews,
+        world_data: Dict,
+        scene_data: Dict,
+        choice_matcher: ChoiceMatcher | None = None,
+        speculator: SceneSpeculator | None = None,
+        token_budget: int = 2000,
+        recent_turns: int = 4,
+        skeleton_min_scenes: int = 5,
+        skeleton_cadence: int = 3,
+        scribe: ScribeState | None = None,
+        graph_context: bool = False,
+        graph_scenes: int = 3,
+        recall_k: int = 0,
+    ):
+        self.crews = crews
+        self.scribe = scribe or current_state()
+        self.choice_matcher = choice_matcher
+        self.speculator = speculator
+        self.story = StoryContext(token_budget=token_budget, recent_turns=recent_turns)
+        self.story.pin_world(world_data, scene_data)
+        self.summarizer = BackgroundSummarizer(crews.story_summary, self.story)
+        self.plot_planner = PlotSkeletonPlanner(
+            crews.story_convergence,
+            self.story,
+            min_scenes=skeleton_min_scenes,
+            cadence=skeleton_cadence,
+        )
+        self.plot_planner.seed(world_data)
+        # Pull the path and recent cast from the story graph into each turn's context
+        self.graph_context = graph_context
+        self.graph_scenes = graph_scenes
+        # Top-k facts recalled from the semantic index per turn (0 = off)
+        self.recall_k = recall_k
+        self.scene = scene_data
+        self.scene_count = 1
+
+        if self.speculator:
+            with use_state(self.scribe):
+                self._speculate()
+
+    @classmethod
+    def start(cls, crews: Crews, on_narration=None, world_parallelism: int = 0, **kwargs) -> "GameSession":
+        """Set up a new world in a fresh ScribeState and return its session."""
+        scribe = ScribeState()
+        with use_state(scribe):
+            world_data, scene_data = setup_game(crews, on_narration, parallelism=world_parallelism)
+        return cls(crews, world_data, scene_data, scribe=scribe, **kwargs)
+
+    def choices(self) -> List[Dict]:
+        with use_state(self.scribe):
+            return get_choices_for_scene()
+
+    def play_turn(self, player_action: str, crews: Crews | None = None, on_narration=None) -> Dict | None:
+        """
+        Resolve ``player_action`` against the current choices and generate,
+        persist and return the next scene and its choices as
+        {"scene", "choices", "choices_output", "streamed"}. Returns None when
+        the action matched no choice.
+
+        ``crews`` overrides the session's crews for this turn (a set checked
+        out of a pool); background summaries and skeletons keep using the
+        session's own. ``on_narration(chunk)`` receives the scene narration
+        as it is generated; "streamed" says whether any arrived.
+        """
+        with use_state(self.scribe):
+            return self._play_turn(player_action, crews or self.crews, on_narration)
+
+    def _play_turn(self, player_action: str, crews: Crews, on_narration) -> Dict | None:
+        story = self.story
+
+        # Swap in a background summary that finished while the player was typing
+        summary = self.summarizer.poll()
+        if summary:
+            print("\n📝 Story Summary Update:", summary)
+        plot_skeleton = self.plot_planner.poll()
+        if plot_skeleton:
+            print("\n🧩 Plot Skeleton Update:", plot_skeleton)
+
+        choices = get_choices_for_scene()
+
+        # Resolve obvious actions locally; only ambiguous ones go to choice_agent
+        local_match = self.choice_matcher.match(player_action, choices) if self.choice_matcher else None
+        if local_match:
+            matched_choice = {"status": "success", "choice": local_match.choice}
+            matched_choice_raw = json.dumps(matched_choice)
+        else:
+            matched_choice_output = crews.player_interaction.kickoff(inputs={
+                "player_action": player_action,
+                "available_choices": choices
+            })
+            matched_choice = crewOutputToJSON(matched_choice_output)
+            matched_choice_raw = matched_choice_output.raw
+
+        if matched_choice.get("status") != "success":
+            return None
+
+        story.add_turn(player_action, matched_choice["choice"]) # Update progression
+        choice_id = matched_choice["choice"]["choice_id"]
+
+        # With a speculator the graph was refreshed after the last commit, before its branches started
+        if self.graph_context and not self.speculator:
+            self._refresh_graph_context()
+        if self.recall_k:
+            choice = matched_choice["choice"]
+            self._recall(player_action, choice.get("title"), choice.get("description"), choice.get("consequence"))
+
+        # Serve the pre-generated branch if we speculated on this choice
+        speculative = self.speculator.claim(choice_id) if self.speculator else None
+        streamed = False
+        if speculative:
+            next_scene_output, next_choices_output = speculative
+        else:
+            next_choices_output = None
+            # Generate the next scene; its narration reaches the player while the scribe structures it
+            with narration.stream(crews.story_scene_progression, on_narration) as live:
+                next_scene_output = crews.story_scene_progression.kickoff(inputs={
+                    "current_story_progression": story.render("progress_scene"),
+                    "choice": matched_choice_raw,
+                    "player_action": player_action
+                })
+            streamed = live.streamed
+
+        # Stage next scene + link via LEADS_TO; written together with the new choices below
+        turn = TurnCommit()
+        next_scene_data = turn.stage_scene(crewOutputToJSON(next_scene_output, kind="scene"))
+        turn.stage_choice_link(choice_id)
+
+        story.set_scene(next_scene_data) # Update progression
+        self.plot_planner.observe(next_scene_data, matched_choice["choice"])
+
+        if next_choices_output is None:
+            next_choices_output = crews.story_choices_progression.kickoff(inputs={
+                "current_story_progression": story.render("progress_choices"),
+                "scene_context": next_scene_data
+            })
+        next_choices_data = crewOutputToJSON(next_choices_output, kind="choice", many=True)
+
+        turn.stage_choices(next_choices_data)
+        turn.commit()
+
+        # Update state
+        self.scene = next_scene_data
+        self.scene_count += 1
+
+        # Every 2 scenes, fold the turns since the last summary into it — in the background
+        if self.scene_count % 2 == 0:
+            self.summarizer.submit()
+
+        # Regenerate the plot skeleton in the background only when the story moved enough
+        self.plot_planner.maybe_refresh(self.scene_count)
+
+        # Start speculating on the new choices while the player reads and types
+        if self.speculator:
+            self._speculate()
+
+        return {"scene": next_scene_data, "choices": next_choices_data, "choices_output": next_choices_output, "streamed": streamed}
+
+    def talk_to(self, npc: str, player_text: str, crews: Crews | None = None) -> Dict | None:
+        """
+        Roleplay one exchange with an NPC of this world (by name or id)
+        through npc_interactions_crew, with that NPC's memory as context,
+        and remember it along with the disposition change and relationship
+        the crew reports. Returns {"npc", "npc_id", "reply", "disposition"},
+        or None when no such NPC is known.
+        """
+        crews = crews or self.crews
+        if crews.npc_interactions is None:
+            raise RuntimeError("This session's crews have no npc_interactions crew")
+
+        with use_state(self.scribe):
+            memory = get_npc_memory(npc)
+            if memory is None:
+                return None
+            output = crews.npc_interactions.kickoff(inputs={
+                "npc_context": memory.render(),
+                "current_story_progression": self.story.render("npc_interaction"),
+                "player_action": player_text,
+            })
+            reply, disposition_delta, relationship = _npc_reply(output.raw)
+            record_npc_interaction(memory.npc_id, player_text, reply, disposition_delta, relationship)
+        return {"npc": memory.name, "npc_id": memory.npc_id, "reply": reply, "disposition": memory.disposition}
+
+    def _refresh_graph_context(self) -> None:
+        try:
+            self.story.graph = retrieve_story_graph(
+                recent_scenes=self.graph_scenes,
+                max_tokens=self.story.token_budget // 3,
+            )
+        except Exception as e:
+            # Keep the previous block; the turn still has the rest of the context
+            print(f"⚠️ Story graph retrieval failed: {e}")
+
+    def _speculate(self) -> None:
+        """Start speculating on the current choices, with the graph and recall tiers a live turn would get."""
+        choices = get_choices_for_scene()
+        if self.graph_context:
+            self._refresh_graph_context()
+        if self.recall_k:
+            # All branches share one prompt, so recall against every choice on offer
+            self._recall(*(choice.get("title") for choice in choices))
+        self.speculator.start(choices, self.story.render("progress_scene"))
+
+    def _recall(self, *terms: str | None) -> None:
+        query = " ".join(filter(None, [*terms, self.scene.get("title")]))
+        # Recent turns are in the prompt verbatim already
+        recent = tuple(t.scene.get("scene_id") for t in self.story.turns[-self.story.recent_turns:] if t.scene)
+        self.story.recall = recall_facts(
+            query,
+            k=self.recall_k,
+            max_tokens=self.story.token_budget // 4,
+            skip_scenes=recent + (self.scene.get("scene_id"),),
+        )
+
+    def close(self) -> None:
+        if self.speculator:
+            self.speculator.shutdown()
+        self.summarizer.shutdown()
+        self.plot_planner.shutdown()
+        if self.scribe.world_id:
+            forget_world(self.scribe.world_id)
@@ -1,171 +1,140 @@
-import json
-import random
+import os
+import threading
 from dotenv import load_dotenv
-from dungeons_and_dragons.crew import DungeonMasterCrew
-from dungeons_and_dragons.tools.scribe_tools import attach_pregame_scene, save_world, save_scene, save_choices, get_choices_for_scene, link_choice_to_scene
+from dungeons_and_dragons import metrics, narration
+from dungeons_and_dragons.choice_matcher import ChoiceMatcher
+from dungeons_and_dragons.crew_cache import CrewResponseCache, crew_wrapper, open_crew_cache
+from dungeons_and_dragons.game import Crews, GameSession, setup_game
+from dungeons_and_dragons.speculation import SceneSpeculator
+from dungeons_and_dragons.tools.scribe_tools import enable_semantic_index, enable_write_behind, flush_on_exit, get_store
 
 load_dotenv()
 
-dm = DungeonMasterCrew()
-
-# Initialize crews
-world_setup_crew = dm.world_setup_crew()
-pregame_scene_setup_crew = dm.pregame_scene_setup_crew()
-pregame_choices_setup_crew = dm.pregame_choices_setup_crew()
-player_interaction_crew = dm.player_interaction_crew()
-story_scene_progression_crew = dm.story_scene_progression_crew()
-story_choices_progression_crew = dm.story_choices_progression_crew()
-story_summary_crew = dm.story_summary_crew()
-story_convergence_crew = dm.story_convergence_crew()
-npc_interactions_crew = dm.npc_interactions_crew()
-story_ending_crew = dm.story_ending_crew()
-
-
-import json
-import re
-
-def crewOutputToJSON(crew_output):
-    """Utility to convert Crew output to JSON dict"""
-    output = crew_output.raw
-    
-    if isinstance(output, str):
-        text = output.strip()
-
-        # Try direct JSON parse first
-        try:
-            return json.loads(text)
-        except Exception:
-            pass  
-
-        # If it failed, look for a JSON block inside triple backticks
-        match = re.search(r"```json(.*?)```", text, re.DOTALL)
-        if match:
-            json_block = match.group(1).strip()
-            try:
-                return json.loads(json_block)
-            except Exception as e:
-                raise ValueError(f"Failed to parse JSON block: {e}\nExtracted block:\n{json_block}")
-
-        # Fallback: try to extract any {...} JSON-like structure
-        match = re.search(r"(\{.*\})", text, re.DOTALL)
-        if match:
-            json_block = match.group(1).strip()
-            try:
-                return json.loads(json_block)
-            except Exception as e:
-                raise ValueError(f"Failed to parse fallback JSON: {e}\nExtracted block:\n{json_block}")
-
-        raise ValueError(f"No valid JSON found in Crew output:\n{text}")
-
-    return output
+# Local fast path for mapping player text to a choice
+LOCAL_MATCH = os.getenv("ORION_LOCAL_MATCH", "1") == "1"
+choice_matcher = ChoiceMatcher(threshold=float(os.getenv("ORION_MATCH_THRESHOLD", "0.6")))
 
+# Built on first use (get_crews), so importing this module stays cheap:
+# crewai and the crew definitions are only loaded once a game starts
+crew_cache: CrewResponseCache | None = None
+_crews: Crews | None = None
+_crews_lock = threading.Lock()
 
-# =========================
-# Step 1: Setup the Game
-# =========================
-def setup_game():
-    print("🎲 Setting up the world...")
-
-    structured_world = world_setup_crew.kickoff()
-    print("\n🌍 World structured:", structured_world.raw)
-    world_data = crewOutputToJSON(structured_world)
 
-    save_world(world_data)
+def get_crews() -> Crews:
+    """The process-wide crew set; each crew is itself built on its first kickoff."""
+    global crew_cache, _crews
+    with _crews_lock:
+        if _crews is None:
+            from dungeons_and_dragons.crew import build_crews
 
-    pregame_scene = pregame_scene_setup_crew.kickoff()
-    scene_data = crewOutputToJSON(pregame_scene)
+            # Content-addressed cache of crew outputs, keyed by rendered prompts + model params
+            crew_cache = open_crew_cache()
+            _crews = build_crews(wrap=crew_wrapper(crew_cache))
+        return _crews
 
-    save_scene(scene_data)
-    attach_pregame_scene()
 
-    choices = pregame_choices_setup_crew.kickoff()
-    choices_data = crewOutputToJSON(choices)
+def get_crew(name: str):
+    """One crew of the shared set by its Crews field name, e.g. get_crew("story_ending")."""
+    return getattr(get_crews(), name)
 
-    save_choices(choices_data)
 
-    print("\n🌍 Opening Scene:", scene_data["narration"])
-    print("\n🌍 Player Choices:", choices)
-
-    return structured_world, pregame_scene
+def _build_speculator(crews: Crews) -> SceneSpeculator | None:
+    # Speculative pre-generation of the next scene for every offered choice
+    if os.getenv("ORION_SPECULATE") != "1":
+        return None
+    return SceneSpeculator(
+        scene_crew_factory=crews.story_scene_progression.copy,
+        choices_crew_factory=crews.story_choices_progression.copy if os.getenv("ORION_SPECULATE_CHOICES", "1") == "1" else None,
+        max_concurrent=int(os.getenv("ORION_SPECULATION_BUDGET", "3")),
+    )
 
 
 # =========================
 # Step 2: Main Game Loop
 # =========================
 def run():
-    structured_world, pregame_scene = setup_game()
+    store = get_store()
+    if not store.check_health():
+        raise RuntimeError("Neo4j is unreachable — check NEO4J_URI / credentials in .env, or set ORION_STORE=memory|sqlite")
+
+    if os.getenv("ORION_WRITE_BEHIND") == "1":
+        enable_write_behind() # Graph writes no longer block the next narration
+    if int(os.getenv("ORION_RECALL_K", "0")) > 0:
+        enable_semantic_index() # Index facts from the first save on
+
+    if os.getenv("ORION_METRICS_PORT"):
+        metrics.serve_prometheus(int(os.getenv("ORION_METRICS_PORT")))
+
+    crews = get_crews()
+    speculator = _build_speculator(crews)
+
+    metrics.start_turn("setup")
+    world_data, scene_data = setup_game(
+        crews,
+        on_narration=narration.ConsoleNarration("🌍 Opening Scene:"),
+        parallelism=int(os.getenv("ORION_WORLD_PARALLELISM", "0")),
+    )
+    metrics.end_turn()
 
     # Track state
-    overarching_plot = None
-    current_story_progression = f"The generated world is described as: {str(structured_world)} and opens with: {str(pregame_scene)}"
-    scene_count = 1
+    session = GameSession(
+        crews,
+        world_data,
+        scene_data,
+        choice_matcher=choice_matcher if LOCAL_MATCH else None,
+        speculator=speculator,
+        token_budget=int(os.getenv("ORION_CONTEXT_TOKENS", "2000")),
+        recent_turns=int(os.getenv("ORION_CONTEXT_TURNS", "4")),
+        skeleton_min_scenes=int(os.getenv("ORION_SKELETON_MIN_SCENES", "5")),
+        skeleton_cadence=int(os.getenv("ORION_SKELETON_CADENCE", "3")),
+        graph_context=os.getenv("ORION_GRAPH_CONTEXT") == "1",
+        graph_scenes=int(os.getenv("ORION_GRAPH_SCENES", "3")),
+        recall_k=int(os.getenv("ORION_RECALL_K", "0")),
+    )
 
     while True:
-        player_action = player_action = input("\n➡️ What does your character do? (or type 'quit' to exit): ")
+        player_action = input("\n➡️ What does your character do? (or 'talk <npc>: ...', or 'quit' to exit): ")
         if player_action.lower() == "quit":
             print("👋 Thanks for playing!")
+            if LOCAL_MATCH:
+                print(f"🎯 Local choice matcher hit rate: {choice_matcher.hit_rate:.0%} {dict(choice_matcher.stats)}")
+            if speculator:
+                print(f"🔮 Speculation: {speculator.stats}")
+            if crew_cache:
+                print(f"🗄️ Crew cache hit rate: {crew_cache.hit_rate:.0%} (hits={crew_cache.hits}, misses={crew_cache.misses})")
+            session.close()
+            flush_on_exit()
+            store.close()
+            if crew_cache:
+                crew_cache.close()
             break
 
-        choices = get_choices_for_scene()
+        # "talk <npc>: <what you say>" roleplays with an NPC without advancing the scene
+        if player_action.lower().startswith("talk ") and ":" in player_action:
+            npc, _, text = player_action[5:].partition(":")
+            reply = session.talk_to(npc.strip(), text.strip())
+            if reply is None:
+                print(f"❓ No NPC called '{npc.strip()}' here.")
+            else:
+                print(f"\n🗣️ {reply['npc']}: {reply['reply']}")
+            continue
 
-        matched_choice_output = player_interaction_crew.kickoff(inputs={
-            "player_action": player_action,
-            "available_choices": choices
-        })
-        matched_choice = crewOutputToJSON(matched_choice_output)
+        metrics.start_turn(session.scene_count)
+        result = session.play_turn(player_action, on_narration=narration.ConsoleNarration("🌍 Scene:"))
+        turn_metrics = metrics.end_turn()
 
-        if matched_choice["status"] == "retry":
+        if result is None:
             print("❌ Invalid action. Please choose a valid option.")
             continue
 
-        if matched_choice["status"] == "success":
-            current_story_progression += f"\nPlayer chose to do: {player_action} for choice: {matched_choice}\n" # Update progression
-
-            choice_id = matched_choice["choice"]["choice_id"]
-
-            # Generate the next scene
-            next_scene_output = story_scene_progression_crew.kickoff(inputs={
-                "current_story_progression": current_story_progression,
-                "choice": matched_choice_output.raw,
-                "player_action": player_action
-            })
-            next_scene_data = crewOutputToJSON(next_scene_output)
-
-            # Save next scene + link via LEADS_TO
-            save_scene(next_scene_data)
-            link_choice_to_scene(choice_id, next_scene_data["scene_id"])
-
-            current_story_progression += f"\nThe previous choice led to the following scene: {next_scene_data}\n" # Update progression
-
-        next_choices_output = story_choices_progression_crew.kickoff(inputs={
-            "current_story_progression": current_story_progression,
-            "scene_context": next_scene_data
-        })
-        next_choices_data = crewOutputToJSON(next_choices_output)
-
-        save_choices(next_choices_data)
-
-        # Update state
-        scene_count += 1
-
-        # Every 2 scenes, update the current story progression with a summary of what happened in the plot so far.
-        if scene_count % 2 == 0:
-            summary = story_summary_crew.kickoff(inputs={
-                "current_story_progression": current_story_progression
-            })
-            current_story_progression = summary.raw  # Refresh progression with summary
-            print("\n📝 Story Summary Update:", summary)
-
-        # Check condition for generating plot skeleton
-        if scene_count >= 5:
-            plot_skeleton = story_convergence_crew.kickoff(inputs={
-                "current_story_progression": current_story_progression
-            }).raw
-            print("\n🧩 Plot Skeleton Update:", plot_skeleton)
+        if turn_metrics:
+            print(f"\n⏱️ Turn took {turn_metrics['wall_s']:.1f}s ({turn_metrics['db']['round_trips']} DB round-trips)")
 
         # Display the scene and its corresponding choices
-        print("\n🌍 Scene:", next_scene_data["narration"])
-        print("\n🌍 Player Choices:", next_choices_output)
+        if not result["streamed"]:
+            print("\n🌍 Scene:", result["scene"]["narration"])
+        print("\n🌍 Player Choices:", result["choices_output"])
 
 
         # player_action = input("\n➡️ What does your character do? (or type 'quit' to exit): ")
@@ -0,0 +1,248 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Dict
+
+# ----------------------
+# Config
+# ----------------------
+ENABLED = os.getenv("ORION_METRICS") == "1"
+LOG_PATH = os.getenv("ORION_METRICS_LOG", ".orion/metrics.jsonl")
+# USD per 1K tokens, for the cost estimate (0 = don't estimate)
+PROMPT_COST_PER_1K = float(os.getenv("ORION_PROMPT_COST_PER_1K", "0"))
+COMPLETION_COST_PER_1K = float(os.getenv("ORION_COMPLETION_COST_PER_1K", "0"))
+
+_lock = threading.Lock()
+_log = None
+
+# The turn being recorded in this context. Like the scribe's ScribeState it
+# is per context, so concurrent server sessions each get their own; worker
+# threads only see it when started with contextvars.copy_context(), and
+# background kickoffs (summaries, plot skeletons, speculative branches)
+# are left out of turns and counted in the totals below only.
+_TURN: ContextVar[Dict[str, Any] | None] = ContextVar("metrics_turn", default=None)
+
+# Cumulative counters for the Prometheus endpoint: {metric: {label value: number}}
+_totals: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+# LLM time per thread, fed by crewai's event bus (see _listen_llm_calls)
+_llm_seconds: Dict[int, float] = defaultdict(float)
+_llm_started: Dict[int, float] = {}
+_listening = False
+
+
+def _crew_stats() -> Dict[str, float]:
+    return {
+        "kickoffs": 0, "cached": 0, "wall_s": 0.0, "llm_s": 0.0,
+        "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+    }
+
+
+def _cost(prompt_tokens: int, completion_tokens: int) -> float:
+    return prompt_tokens / 1000 * PROMPT_COST_PER_1K + completion_tokens / 1000 * COMPLETION_COST_PER_1K
+
+
+# ----------------------
+# LLM timing
+# ----------------------
+def _listen_llm_calls() -> None:
+    """Time individual LLM calls and count failed ones (retried by crewai)."""
+    global _listening
+    if _listening:
+        return
+    _listening = True
+    try:
+        from crewai.events import crewai_event_bus, LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent
+    except ImportError:
+        try:
+            from crewai.utilities.events import crewai_event_bus, LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent
+        except ImportError:
+            print("⚠️ crewai event bus unavailable — LLM time and retries will not be recorded")
+            return
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def _started(source, event):
+        _llm_started[threading.get_ident()] = time.perf_counter()
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def _completed(source, event):
+        started = _llm_started.pop(threading.get_ident(), None)
+        if started is not None:
+            _llm_seconds[threading.get_ident()] += time.perf_counter() - started
+
+    @crewai_event_bus.on(LLMCallFailedEvent)
+    def _failed(source, event):
+        _llm_started.pop(threading.get_ident(), None)
+        turn = _TURN.get()
+        with _lock:
+            _totals["orion_llm_failed_calls_total"][""] += 1
+            if turn is not None:
+                turn["llm_failures"] += 1
+
+
+# ----------------------
+# Recording
+# ----------------------
+def start_turn(label: Any) -> None:
+    """Begin collecting numbers for one game turn (or setup) in the current context."""
+    if not ENABLED:
+        return
+    _TURN.set({
+        "turn": label,
+        "started_at": time.time(),
+        "_t0": time.perf_counter(),
+        "crews": defaultdict(_crew_stats),
+        "db": {"calls": 0, "round_trips": 0, "seconds": 0.0, "retries": 0},
+        "llm_failures": 0,
+    })
+
+
+def end_turn() -> Dict | None:
+    """Close this context's turn, append it to the JSON log and return it."""
+    global _log
+    if not ENABLED:
+        return None
+    turn = _TURN.get()
+    if turn is None:
+        return None
+    _TURN.set(None)
+    with _lock:
+        turn["wall_s"] = round(time.perf_counter() - turn.pop("_t0"), 4)
+        turn["crews"] = dict(turn["crews"])
+        _totals["orion_turns_total"][""] += 1
+        _totals["orion_turn_seconds_total"][""] += turn["wall_s"]
+
+        if _log is None:
+            os.makedirs(os.path.dirname(os.path.abspath(LOG_PATH)), exist_ok=True)
+            _log = open(LOG_PATH, "a", encoding="utf-8")
+        _log.write(json.dumps(turn, default=str) + "\n")
+        _log.flush()
+    return turn
+
+
+def record_crew(name: str, wall_s: float, llm_s: float, prompt_tokens: int, completion_tokens: int, cached: bool) -> None:
+    if not ENABLED:
+        return
+    cost = _cost(prompt_tokens, completion_tokens)
+    turn = _TURN.get()
+    with _lock:
+        _totals["orion_crew_kickoffs_total"][name] += 1
+        _totals["orion_crew_cache_hits_total"][name] += int(cached)
+        _totals["orion_crew_wall_seconds_total"][name] += wall_s
+        _totals["orion_crew_llm_seconds_total"][name] += llm_s
+        _totals["orion_crew_prompt_tokens_total"][name] += prompt_tokens
+        _totals["orion_crew_completion_tokens_total"][name] += completion_tokens
+        _totals["orion_crew_cost_usd_total"][name] += cost
+        if turn is not None:
+            stats = turn["crews"][name]
+            stats["kickoffs"] += 1
+            stats["cached"] += int(cached)
+            stats["wall_s"] = round(stats["wall_s"] + wall_s, 4)
+            stats["llm_s"] = round(stats["llm_s"] + llm_s, 4)
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["cost_usd"] = round(stats["cost_usd"] + cost, 6)
+
+
+def record_db(op: str, seconds: float, round_trips: int, retry: bool = False) -> None:
+    if not ENABLED:
+        return
+    turn = _TURN.get()
+    with _lock:
+        _totals["orion_db_calls_total"][op] += 1
+        _totals["orion_db_round_trips_total"][op] += round_trips
+        _totals["orion_db_seconds_total"][op] += seconds
+        _totals["orion_db_retries_total"][op] += int(retry)
+        if turn is not None:
+            db = turn["db"]
+            db["calls"] += 1
+            db["round_trips"] += round_trips
+            db["seconds"] = round(db["seconds"] + seconds, 4)
+            db["retries"] += int(retry)
+
+
+def _usage(output: Any) -> tuple:
+    usage = getattr(output, "token_usage", None)
+    if usage is None:
+        return 0, 0
+    if isinstance(usage, dict):
+        return int(usage.get("prompt_tokens") or 0), int(usage.get("completion_tokens") or 0)
+    return int(getattr(usage, "prompt_tokens", 0) or 0), int(getattr(usage, "completion_tokens", 0) or 0)
+
+
+class InstrumentedCrew:
+    """Wraps a Crew and records wall time, LLM time and token usage per kickoff."""
+
+    def __init__(self, name: str, crew: Any):
+        self.name = name
+        self._crew = crew
+        _listen_llm_calls()
+
+    def kickoff(self, inputs: Dict[str, Any] | None = None):
+        thread = threading.get_ident()
+        llm_before = _llm_seconds[thread]
+        t0 = time.perf_counter()
+        output = self._crew.kickoff(inputs=inputs)
+        wall_s = time.perf_counter() - t0
+
+        prompt_tokens, completion_tokens = _usage(output)
+        record_crew(
+            self.name,
+            wall_s=wall_s,
+            llm_s=_llm_seconds[thread] - llm_before,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached=bool(getattr(output, "cached", False)),
+        )
+        return output
+
+    def copy(self) -> "InstrumentedCrew":
+        return InstrumentedCrew(self.name, self._crew.copy())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._crew, name)
+
+
+# ----------------------
+# Prometheus endpoint
+# ----------------------
+def render_prometheus() -> str:
+    label_names = {"orion_crew": "crew", "orion_db": "op"}
+    lines = []
+    with _lock:
+        for metric in sorted(_totals):
+            lines.append(f"# TYPE {metric} counter")
+            label = next((v for k, v in label_names.items() if metric.startswith(k)), None)
+            for value, number in sorted(_totals[metric].items()):
+                labels = f'{{{label}="{value}"}}' if label and value else ""
+                lines.append(f"{metric}{labels} {number:g}")
+    return "\n".join(lines) + "\n"
+
+
+def serve_prometheus(port: int, host: str = "127.0.0.1"):
+    """Serve /metrics in Prometheus text format on a daemon thread."""
+    # Imported here: most processes never serve metrics
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass # Keep scrapes out of the game's console
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    print(f"📈 Metrics on http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,123 @@
+# src/dungeons_and_dragons/narration.py
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+# ORION_STREAM=1 streams the Dungeon Master's scene narration token by token
+ENABLED = os.getenv("ORION_STREAM") == "1"
+
+# Tasks whose LLM output is prose shown to the player (the structuring task after them is JSON)
+NARRATIVE_TASKS = ("pregame_scene", "progress_scene")
+
+_lock = threading.Lock()
+_by_task: Dict[str, "NarrationStream"] = {}
+_by_thread: Dict[int, "NarrationStream"] = {}
+_listening = False
+
+
+class NarrationStream:
+    """The narration chunks of one kickoff, handed to ``on_chunk`` as they arrive."""
+
+    def __init__(self, on_chunk: Callable[[str], None] | None):
+        self.on_chunk = on_chunk
+        self.chunks = 0
+
+    @property
+    def streamed(self) -> bool:
+        return self.chunks > 0
+
+    def __call__(self, chunk: str) -> None:
+        self.chunks += 1
+        try:
+            self.on_chunk(chunk)
+        except Exception as e:
+            print(f"⚠️ Narration stream consumer failed: {e}")
+
+
+class ConsoleNarration:
+    """on_chunk for the CLI: prints ``label`` before the first chunk, then the text as it comes."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self._started = False
+
+    def __call__(self, chunk: str) -> None:
+        if not self._started:
+            print(f"\n{self.label}", end=" ", flush=True)
+            self._started = True
+        print(chunk, end="", flush=True)
+
+    def finish(self) -> None:
+        print()
+
+
+def _listen() -> None:
+    """Route crewai's LLMStreamChunkEvents to the stream of the kickoff they belong to."""
+    global _listening
+    if _listening:
+        return
+    _listening = True
+    try:
+        from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+    except ImportError:
+        try:
+            from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+        except ImportError:
+            print("⚠️ crewai event bus unavailable — narration will not be streamed")
+            return
+
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def _chunk(source, event):
+        task_id = getattr(event, "task_id", None)
+        with _lock:
+            if task_id:
+                sink = _by_task.get(str(task_id))
+            elif getattr(event, "task_name", None) in (None, *NARRATIVE_TASKS):
+                # Older crewai events don't say which task they belong to
+                sink = _by_thread.get(threading.get_ident())
+            else:
+                sink = None
+        if sink and event.chunk:
+            sink(event.chunk)
+
+
+@contextmanager
+def stream(crew, on_chunk: Callable[[str], None] | None):
+    """
+    Stream the narrative task of ``crew`` to ``on_chunk`` during a kickoff
+    inside this block. Yields a NarrationStream; ``streamed`` is False when
+    nothing arrived (streaming off, a cached or speculated output, a crew
+    without a narrative task), so the caller should show the narration
+    itself. ``on_chunk.finish()``, if defined, is called after a streamed kickoff.
+    """
+    sink = NarrationStream(on_chunk)
+    if not ENABLED or on_chunk is None:
+        yield sink
+        return
+
+    _listen()
+    task_ids = [str(t.id) for t in getattr(crew, "tasks", None) or () if getattr(t, "name", None) in NARRATIVE_TASKS]
+    thread_id = threading.get_ident()
+    with _lock:
+        for task_id in task_ids:
+            _by_task[task_id] = sink
+        _by_thread[thread_id] = sink
+    try:
+        yield sink
+    finally:
+        with _lock:
+            for task_id in task_ids:
+                _by_task.pop(task_id, None)
+            _by_thread.pop(thread_id, None)
+        if sink.streamed and hasattr(on_chunk, "finish"):
+            on_chunk.finish()
+
+
+def llm_options() -> Dict:
+    """Agent kwargs that turn on token streaming for the narrating agent."""
+    if not ENABLED:
+        return {}
+    from crewai import LLM
+
+    return {"llm": LLM(model=os.getenv("MODEL", "gpt-4o-mini"), stream=True)}
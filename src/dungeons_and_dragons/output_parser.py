@@ -0,0 +1,213 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, List, Tuple
+
+from dungeons_and_dragons.schemas.validation import normalize, validate
+
+_CLOSERS = {"{": "}", "[": "]"}
+# Bounds on the work one response can cost: candidates tried, and the size
+# above which a candidate only gets a plain json.loads (no repair pass)
+_MAX_CANDIDATES = 32
+_MAX_REPAIR_CHARS = 100_000
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "„": '"', "‟": '"', "‘": "'", "’": "'"})
+
+
+@dataclass
+class ParseResult:
+    """The JSON value pulled out of an LLM response and how we got it."""
+    value: Any
+    span: Tuple[int, int]
+    repairs: List[str] = field(default_factory=list)
+    schema_valid: bool = True
+
+
+# ----------------------
+# Scanning
+# ----------------------
+def _scan(text: str) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """
+    One pass over the text, aware of brackets and JSON strings. Returns every
+    balanced {...}/[...] span and the positions of brackets still open at
+    the end, which mark a truncated tail.
+
+    Quotes are only treated as string delimiters inside brackets, so prose
+    like `He said "hi"` around the JSON cannot derail the scan.
+    """
+    spans = []
+    stack: List[int] = []
+    in_string = False
+    escaped = False
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"' and stack:
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(i)
+        elif ch in ("}", "]"):
+            # A stray closer that does not match the open bracket is ignored
+            if stack and _CLOSERS[text[stack[-1]]] == ch:
+                spans.append((stack.pop(), i + 1))
+
+    return spans, stack
+
+
+# ----------------------
+# Repairs
+# ----------------------
+def _strip_trailing_commas(text: str) -> str:
+    out = []
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == ",":
+            j = i + 1
+            while j < len(text) and text[j].isspace():
+                j += 1
+            if j < len(text) and text[j] in ("}", "]"):
+                continue
+        out.append(ch)
+    return "".join(out)
+
+
+def _close_truncated(text: str) -> str:
+    """Close a JSON value that was cut off mid-stream."""
+    stack = []
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+        elif ch in ("}", "]") and stack:
+            stack.pop()
+
+    if in_string:
+        text += '"'
+
+    # Drop a dangling separator, or an object key that never got its value
+    text = text.rstrip().rstrip(",:").rstrip()
+    if stack and stack[-1] == "}" and text.endswith('"'):
+        key_start = text.rfind('"', 0, len(text) - 1)
+        if key_start != -1 and text[:key_start].rstrip()[-1:] in ("{", ","):
+            text = text[:key_start].rstrip().rstrip(",")
+
+    return text + "".join(reversed(stack))
+
+
+_REPAIRS = [
+    ("normalized smart quotes", lambda t: t.translate(_SMART_QUOTES)),
+    ("removed trailing commas", _strip_trailing_commas),
+]
+
+
+def _load(candidate: str, truncated: bool) -> Tuple[Any, List[str]]:
+    """
+    json.loads, applying repairs cumulatively until it parses. Very deep
+    nesting (RecursionError) counts as unparseable, and candidates over
+    _MAX_REPAIR_CHARS are not repaired.
+    """
+    repairs = []
+    steps = list(_REPAIRS)
+    if truncated:
+        steps.append(("closed truncated JSON", _close_truncated))
+
+    try:
+        return json.loads(candidate), repairs
+    except (ValueError, RecursionError):
+        if len(candidate) > _MAX_REPAIR_CHARS:
+            raise ValueError("unparseable")
+
+    for name, repair in steps:
+        repaired = repair(candidate)
+        if repaired == candidate:
+            continue
+        candidate = repaired
+        repairs.append(name)
+        try:
+            return json.loads(candidate), repairs
+        except (ValueError, RecursionError):
+            continue
+    raise ValueError("unparseable")
+
+
+# ----------------------
+# Schema matching
+# ----------------------
+def _matches(value: Any, kind: str | None, many: bool) -> bool:
+    if kind is None:
+        return True
+    try:
+        items = normalize(kind, value, many=many)
+        for item in items if many else [items]:
+            # The scribe assigns/prefixes ids itself, so a missing id is fine here
+            validate(kind, {f"{kind}_id": "pending", **item})
+        return True
+    except ValueError:
+        return False
+
+
+def extract_json(text: str, kind: str | None = None, many: bool = False) -> ParseResult:
+    """
+    Find the JSON value in an LLM response.
+
+    Candidates are the balanced objects/arrays in the text plus a truncated
+    tail, tried outermost first in order of appearance. Spans nested inside
+    a candidate that parsed are skipped (normalize() already unwraps
+    envelopes), and at most _MAX_CANDIDATES are tried, so a pathological
+    response costs linear time. With ``kind`` (a schema name from
+    schemas/validation.py, ``many`` for arrays) the first candidate matching
+    that schema wins; otherwise, or when none match, the first parseable one.
+    Repairs applied to the winning candidate are listed in ``repairs``.
+    """
+    spans, open_brackets = _scan(text)
+    candidates = [(start, end, False) for start, end in spans]
+    candidates += [(start, len(text), True) for start in open_brackets]
+    candidates.sort(key=lambda c: (c[0], -c[1]))
+
+    fallback = None
+    parsed_end = 0
+    tried = 0
+    for start, end, truncated in candidates:
+        if start < parsed_end:
+            continue
+        if tried == _MAX_CANDIDATES:
+            break
+        tried += 1
+        try:
+            value, repairs = _load(text[start:end], truncated)
+        except ValueError:
+            continue
+        parsed_end = end
+
+        if _matches(value, kind, many):
+            return ParseResult(value=value, span=(start, end), repairs=repairs)
+        if fallback is None:
+            fallback = ParseResult(value=value, span=(start, end), repairs=repairs, schema_valid=False)
+
+    if fallback is not None:
+        return fallback
+    raise ValueError(f"No valid JSON found in Crew output:\n{text}")
@@ -0,0 +1,117 @@
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from dungeons_and_dragons.story_context import StoryContext
+
+
+class PlotSkeletonPlanner:
+    """
+    Decides when story_convergence_crew is worth re-running and runs it in
+    the background.
+
+    The skeleton is memoized against a fingerprint of the summarized
+    progression. From ``min_scenes`` on it is regenerated only when:
+
+      - no skeleton exists yet, or
+      - the summary changed and ``cadence`` scenes passed since the last run, or
+      - a significance signal fired: an NPC or faction not seen before shows
+        up in a scene, or the player picks a choice the skeleton never
+        mentions (the story diverged from the sketched arcs).
+
+    poll() stores a finished skeleton on the StoryContext so the next
+    progress_scene / progress_choices prompts include it.
+    """
+
+    def __init__(self, crew: Any, story: StoryContext, min_scenes: int = 5, cadence: int = 3):
+        self._crew = crew
+        self._story = story
+        self.min_scenes = min_scenes
+        self.cadence = cadence
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plot-skeleton")
+        self._job: Future | None = None
+        self._fingerprint: str | None = None
+        self._last_scene = 0
+        self._known_npcs: set = set()
+        self._known_factions: set = set()
+        self.signals: List[str] = []
+        self.stats = {"generated": 0, "skipped": 0}
+
+    @staticmethod
+    def _fingerprint_of(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def seed(self, world: Dict) -> None:
+        """Register the NPCs and factions the world starts with (not news)."""
+        for npc in world.get("npcs", []) + world.get("npc", []):
+            self._known_npcs.add(str(npc.get("name", "")).lower())
+        for faction in world.get("factions", []):
+            self._known_factions.add(str(faction.get("name", "")).lower())
+
+    def observe(self, scene: Dict, choice: Dict | None = None) -> None:
+        """Collect significance signals from a committed turn."""
+        for npc in scene.get("npcs", []):
+            name = str(npc.get("name", "")).lower()
+            if name and name not in self._known_npcs:
+                self._known_npcs.add(name)
+                self.signals.append(f"new NPC: {npc.get('name')}")
+
+            faction = npc.get("faction")
+            faction_name = str(faction.get("name", "") if isinstance(faction, dict) else faction or "").lower()
+            if faction_name and faction_name not in self._known_factions:
+                self._known_factions.add(faction_name)
+                self.signals.append(f"faction change: {faction_name}")
+
+        skeleton = self._story.plot_skeleton.lower()
+        title = str((choice or {}).get("title") or "").lower()
+        if skeleton and title:
+            words = {w for w in title.split() if len(w) > 3}
+            if words and not any(w in skeleton for w in words):
+                self.signals.append(f"branch divergence: {choice.get('title')}")
+
+    def maybe_refresh(self, scene_count: int) -> bool:
+        """Start a background regeneration if one is due. Returns True if started."""
+        self.poll()
+        if scene_count < self.min_scenes or (self._job is not None and not self._job.done()):
+            return False
+
+        fingerprint = self._fingerprint_of(self._story.summary)
+        due = (
+            not self._story.plot_skeleton
+            or self.signals
+            or (fingerprint != self._fingerprint and scene_count - self._last_scene >= self.cadence)
+        )
+        if not due:
+            self.stats["skipped"] += 1
+            return False
+
+        if self.signals:
+            print(f"\n🧩 Plot skeleton refresh triggered by {', '.join(self.signals)}")
+        self.signals = []
+        self._fingerprint = fingerprint
+        self._last_scene = scene_count
+        progression = self._story.render("generate_plot_skeleton")
+        self._job = self._executor.submit(
+            self._crew.kickoff, inputs={"current_story_progression": progression}
+        )
+        return True
+
+    def poll(self) -> str | None:
+        """Apply a finished skeleton, if any, and return it."""
+        if self._job is None or not self._job.done():
+            return None
+
+        job, self._job = self._job, None
+        try:
+            skeleton = job.result().raw
+        except Exception as e:
+            print(f"⚠️ Plot skeleton generation failed: {e}")
+            self.signals.append("retry after failure")
+            return None
+
+        self._story.plot_skeleton = skeleton
+        self.stats["generated"] += 1
+        return skeleton
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,102 @@
+# src/dungeons_and_dragons/retrieval.py
+import json
+from typing import Dict, List
+
+from dungeons_and_dragons.story_context import _truncate, estimate_tokens
+from dungeons_and_dragons.tools import scribe_tools
+from dungeons_and_dragons.tools.scribe_tools import current_state, get_story_graph
+
+
+def _faction_name(npc: Dict, factions: Dict[str, str]) -> str | None:
+    if npc.get("faction_ref") in factions:
+        return factions[npc["faction_ref"]]
+    faction = npc.get("faction")
+    if isinstance(faction, str):
+        # Nested props are stored as JSON strings (scribe_tools._sanitize_props)
+        try:
+            faction = json.loads(faction)
+        except json.JSONDecodeError:
+            return None
+    return faction.get("name") if isinstance(faction, dict) else None
+
+
+def render_story_graph(graph: Dict, max_tokens: int = 600, recent_scenes: int = 3) -> str:
+    """
+    A compact prompt block from get_story_graph(): one line per step of the
+    path (the choice taken, then the scene it led to), a short description of
+    the last ``recent_scenes`` scenes, and the NPCs/factions in them. When
+    over ``max_tokens`` the middle of the path is elided first, keeping the
+    opening scene and the newest steps.
+    """
+    path = graph.get("path") or []
+    if not path:
+        return ""
+
+    steps: List[str] = []
+    for i, entry in enumerate(path):
+        scene = entry["scene"]
+        line = f"{i + 1}. "
+        if entry.get("choice"):
+            # The choice that led here
+            line += f"[{entry['choice'].get('title')}] → "
+        line += str(scene.get("title"))
+        if i >= len(path) - recent_scenes and scene.get("description"):
+            line += f": {_truncate(scene['description'], 30)}"
+        steps.append(line)
+
+    factions = {f.get("faction_id"): f.get("name") for f in graph.get("factions") or []}
+    cast = []
+    for npc in graph.get("npcs") or []:
+        faction = _faction_name(npc, factions)
+        detail = ", ".join(filter(None, [npc.get("desc") or npc.get("role"), faction]))
+        cast.append(f"{npc.get('name')} ({detail})" if detail else str(npc.get("name")))
+
+    tail = []
+    if cast:
+        tail.append(_truncate("NPCs in recent scenes: " + "; ".join(cast), max_tokens // 3))
+    if factions:
+        tail.append(_truncate("Factions involved: " + "; ".join(filter(None, factions.values())), max_tokens // 6))
+
+    budget = max_tokens - estimate_tokens("\n".join(tail)) - 10
+    kept: List[str] = []
+    for line in reversed(steps[1:]):
+        cost = estimate_tokens(line) + 1
+        if cost > budget - estimate_tokens(steps[0]):
+            break
+        kept.append(line)
+        budget -= cost
+    if len(kept) < len(steps) - 1:
+        kept.append("…")
+    kept.append(_truncate(steps[0], max(budget, 20)))
+
+    return "\n".join(["Path so far ([choice taken] → scene, opening scene first):", *reversed(kept), *tail])
+
+
+def retrieve_story_graph(recent_scenes: int = 3, limit: int = 50, max_tokens: int = 600) -> str:
+    """Read the graph around the current scene and render it (see render_story_graph)."""
+    graph = get_story_graph(limit=limit, recent_scenes=recent_scenes)
+    return render_story_graph(graph, max_tokens=max_tokens, recent_scenes=recent_scenes)
+
+
+def recall_facts(query: str, k: int = 5, max_tokens: int = 300, skip_scenes: tuple = ()) -> str:
+    """
+    The ``k`` saved facts of the current world most relevant to ``query``
+    (scribe_tools.enable_semantic_index), as a prompt block of at most
+    ``max_tokens``. Passages of ``skip_scenes`` — already in the prompt
+    verbatim — are left out.
+    """
+    index = scribe_tools.SEMANTIC_INDEX
+    if index is None:
+        return ""
+    facts = index.search(current_state().world_id, query, k=k, exclude=tuple(f"scene:{s}:" for s in skip_scenes))
+    if not facts:
+        return ""
+
+    lines, budget = [], max_tokens - 8
+    for fact in facts:
+        line = f"- {_truncate(fact.text, max(budget // max(k, 1), 40))}"
+        if estimate_tokens(line) > budget:
+            break
+        lines.append(line)
+        budget -= estimate_tokens(line)
+    return "Relevant past facts:\n" + "\n".join(lines) if lines else ""
@@ -0,0 +1,91 @@
+import json
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from dungeons_and_dragons.schemas.character_schema import character_schema
+from dungeons_and_dragons.schemas.choice_schema import choice_schema
+from dungeons_and_dragons.schemas.faction_schema import faction_schema
+from dungeons_and_dragons.schemas.npc_schema import npc_schema
+from dungeons_and_dragons.schemas.player_schema import player_schema
+from dungeons_and_dragons.schemas.scene_schema import scene_schema
+from dungeons_and_dragons.schemas.world_schema import world_schema
+
+SCHEMAS: Dict[str, dict] = {
+    "world": world_schema,
+    "scene": scene_schema,
+    "choice": choice_schema,
+    "npc": npc_schema,
+    "faction": faction_schema,
+    "player": player_schema,
+    "character": character_schema,
+}
+
+
+@lru_cache(maxsize=None)
+def get_validator(kind: str):
+    """Build (and check) the validator for a schema once; later calls reuse it."""
+    import jsonschema # Deferred: importing it costs ~100 ms of startup
+
+    schema = SCHEMAS[kind]
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+def normalize(kind: str, payload: Any, many: bool = False, label: str | None = None) -> Dict | List[Dict]:
+    """
+    Turn whatever an agent handed us into a plain dict (or list of dicts when
+    ``many``): parse JSON strings and unwrap ``{"<kind>_json": ...}`` /
+    ``{"<kind>": ...}`` envelopes (plural keys for lists).
+    """
+    label = label or f"save_{kind}"
+    key = f"{kind}s" if many else kind
+
+    if payload is None:
+        raise ValueError(f"{label}: received None payload")
+
+    if isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except Exception as e:
+            raise ValueError(f"{label}: provided string is not valid JSON: {e}")
+
+    if isinstance(payload, dict) and f"{key}_json" in payload:
+        payload = payload[f"{key}_json"]
+
+    if isinstance(payload, dict) and key in payload:
+        payload = payload[key]
+
+    expected = list if many else dict
+    if not isinstance(payload, expected):
+        raise ValueError(
+            f"{label}: expected {expected.__name__} after normalization, got {type(payload)}"
+        )
+
+    items = payload if many else [payload]
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"{label}: expected dict for {kind} at index {i}, got {type(item)}")
+
+    if not payload:
+        raise ValueError(f"{label}: Received empty or invalid {kind} object")
+
+    return payload
+
+
+def validate(kind: str, instance: Dict) -> Dict:
+    import jsonschema
+
+    try:
+        get_validator(kind).validate(instance)
+    except jsonschema.ValidationError as e:
+        raise ValueError(f"{kind.capitalize()} JSON validation failed at {list(e.path)}: {e.message}")
+    return instance
+
+
+def normalize_and_validate(kind: str, payload: Any, many: bool = False, label: str | None = None) -> Dict | List[Dict]:
+    """Single entry point used by the scribe for every payload it persists."""
+    normalized = normalize(kind, payload, many=many, label=label)
+    for item in normalized if many else [normalized]:
+        validate(kind, item)
+    return normalized
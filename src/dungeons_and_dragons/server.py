@@ -0,0 +1,488 @@
+import asyncio
+import dataclasses
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import copy_context
+from typing import Any, AsyncIterator, Callable, Dict, Tuple
+from urllib.parse import unquote
+
+from dotenv import load_dotenv
+
+from dungeons_and_dragons import metrics
+from dungeons_and_dragons.choice_matcher import ChoiceMatcher
+from dungeons_and_dragons.crew_cache import crew_wrapper, open_crew_cache
+from dungeons_and_dragons.game import Crews, GameSession
+from dungeons_and_dragons.tools.scribe_tools import enable_semantic_index, enable_write_behind, flush_on_exit, get_store
+from dungeons_and_dragons.world_pool import WorldPool
+
+load_dotenv()
+
+# ----------------------
+# Config
+# ----------------------
+HOST = os.getenv("ORION_SERVER_HOST", "127.0.0.1")
+PORT = int(os.getenv("ORION_SERVER_PORT", "8080"))
+# Crew sets in the pool = turns (and world setups) generating at once
+POOL_SIZE = int(os.getenv("ORION_SERVER_CREWS", "4"))
+MAX_SESSIONS = int(os.getenv("ORION_SERVER_MAX_SESSIONS", "500"))
+# Sessions without a request for this many seconds are closed
+IDLE_TIMEOUT = float(os.getenv("ORION_SERVER_IDLE_TIMEOUT", "1800"))
+MAX_BODY = 64 * 1024
+
+
+class CrewPool:
+    """
+    A fixed number of crew sets shared by all sessions. crewai crews are not
+    safe to run concurrently, so a turn checks a whole set out and returns
+    it when done; callers beyond ``size`` wait their turn.
+    """
+
+    def __init__(self, build: Callable[[], Crews], size: int):
+        self._build = build
+        self.size = size
+        self._created = 0
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._lock = asyncio.Lock()
+
+    @property
+    def in_use(self) -> int:
+        return self._created - self._idle.qsize()
+
+    @asynccontextmanager
+    async def checkout(self):
+        async with self._lock:
+            if self._idle.empty() and self._created < self.size:
+                # Sets are built lazily, off the event loop
+                self._created += 1
+                self._idle.put_nowait(await asyncio.to_thread(self._build))
+        crews = await self._idle.get()
+        try:
+            yield crews
+        finally:
+            self._idle.put_nowait(crews)
+
+
+class _Table:
+    """A hosted game: its session, a lock serializing its turns and its last activity."""
+
+    def __init__(self, session: GameSession):
+        self.session = session
+        self.lock = asyncio.Lock()
+        self.last_seen = time.monotonic()
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+_REASONS = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+            422: "Unprocessable Entity", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class GameServer:
+    """
+    Hosts many concurrent games in one process over a small JSON/HTTP API:
+
+      POST   /sessions                 set up (or claim a pooled) new world → {session_id, scene, choices}
+      GET    /sessions/{id}            current scene and choices
+      POST   /sessions/{id}/turns      {"action": "..."} → next {scene, choices}
+      POST   /sessions/{id}/npcs/{npc}/talk  {"text": "..."} → {npc, reply, disposition} (npc: name or id)
+      DELETE /sessions/{id}            end the game
+      GET    /healthz                  sessions, crew sets in use and world pool status
+
+    With ``?stream=1`` the two POSTs answer with chunked NDJSON instead:
+    {"narration": "..."} lines as the scene is narrated (ORION_STREAM=1),
+    then the usual body as the last line.
+
+    Each session has its own ScribeState and story context; the store,
+    its connection pool and the crew pool are shared. Blocking crew and DB
+    work runs on a thread pool a little larger than the crew pool. A session plays one
+    turn at a time (a second concurrent request gets 409), at most
+    ``max_sessions`` games are hosted (503 beyond that) and idle ones are
+    closed after ``idle_timeout`` seconds. With a ``world_pool`` new
+    sessions start from a pre-generated world when one is ready.
+    """
+
+    def __init__(
+        self,
+        build_crews: Callable[[], Crews],
+        pool_size: int = POOL_SIZE,
+        max_sessions: int = MAX_SESSIONS,
+        idle_timeout: float = IDLE_TIMEOUT,
+        session_options: Dict[str, Any] | None = None,
+        world_parallelism: int = 0,
+        world_pool: WorldPool | None = None,
+    ):
+        self.pool = CrewPool(build_crews, pool_size)
+        self._build_crews = build_crews
+        self._pooled_crews: Crews | None = None
+        self._pooled_crews_lock = asyncio.Lock()
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.session_options = session_options or {}
+        self.world_parallelism = world_parallelism
+        self.world_pool = world_pool
+        self.tables: Dict[str, _Table] = {}
+        self._pending = 0
+        # Turns hold a crew set; the extra workers keep quick reads from queueing behind them
+        self._executor = ThreadPoolExecutor(max_workers=pool_size + 4, thread_name_prefix="game")
+        self.choice_matcher = ChoiceMatcher(threshold=float(os.getenv("ORION_MATCH_THRESHOLD", "0.6")))
+
+    async def _blocking(self, fn, *args):
+        # A fresh context per job: scribe state and metrics turns set by one
+        # job never leak into the next one run on the same worker thread
+        return await asyncio.get_running_loop().run_in_executor(self._executor, copy_context().run, fn, *args)
+
+    @staticmethod
+    def _metered(label: str, fn, *args):
+        # Crew and DB numbers of this job only (ORION_METRICS), not of other sessions
+        metrics.start_turn(label)
+        try:
+            return fn(*args)
+        finally:
+            metrics.end_turn()
+
+    # ----------------------
+    # Game operations
+    # ----------------------
+    async def create_session(self, on_narration=None) -> Tuple[str, GameSession]:
+        if len(self.tables) + self._pending >= self.max_sessions:
+            raise HTTPError(503, f"Server is hosting the maximum of {self.max_sessions} games")
+
+        options = {
+            "choice_matcher": self.choice_matcher if os.getenv("ORION_LOCAL_MATCH", "1") == "1" else None,
+            **self.session_options,
+        }
+        self._pending += 1
+        try:
+            pooled = self.world_pool.claim() if self.world_pool else None
+            if pooled is not None:
+                # Ready-made world: no crew set is needed before the first turn
+                async with self._pooled_crews_lock:
+                    if self._pooled_crews is None:
+                        self._pooled_crews = await asyncio.to_thread(self._build_crews)
+                own = self._own_crews(self._pooled_crews)
+                session = await self._blocking(lambda: GameSession(
+                    own, pooled.world_data, pooled.scene_data, scribe=pooled.scribe, **options,
+                ))
+            else:
+                async with self.pool.checkout() as crews:
+                    own = self._own_crews(crews)
+                    session = await self._blocking(self._metered, "setup", lambda: GameSession.start(
+                        own, on_narration=on_narration, world_parallelism=self.world_parallelism, **options,
+                    ))
+        finally:
+            self._pending -= 1
+
+        session_id = uuid.uuid4().hex
+        self.tables[session_id] = _Table(session)
+        return session_id, session
+
+    @staticmethod
+    def _own_crews(crews: Crews) -> Crews:
+        # Background summaries/skeletons run between turns, so the
+        # session gets private copies of those two crews
+        return dataclasses.replace(
+            crews,
+            story_summary=crews.story_summary.copy(),
+            story_convergence=crews.story_convergence.copy(),
+        )
+
+    def _table(self, session_id: str) -> _Table:
+        table = self.tables.get(session_id)
+        if table is None:
+            raise HTTPError(404, f"No game session {session_id}")
+        table.last_seen = time.monotonic()
+        return table
+
+    def _idle_table(self, session_id: str) -> _Table:
+        table = self._table(session_id)
+        if table.lock.locked():
+            raise HTTPError(409, "A turn is already in progress for this session")
+        return table
+
+    async def play_turn(self, session_id: str, action: str, on_narration=None) -> Dict | None:
+        table = self._idle_table(session_id)
+        async with table.lock:
+            async with self.pool.checkout() as crews:
+                label = f"{session_id}/{table.session.scene_count}"
+                return await self._blocking(self._metered, label, table.session.play_turn, action, crews, on_narration)
+
+    async def talk(self, session_id: str, npc: str, text: str) -> Dict | None:
+        table = self._idle_table(session_id)
+        async with table.lock:
+            async with self.pool.checkout() as crews:
+                label = f"{session_id}/talk"
+                return await self._blocking(self._metered, label, table.session.talk_to, npc, text, crews)
+
+    async def close_session(self, session_id: str) -> None:
+        await self._close(session_id, self._table(session_id))
+
+    async def _close(self, session_id: str, table: _Table) -> None:
+        async with table.lock:
+            if self.tables.get(session_id) is not table:
+                return # Closed by another request while we waited for the lock
+            self.tables.pop(session_id)
+            await self._blocking(table.session.close)
+
+    async def reap_idle(self) -> None:
+        while True:
+            await asyncio.sleep(min(60.0, self.idle_timeout))
+            cutoff = time.monotonic() - self.idle_timeout
+            for session_id, table in list(self.tables.items()):
+                if self.tables.get(session_id) is not table:
+                    continue # Deleted since the snapshot
+                if table.last_seen < cutoff and not table.lock.locked():
+                    print(f"💤 Closing idle session {session_id}")
+                    try:
+                        await self._close(session_id, table)
+                    except Exception as e:
+                        # One bad session must not stop the reaper for all the others
+                        print(f"⚠️ Closing idle session {session_id} failed: {e}")
+
+    # ----------------------
+    # HTTP
+    # ----------------------
+    async def _streamed(self, run: Callable[[Callable[[str], None]], Any]) -> AsyncIterator[Dict]:
+        """
+        Await ``run(on_narration)`` and yield {"narration": chunk} as the
+        worker thread produces them, then run's (status, payload) as the
+        last event.
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        done = asyncio.ensure_future(run(lambda chunk: loop.call_soon_threadsafe(chunks.put_nowait, chunk)))
+        try:
+            while not done.done():
+                getter = asyncio.ensure_future(chunks.get())
+                await asyncio.wait({getter, done}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield {"narration": getter.result()}
+                else:
+                    getter.cancel()
+            while not chunks.empty():
+                yield {"narration": chunks.get_nowait()}
+            status, payload = done.result()
+            yield {"status_code": status, **payload}
+        finally:
+            done.cancel()
+
+    async def _new_session(self, on_narration=None) -> Tuple[int, Dict]:
+        session_id, session = await self.create_session(on_narration)
+        choices = await self._blocking(session.choices)
+        return 201, {"session_id": session_id, "scene": session.scene, "choices": choices}
+
+    async def _turn(self, session_id: str, action: str, on_narration=None) -> Tuple[int, Dict]:
+        result = await self.play_turn(session_id, action, on_narration)
+        if result is None:
+            return 422, {"status": "retry", "error": "Invalid action. Please choose a valid option."}
+        return 200, {"status": "success", "scene": result["scene"], "choices": result["choices"]}
+
+    async def route(self, method: str, path: str, body: Dict) -> Tuple[int, Any]:
+        path, _, query = path.partition("?")
+        parts = [p for p in path.split("/") if p]
+        stream = "stream=1" in query.split("&")
+
+        if parts == ["healthz"] and method == "GET":
+            health = {"sessions": len(self.tables), "crew_sets": self.pool.size, "crew_sets_in_use": self.pool.in_use}
+            if self.world_pool:
+                health["world_pool"] = self.world_pool.status()
+            return 200, health
+
+        if parts == ["sessions"] and method == "POST":
+            if stream:
+                return 200, self._streamed(self._new_session)
+            return await self._new_session()
+
+        if len(parts) == 2 and parts[0] == "sessions":
+            if method == "GET":
+                session = self._table(parts[1]).session
+                choices = await self._blocking(session.choices)
+                return 200, {"session_id": parts[1], "scene_count": session.scene_count, "scene": session.scene, "choices": choices}
+            if method == "DELETE":
+                await self.close_session(parts[1])
+                return 204, None
+
+        if len(parts) == 3 and parts[0] == "sessions" and parts[2] == "turns" and method == "POST":
+            action = body.get("action")
+            if not isinstance(action, str) or not action.strip():
+                raise HTTPError(400, "Body must be {\"action\": \"<what the character does>\"}")
+            if stream:
+                self._idle_table(parts[1]) # 404 / 409 before the stream's 200 goes out
+                return 200, self._streamed(lambda on_narration: self._turn(parts[1], action, on_narration))
+            return await self._turn(parts[1], action)
+
+        if len(parts) == 5 and parts[0] == "sessions" and parts[2] == "npcs" and parts[4] == "talk" and method == "POST":
+            text = body.get("text")
+            if not isinstance(text, str) or not text.strip():
+                raise HTTPError(400, "Body must be {\"text\": \"<what the character says>\"}")
+            reply = await self.talk(parts[1], unquote(parts[3]), text)
+            if reply is None:
+                raise HTTPError(404, f"No NPC '{unquote(parts[3])}' in this game")
+            return 200, reply
+
+        raise HTTPError(404 if method in ("GET", "POST", "DELETE") else 405, f"No route for {method} {path}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", "0"))
+                    if length > MAX_BODY:
+                        raise HTTPError(413, "Request body too large")
+                    raw = await reader.readexactly(length) if length else b""
+                    try:
+                        body = json.loads(raw) if raw else {}
+                    except json.JSONDecodeError:
+                        raise HTTPError(400, "Body is not valid JSON")
+                    status, payload = await self.route(method.upper(), path, body if isinstance(body, dict) else {})
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    print(f"⚠️ {method} {path} failed: {e}")
+                    status, payload = 500, {"error": str(e)}
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if hasattr(payload, "__aiter__"):
+                    await self._write_stream(writer, status, payload, keep_alive)
+                    if not keep_alive:
+                        break
+                    continue
+
+                data = b"" if payload is None else json.dumps(payload, default=str).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, event: Dict) -> None:
+        line = json.dumps(event, default=str).encode("utf-8") + b"\n"
+        writer.write(f"{len(line):X}\r\n".encode("latin-1") + line + b"\r\n")
+
+    async def _write_stream(self, writer: asyncio.StreamWriter, status: int, events: AsyncIterator[Dict], keep_alive: bool) -> None:
+        """Send ``events`` as chunked NDJSON, one event per line."""
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/x-ndjson\r\n"
+            f"Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+        )
+        try:
+            async for event in events:
+                self._write_chunk(writer, event)
+                await writer.drain()
+        except HTTPError as e:
+            # The 200 is already out; errors become the last line
+            self._write_chunk(writer, {"status_code": e.status, "error": str(e)})
+        except Exception as e:
+            print(f"⚠️ Streamed response failed: {e}")
+            self._write_chunk(writer, {"status_code": 500, "error": str(e)})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def serve(self, host: str = HOST, port: int = PORT) -> None:
+        server = await asyncio.start_server(self.handle, host, port)
+        reaper = asyncio.create_task(self.reap_idle())
+        print(f"🏰 Orion game server on http://{host}:{port} (crew sets={self.pool.size}, max sessions={self.max_sessions})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            reaper.cancel()
+            for session_id, table in list(self.tables.items()):
+                try:
+                    await self._close(session_id, table)
+                except Exception as e:
+                    print(f"⚠️ Closing session {session_id} failed: {e}")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def serve():
+    from dungeons_and_dragons.crew import build_crews
+
+    store = get_store()
+    if not store.check_health():
+        raise RuntimeError("Story store is unreachable — check NEO4J_URI / credentials in .env, or set ORION_STORE=memory|sqlite")
+    if os.getenv("ORION_WRITE_BEHIND") == "1":
+        enable_write_behind()
+    if int(os.getenv("ORION_RECALL_K", "0")) > 0:
+        enable_semantic_index() # Index facts from the first save on
+    if os.getenv("ORION_METRICS_PORT"):
+        metrics.serve_prometheus(int(os.getenv("ORION_METRICS_PORT")))
+
+    # Same cache and instrumentation as the CLI, shared by every crew set
+    crew_cache = open_crew_cache()
+    wrap = crew_wrapper(crew_cache)
+
+    def build() -> Crews:
+        return build_crews(wrap=wrap)
+
+    world_parallelism = int(os.getenv("ORION_WORLD_PARALLELISM", "0"))
+    world_pool = None
+    if int(os.getenv("ORION_WORLD_POOL_SIZE", "0")) > 0:
+        # Worlds set up ahead of time, so POST /sessions is a claim, not a setup
+        world_pool = WorldPool(
+            build,
+            size=int(os.getenv("ORION_WORLD_POOL_SIZE")),
+            workers=int(os.getenv("ORION_WORLD_POOL_WORKERS", "1")),
+            max_age=float(os.getenv("ORION_WORLD_POOL_MAX_AGE_HOURS", "6")) * 3600,
+            parallelism=world_parallelism,
+        ).start()
+
+    server = GameServer(
+        build,
+        session_options={
+            "token_budget": int(os.getenv("ORION_CONTEXT_TOKENS", "2000")),
+            "recent_turns": int(os.getenv("ORION_CONTEXT_TURNS", "4")),
+            "skeleton_min_scenes": int(os.getenv("ORION_SKELETON_MIN_SCENES", "5")),
+            "skeleton_cadence": int(os.getenv("ORION_SKELETON_CADENCE", "3")),
+            "graph_context": os.getenv("ORION_GRAPH_CONTEXT") == "1",
+            "graph_scenes": int(os.getenv("ORION_GRAPH_SCENES", "3")),
+            "recall_k": int(os.getenv("ORION_RECALL_K", "0")),
+        },
+        world_parallelism=world_parallelism,
+        world_pool=world_pool,
+    )
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if world_pool:
+            world_pool.close()
+        flush_on_exit()
+        store.close()
+        if crew_cache:
+            print(f"🗄️ Crew cache hit rate: {crew_cache.hit_rate:.0%} (hits={crew_cache.hits}, misses={crew_cache.misses})")
+            crew_cache.close()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,94 @@
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class SceneSpeculator:
+    """
+    Pre-generates the follow-up for every offered choice while the player is
+    still typing.
+
+    start() submits one speculative branch per choice: the next scene from a
+    copy of the scene-progression crew and, optionally, that scene's choices
+    from a copy of the choices crew (crews are not safe to share between
+    threads). At most ``max_concurrent`` branches run at once; the rest queue.
+
+    claim() hands back the winning branch (waiting for it if it is still
+    running) and cancels the losers. Branches that already started cannot be
+    interrupted; their results are simply dropped.
+
+    A speculative scene is generated from the choice itself, with the choice
+    title standing in for the player's wording.
+    """
+
+    def __init__(
+        self,
+        scene_crew_factory: Callable[[], Any],
+        choices_crew_factory: Callable[[], Any] | None = None,
+        max_concurrent: int = 3,
+    ):
+        self._scene_crew_factory = scene_crew_factory
+        self._choices_crew_factory = choices_crew_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="speculate")
+        self._branches: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"started": 0, "served": 0, "missed": 0, "cancelled": 0}
+
+    def _generate(self, choice: Dict, story_progression: str) -> Tuple[Any, Any]:
+        matched_choice = json.dumps({"status": "success", "choice": choice})
+        progression = f"{story_progression}\nPlayer chose to do: {choice.get('title')} for choice: {matched_choice}\n"
+
+        scene_output = self._scene_crew_factory().kickoff(inputs={
+            "current_story_progression": progression,
+            "choice": matched_choice,
+            "player_action": choice.get("title"),
+        })
+
+        choices_output = None
+        if self._choices_crew_factory is not None:
+            choices_output = self._choices_crew_factory().kickoff(inputs={
+                "current_story_progression": progression,
+                "scene_context": scene_output.raw,
+            })
+        return scene_output, choices_output
+
+    def start(self, choices: List[Dict], story_progression: str) -> None:
+        """Speculate on every choice now on offer, replacing any earlier round."""
+        self.cancel()
+        with self._lock:
+            for choice in choices:
+                choice_id = choice.get("choice_id")
+                if choice_id:
+                    self._branches[choice_id] = self._executor.submit(self._generate, choice, story_progression)
+                    self.stats["started"] += 1
+
+    def claim(self, choice_id: str) -> Tuple[Any, Any] | None:
+        """Return (scene_output, choices_output) for the chosen branch, or None on a miss."""
+        with self._lock:
+            winner = self._branches.pop(choice_id, None)
+        self.cancel()
+
+        if winner is None or winner.cancelled():
+            self.stats["missed"] += 1
+            return None
+        try:
+            result = winner.result()
+        except Exception as e:
+            print(f"⚠️ Speculative branch for {choice_id} failed: {e}")
+            self.stats["missed"] += 1
+            return None
+
+        self.stats["served"] += 1
+        return result
+
+    def cancel(self) -> None:
+        with self._lock:
+            for future in self._branches.values():
+                if future.cancel():
+                    self.stats["cancelled"] += 1
+            self._branches.clear()
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
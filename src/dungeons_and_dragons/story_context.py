@@ -0,0 +1,192 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English prose; good enough for budgeting
+    return (len(text) + 3) // 4
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[: max(0, max_tokens * 4 - 1)].rstrip() + "…"
+
+
+@dataclass
+class Turn:
+    player_action: str
+    choice: Dict
+    scene: Dict | None = None
+
+    def render(self) -> str:
+        lines = [f"Player chose to do: {self.player_action} (choice: {self.choice.get('title')})"]
+        if self.choice.get("consequence"):
+            lines.append(f"Expected consequence: {self.choice['consequence']}")
+        if self.scene:
+            lines.append(f"This led to the scene '{self.scene.get('title')}': {self.scene.get('narration') or self.scene.get('description')}")
+        return "\n".join(lines)
+
+
+# Which tiers each task template in config/tasks.yaml needs in {current_story_progression}
+_TASK_TIERS = {
+    "progress_scene": ("world", "graph", "plot", "recall", "summary", "recent"),
+    "progress_choices": ("world", "graph", "plot", "recall", "summary", "recent"),
+    "summarize_story_progression": ("world", "summary", "unsummarized"),
+    "generate_plot_skeleton": ("world", "summary", "recent"),
+    # The NPC's own memory carries the rest
+    "npc_interaction": ("summary", "recent"),
+}
+
+
+@dataclass
+class StoryContext:
+    """
+    The story so far, kept in tiers instead of one ever-growing string:
+
+      - world: pinned essentials of the world and opening scene
+      - graph: path and cast around the current scene, from the story graph (retrieval.py)
+      - recall: older facts most relevant to the current turn, from the semantic index
+      - plot: the latest plot skeleton, once one exists
+      - summary: compacted narrative of older turns (from story_summary_crew)
+      - recent: a rolling window of the last ``recent_turns`` turns verbatim
+
+    render(task) assembles only the tiers that task's template uses and never
+    exceeds ``token_budget`` (estimated): the world tier is capped at a third
+    of the budget, the graph, plot and recall tiers each at a third of what
+    is left, then the summary, then recent turns newest-first until the budget is
+    spent. The summarize prompt takes pending turns oldest-first instead, so
+    the ones that don't fit are the newest and stay pending (render_for_summary).
+    """
+    token_budget: int = 2000
+    recent_turns: int = 4
+    world: str = ""
+    # Rendered story-graph neighbourhood, refreshed each turn when graph context is on
+    graph: str = ""
+    # Top-k recalled facts for the turn being generated
+    recall: str = ""
+    summary: str = ""
+    # Latest skeleton from story_convergence_crew, steering scene/choice generation
+    plot_skeleton: str = ""
+    turns: List[Turn] = field(default_factory=list)
+    # Number of leading entries of ``turns`` already folded into ``summary``
+    summarized: int = 0
+
+    # ----------------------
+    # Updates
+    # ----------------------
+    def pin_world(self, world: Dict, opening_scene: Dict) -> None:
+        npcs = world.get("npcs", []) + world.get("npc", [])
+        lines = [
+            f"World: {world.get('name')} — {world.get('theme')}. Starting region: {world.get('starting_region')}.",
+            f"Terrain: {world.get('terrain_desc')}",
+            f"Opening scene '{opening_scene.get('title')}': {opening_scene.get('description')}",
+        ]
+        if world.get("factions"):
+            lines.append("Factions: " + "; ".join(f.get("name", "") for f in world["factions"]))
+        if npcs:
+            lines.append("Key NPCs: " + "; ".join(
+                f"{n.get('name')} ({n.get('desc') or n.get('role') or 'npc'})" for n in npcs
+            ))
+        # Lore goes last so it is what gets trimmed when the world tier is over budget
+        lines.append(f"Lore: {world.get('lore')}")
+        self.world = "\n".join(lines)
+
+    def add_turn(self, player_action: str, choice: Dict) -> Turn:
+        turn = Turn(player_action=player_action, choice=choice)
+        self.turns.append(turn)
+        return turn
+
+    def set_scene(self, scene: Dict) -> None:
+        if self.turns:
+            self.turns[-1].scene = scene
+
+    def pending_turns(self) -> List[Turn]:
+        """Turns not yet folded into the summary."""
+        return self.turns[self.summarized:]
+
+    def apply_summary(self, summary: str, covered: int | None = None) -> None:
+        """Replace the summary tier; it now covers the first ``covered`` turns (default: all)."""
+        self.summary = summary.strip()
+        self.summarized = len(self.turns) if covered is None else covered
+        self._compact()
+
+    def _compact(self) -> None:
+        # Summarized turns outside the rolling window are no longer needed
+        drop = min(self.summarized, max(0, len(self.turns) - self.recent_turns))
+        if drop:
+            del self.turns[:drop]
+            self.summarized -= drop
+
+    # ----------------------
+    # Rendering
+    # ----------------------
+    def render(self, task: str = "progress_scene") -> str:
+        return self._render(task)[0]
+
+    def render_for_summary(self) -> Tuple[str, int]:
+        """The summarize prompt and the number of leading turns it covers (apply_summary's ``covered``)."""
+        return self._render("summarize_story_progression")
+
+    def _render(self, task: str) -> Tuple[str, int]:
+        tiers = _TASK_TIERS.get(task, _TASK_TIERS["progress_scene"])
+        budget = self.token_budget
+        parts: List[str] = []
+
+        if "world" in tiers and self.world:
+            world = _truncate(self.world, budget // 3)
+            parts.append(world)
+            budget -= estimate_tokens(world)
+
+        if "graph" in tiers and self.graph:
+            graph = _truncate(self.graph, budget // 3)
+            parts.append(graph)
+            budget -= estimate_tokens(graph)
+
+        if "plot" in tiers and self.plot_skeleton:
+            plot = _truncate(f"Plot skeleton:\n{self.plot_skeleton}", budget // 3)
+            parts.append(plot)
+            budget -= estimate_tokens(plot)
+
+        if "recall" in tiers and self.recall:
+            recall = _truncate(self.recall, budget // 3)
+            parts.append(recall)
+            budget -= estimate_tokens(recall)
+
+        if "summary" in tiers and self.summary:
+            summary = _truncate(f"Story so far: {self.summary}", budget // 2)
+            parts.append(summary)
+            budget -= estimate_tokens(summary)
+
+        recent: List[str] = []
+        covered = len(self.turns)
+        if "recent" in tiers:
+            for turn in reversed(self.turns[-self.recent_turns:]):
+                text = turn.render()
+                cost = estimate_tokens(text)
+                if cost > budget:
+                    if not recent:
+                        # Always keep the latest turn, trimmed to what is left
+                        recent.append(_truncate(text, max(budget, 0)))
+                    break
+                recent.append(text)
+                budget -= cost
+            recent.reverse()
+        elif "unsummarized" in tiers:
+            # Oldest first: only turns actually in the prompt count as covered,
+            # the rest stay pending for the next summary
+            for turn in self.pending_turns():
+                text = turn.render()
+                cost = estimate_tokens(text)
+                if cost > budget:
+                    if not recent:
+                        # A single turn over budget goes in trimmed, or it would never be summarized
+                        recent.append(_truncate(text, max(budget, 0)))
+                    break
+                recent.append(text)
+                budget -= cost
+            covered = self.summarized + len(recent)
+        if recent:
+            parts.append("Recent events:\n" + "\n\n".join(recent))
+
+        return "\n\n".join(parts), covered
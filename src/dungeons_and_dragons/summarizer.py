@@ -0,0 +1,61 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from dungeons_and_dragons.story_context import StoryContext
+
+
+class BackgroundSummarizer:
+    """
+    Runs story_summary_crew off the game loop's critical path.
+
+    Summaries are incremental: each job is given the previous summary plus
+    only the turns recorded since it (StoryContext's summarize tiers), and
+    folds them together. The job runs on a single worker thread; poll()
+    swaps the finished summary into the StoryContext. While a job is in
+    flight further submits are skipped — the turns stay pending and are
+    folded by the next job.
+    """
+
+    def __init__(self, crew: Any, story: StoryContext):
+        self._crew = crew
+        self._story = story
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarize")
+        self._job: Future | None = None
+        self._covered = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._job is not None and not self._job.done()
+
+    def submit(self) -> bool:
+        """Start folding pending turns into the summary. Returns False if nothing was started."""
+        self.poll()
+        if self.busy or not self._story.pending_turns():
+            return False
+
+        # Snapshot on the caller's thread; turns added meanwhile, or left out
+        # of the prompt for budget, stay pending. Turns are only dropped by
+        # apply_summary(), so this index stays valid.
+        progression, self._covered = self._story.render_for_summary()
+        self._job = self._executor.submit(
+            self._crew.kickoff, inputs={"current_story_progression": progression}
+        )
+        return True
+
+    def poll(self) -> str | None:
+        """Apply a finished summary, if any. Returns it so the caller can show it."""
+        if self._job is None or not self._job.done():
+            return None
+
+        job, self._job = self._job, None
+        try:
+            summary = job.result().raw
+        except Exception as e:
+            print(f"⚠️ Background summary failed, pending turns will be retried: {e}")
+            return None
+
+        self._story.apply_summary(summary, covered=self._covered)
+        return summary
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,71 @@
+# src/dungeons_and_dragons/tools/graph_driver.py
+import atexit
+import os
+import threading
+from dotenv import load_dotenv
+from neo4j import Driver, GraphDatabase
+
+load_dotenv()
+
+NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "test")
+
+# ----------------------
+# Pool configuration
+# ----------------------
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "20"))
+NEO4J_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30"))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+# Idle connections older than this are pinged before being handed out again
+NEO4J_LIVENESS_CHECK_TIMEOUT = float(os.getenv("NEO4J_LIVENESS_CHECK_TIMEOUT", "60"))
+# Managed transactions (session.execute_write) retry transient errors for up to this many seconds
+NEO4J_MAX_RETRY_TIME = float(os.getenv("NEO4J_MAX_RETRY_TIME", "15"))
+
+_driver: Driver | None = None
+_lock = threading.Lock()
+
+
+def get_driver() -> Driver:
+    """Return the process-wide driver, creating it on first use."""
+    global _driver
+
+    if _driver is None:
+        with _lock:
+            if _driver is None:
+                _driver = GraphDatabase.driver(
+                    NEO4J_URI,
+                    auth=(NEO4J_USER, NEO4J_PASSWORD),
+                    max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+                    connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT,
+                    max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+                    liveness_check_timeout=NEO4J_LIVENESS_CHECK_TIMEOUT,
+                    max_transaction_retry_time=NEO4J_MAX_RETRY_TIME,
+                )
+    return _driver
+
+
+def check_health() -> bool:
+    """Verify the shared driver can reach the server; drop it if it cannot."""
+    try:
+        get_driver().verify_connectivity()
+        return True
+    except Exception as e:
+        print(f"⚠️ Neo4j health check failed: {e}")
+        close_driver()
+        return False
+
+
+def close_driver() -> None:
+    """Close the shared driver and its pool. A later get_driver() reconnects."""
+    global _driver
+
+    with _lock:
+        if _driver is not None:
+            try:
+                _driver.close()
+            finally:
+                _driver = None
+
+
+atexit.register(close_driver)
@@ -0,0 +1,77 @@
+# src/dungeons_and_dragons/tools/graph_schema.py
+import threading
+from neo4j import Driver
+
+# ----------------------
+# Versioned migrations
+# ----------------------
+# Append new (version, statements) entries; never edit an applied one.
+# Every scribe MERGE/MATCH is keyed on one of these ids, and each uniqueness
+# constraint is backed by a range index, so no separate indexes are needed yet.
+MIGRATIONS: list[tuple[int, list[str]]] = [
+    (1, [
+        "CREATE CONSTRAINT world_id_unique IF NOT EXISTS FOR (w:World) REQUIRE w.world_id IS UNIQUE",
+        "CREATE CONSTRAINT scene_id_unique IF NOT EXISTS FOR (s:Scene) REQUIRE s.scene_id IS UNIQUE",
+        "CREATE CONSTRAINT choice_id_unique IF NOT EXISTS FOR (c:Choice) REQUIRE c.choice_id IS UNIQUE",
+        "CREATE CONSTRAINT npc_id_unique IF NOT EXISTS FOR (n:NPC) REQUIRE n.npc_id IS UNIQUE",
+        "CREATE CONSTRAINT faction_id_unique IF NOT EXISTS FOR (f:Faction) REQUIRE f.faction_id IS UNIQUE",
+    ]),
+    (2, [
+        "CREATE CONSTRAINT interaction_id_unique IF NOT EXISTS FOR (i:Interaction) REQUIRE i.interaction_id IS UNIQUE",
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+_version: int | None = None
+_lock = threading.Lock()
+
+
+def _current_version(session) -> int:
+    record = session.run(
+        "MATCH (m:SchemaMigration {name: 'orion'}) RETURN m.version AS version"
+    ).single()
+    return record["version"] if record else 0
+
+
+def ensure_schema(driver: Driver) -> int:
+    """
+    Apply any pending migrations once per process and return the schema version.
+
+    Statements are idempotent (IF NOT EXISTS), so concurrent processes racing
+    on the same database are harmless. A failed migration is reported and not
+    retried until the next process start.
+    """
+    global _version
+
+    if _version is not None:
+        return _version
+
+    with _lock:
+        if _version is not None:
+            return _version
+
+        version = 0
+        try:
+            with driver.session() as session:
+                version = _current_version(session)
+                for target, statements in MIGRATIONS:
+                    if target <= version:
+                        continue
+                    # Schema commands cannot share a transaction with data writes
+                    for statement in statements:
+                        session.run(statement).consume()
+                    session.run(
+                        """
+                        MERGE (m:SchemaMigration {name: 'orion'})
+                        SET m.version = $version
+                        """,
+                        version=target,
+                    ).consume()
+                    version = target
+                    print(f"🗂️ Neo4j schema migrated to version {version}")
+        except Exception as e:
+            print(f"⚠️ Neo4j schema migration failed at version {version}: {e}")
+        _version = version
+
+    return version
@@ -0,0 +1,177 @@
+# src/dungeons_and_dragons/tools/memory_store.py
+import copy
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from dungeons_and_dragons import metrics
+from dungeons_and_dragons.tools.story_store import Mutation, StoryStore, rekey_world
+
+
+class MemoryStore(StoryStore):
+    """
+    The story graph in process memory, for local play and load tests.
+
+    Nodes are dicts keyed by label and id; relationships live in forward
+    and reverse adjacency lists keyed by (type, node id), so every read is
+    a handful of dict lookups. A commit runs under one lock and keeps an
+    undo log, so a failing mutation rolls the whole batch back. Nothing
+    survives the process.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._nodes: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+        self._out: Dict[tuple, List[str]] = defaultdict(list)
+        self._in: Dict[tuple, List[str]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    # ----------------------
+    # Graph primitives
+    # ----------------------
+    def _merge_node(self, undo: list, label: str, node_id: str, props: Dict) -> None:
+        nodes = self._nodes[label]
+        previous = nodes.get(node_id)
+        undo.append(("node", label, node_id, previous))
+
+        node = dict(previous or {})
+        node.update(props)
+        # SET += with a null value removes the property
+        nodes[node_id] = {k: v for k, v in node.items() if v is not None}
+
+    def _link(self, undo: list, rel: str, src_label: str, src: str, dst_label: str, dst: str) -> None:
+        if src not in self._nodes[src_label] or dst not in self._nodes[dst_label]:
+            return
+        if dst in self._out[(rel, src)]:
+            return
+        undo.append(("edge", rel, src, dst))
+        self._out[(rel, src)].append(dst)
+        self._in[(rel, dst)].append(src)
+
+    def _rollback(self, undo: list) -> None:
+        for entry in reversed(undo):
+            if entry[0] == "node":
+                _, label, node_id, previous = entry
+                if previous is None:
+                    self._nodes[label].pop(node_id, None)
+                else:
+                    self._nodes[label][node_id] = previous
+            else:
+                _, rel, src, dst = entry
+                self._out[(rel, src)].remove(dst)
+                self._in[(rel, dst)].remove(src)
+
+    # ----------------------
+    # Writes
+    # ----------------------
+    def commit(self, mutations: List[Mutation]) -> List[Any]:
+        t0 = time.perf_counter()
+        undo: list = []
+        with self._lock:
+            try:
+                results = [self._apply(undo, op, copy.deepcopy(args)) for op, args in mutations]
+            except Exception:
+                self._rollback(undo)
+                raise
+        metrics.record_db(mutations[0][0] if len(mutations) == 1 else "batch", time.perf_counter() - t0, 0)
+        return results
+
+    def _write_world(self, undo: list, world_id: str, props: Dict, faction_rows: List[Dict], npc_rows: List[Dict]) -> str:
+        if world_id and world_id in self._nodes["World"]:
+            world_id, props, faction_rows, npc_rows = rekey_world(props, faction_rows, npc_rows)
+
+        self._merge_node(undo, "World", world_id, {**props, "world_id": world_id})
+        for row in faction_rows:
+            self._merge_node(undo, "Faction", row["id"], {**row["props"], "faction_id": row["id"]})
+            self._link(undo, "HAS_FACTION", "World", world_id, "Faction", row["id"])
+        for row in npc_rows:
+            self._merge_node(undo, "NPC", row["id"], {**row["props"], "npc_id": row["id"]})
+            self._link(undo, "HAS_NPC", "World", world_id, "NPC", row["id"])
+        return world_id
+
+    def _write_scene(self, undo: list, scene_id: str, props: Dict, npc_rows: List[Dict]) -> None:
+        self._merge_node(undo, "Scene", scene_id, {**props, "scene_id": scene_id})
+        for row in npc_rows:
+            self._merge_node(undo, "NPC", row["id"], {**row["props"], "npc_id": row["id"]})
+            self._link(undo, "HAS_NPC", "Scene", scene_id, "NPC", row["id"])
+
+    def _write_choices(self, undo: list, scene_id: str, rows: List[Dict]) -> None:
+        for row in rows:
+            self._merge_node(undo, "Choice", row["choice_id"], row)
+            self._link(undo, "OFFERS", "Scene", scene_id, "Choice", row["choice_id"])
+
+    def _write_pregame_link(self, undo: list, scene_id: str, world_id: str) -> None:
+        self._link(undo, "OPENS_WITH", "World", world_id, "Scene", scene_id)
+
+    def _write_choice_link(self, undo: list, choice_id: str, scene_id: str) -> None:
+        self._link(undo, "LEADS_TO", "Choice", choice_id, "Scene", scene_id)
+
+    def _write_npc_memory(self, undo: list, npc_id: str, props: Dict, interaction: Dict) -> None:
+        if npc_id not in self._nodes["NPC"]:
+            return
+        self._merge_node(undo, "NPC", npc_id, props)
+        self._merge_node(undo, "Interaction", interaction["interaction_id"], interaction)
+        self._link(undo, "HAD_INTERACTION", "NPC", npc_id, "Interaction", interaction["interaction_id"])
+        if interaction.get("scene_id"):
+            self._link(undo, "DURING", "Interaction", interaction["interaction_id"], "Scene", interaction["scene_id"])
+
+    # ----------------------
+    # Reads
+    # ----------------------
+    def get_scene(self, scene_id: str) -> Dict | None:
+        with self._lock:
+            scene = self._nodes["Scene"].get(scene_id)
+            return dict(scene) if scene else None
+
+    def get_choices(self, scene_id: str) -> List[Dict]:
+        with self._lock:
+            choices = self._nodes["Choice"]
+            return [dict(choices[c]) for c in self._out.get(("OFFERS", scene_id), ())]
+
+    def npc_memory(self, npc_id: str, limit: int = 5) -> Dict:
+        with self._lock:
+            npc = self._nodes["NPC"].get(npc_id)
+            interactions = self._out.get(("HAD_INTERACTION", npc_id), [])[-limit:] if limit > 0 else []
+            return {
+                "npc": dict(npc) if npc else None,
+                "interactions": [dict(self._nodes["Interaction"][i]) for i in interactions],
+            }
+
+    def _path(self, scene_id: str, limit: int) -> List[Dict]:
+        scene = self._nodes["Scene"].get(scene_id)
+        if scene is None:
+            return []
+
+        entries = []
+        while True:
+            entries.append({"choice": None, "scene": dict(scene)})
+            led_from = self._in.get(("LEADS_TO", scene["scene_id"]))
+            if len(entries) >= limit or not led_from:
+                break
+            offered_by = self._in.get(("OFFERS", led_from[0]))
+            if not offered_by:
+                break
+            entries[-1]["choice"] = dict(self._nodes["Choice"][led_from[0]])
+            scene = self._nodes["Scene"][offered_by[0]]
+
+        entries.reverse()
+        return entries
+
+    def history(self, scene_id: str, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            return self._path(scene_id, limit)
+
+    def retrieve(self, scene_id: str, limit: int = 50, recent_scenes: int = 3) -> Dict:
+        with self._lock:
+            path = self._path(scene_id, limit)
+            npcs: Dict[str, Dict] = {}
+            factions: Dict[str, Dict] = {}
+            for entry in reversed(path[-recent_scenes:] if recent_scenes > 0 else []):
+                for npc_id in self._out.get(("HAS_NPC", entry["scene"]["scene_id"]), ()):
+                    npc = npcs.setdefault(npc_id, dict(self._nodes["NPC"][npc_id]))
+                    faction = self._nodes["Faction"].get(npc.get("faction_ref"))
+                    if faction:
+                        factions.setdefault(faction["faction_id"], dict(faction))
+        return {"path": path, "npcs": list(npcs.values()), "factions": list(factions.values())}
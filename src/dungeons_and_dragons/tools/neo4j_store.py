@@ -0,0 +1,311 @@
+# src/dungeons_and_dragons/tools/neo4j_store.py
+import time
+from typing import Any, Dict, List
+
+from neo4j import Driver
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+
+from dungeons_and_dragons import metrics
+from dungeons_and_dragons.tools import graph_driver
+from dungeons_and_dragons.tools.graph_schema import ensure_schema
+from dungeons_and_dragons.tools.story_store import Mutation, StoryStore, rekey_world
+
+
+class _CountingTx:
+    """Transaction proxy that counts statements, for metrics."""
+
+    def __init__(self, tx):
+        self._tx = tx
+        self.statements = 0
+
+    def run(self, *args, **kwargs):
+        self.statements += 1
+        return self._tx.run(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._tx, name)
+
+
+class Neo4jStore(StoryStore):
+    """
+    The story graph in Neo4j.
+
+    Each commit is one managed write transaction holding a fixed number of
+    parameterized statements per mutation (one UNWIND per entity list);
+    transient errors are retried by the driver (NEO4J_MAX_RETRY_TIME).
+    Without an explicit ``driver`` the shared pooled one from graph_driver
+    is used.
+    """
+
+    name = "neo4j"
+
+    def __init__(self, driver: Driver | None = None):
+        self._own_driver = driver
+
+    def _driver(self) -> Driver:
+        # Shared, pooled driver: each call only checks a session out of the pool
+        driver = self._own_driver or graph_driver.get_driver()
+        ensure_schema(driver) # No-op after the first call in this process
+        return driver
+
+    def check_health(self) -> bool:
+        return self._own_driver is not None or graph_driver.check_health()
+
+    def close(self) -> None:
+        if self._own_driver is None:
+            graph_driver.close_driver()
+
+    def is_transient(self, error: Exception) -> bool:
+        # Constraint violations, syntax and parameter errors won't fix themselves
+        return isinstance(error, (ServiceUnavailable, SessionExpired, TransientError, ConnectionError, TimeoutError))
+
+    # ----------------------
+    # Writes
+    # ----------------------
+    def _apply_all(self, tx, mutations: List[Mutation]) -> List[Any]:
+        return [self._apply(tx, op, args) for op, args in mutations]
+
+    def commit(self, mutations: List[Mutation]) -> List[Any]:
+        driver = self._driver()
+        if not metrics.ENABLED:
+            with driver.session() as session:
+                return session.execute_write(self._apply_all, mutations)
+
+        attempts: List[_CountingTx] = []
+
+        def counted(tx, batch):
+            # execute_write re-runs the work function on transient errors
+            attempts.append(_CountingTx(tx))
+            return self._apply_all(attempts[-1], batch)
+
+        t0 = time.perf_counter()
+        try:
+            with driver.session() as session:
+                return session.execute_write(counted, mutations)
+        finally:
+            # One round-trip per statement plus the commit of each attempt
+            round_trips = sum(a.statements for a in attempts) + len(attempts)
+            op = mutations[0][0] if len(mutations) == 1 else "batch"
+            metrics.record_db(op, time.perf_counter() - t0, round_trips, retry=len(attempts) > 1)
+
+    def _write_world(self, tx, world_id: str, props: Dict, faction_rows: List[Dict], npc_rows: List[Dict]) -> str:
+        # Check if world exists
+        if world_id and tx.run(
+            "MATCH (w:World {world_id: $world_id}) RETURN w.world_id",
+            world_id=world_id
+        ).single():
+            # World exists → generate a fresh id
+            world_id, props, faction_rows, npc_rows = rekey_world(props, faction_rows, npc_rows)
+
+        # --- World node ---
+        tx.run(
+            """
+            MERGE (w:World {world_id: $world_id})
+            SET w += $props
+            """,
+            world_id=world_id,
+            props=props,
+        )
+
+        # --- Factions ---
+        if faction_rows:
+            tx.run(
+                """
+                MATCH (w:World {world_id: $world_id})
+                UNWIND $rows AS row
+                MERGE (fa:Faction {faction_id: row.id})
+                SET fa += row.props, fa.faction_id = row.id
+                MERGE (w)-[:HAS_FACTION]->(fa)
+                """,
+                world_id=world_id,
+                rows=faction_rows,
+            )
+
+        # --- NPCs ---
+        if npc_rows:
+            tx.run(
+                """
+                MATCH (w:World {world_id: $world_id})
+                UNWIND $rows AS row
+                MERGE (n:NPC {npc_id: row.id})
+                SET n += row.props, n.npc_id = row.id
+                MERGE (w)-[:HAS_NPC]->(n)
+                """,
+                world_id=world_id,
+                rows=npc_rows,
+            )
+
+        return world_id
+
+    def _write_scene(self, tx, scene_id: str, props: Dict, npc_rows: List[Dict]) -> None:
+        # Merge Scene node
+        tx.run(
+            """
+            MERGE (s:Scene {scene_id: $scene_id})
+            SET s += $props
+            """,
+            scene_id=scene_id,
+            props=props,
+        )
+
+        # Link NPCs that appear in this scene
+        # Doesn't involve usage of existing NPCs in the world
+        if npc_rows:
+            tx.run(
+                """
+                MATCH (s:Scene {scene_id: $scene_id})
+                UNWIND $rows AS row
+                MERGE (n:NPC {npc_id: row.id})
+                SET n += row.props, n.npc_id = row.id
+                MERGE (s)-[:HAS_NPC]->(n)
+                """,
+                scene_id=scene_id,
+                rows=npc_rows,
+            )
+
+    def _write_choices(self, tx, scene_id: str, rows: List[Dict]) -> None:
+        # Merge Choice nodes, then Scene OFFERS Choice — one round-trip for all choices
+        tx.run(
+            """
+            UNWIND $rows AS row
+            MERGE (c:Choice {choice_id: row.choice_id})
+            SET c += row
+            WITH c
+            MATCH (s:Scene {scene_id: $scene_id})
+            MERGE (s)-[:OFFERS]->(c)
+            """,
+            scene_id=scene_id,
+            rows=rows,
+        )
+
+    def _write_pregame_link(self, tx, scene_id: str, world_id: str) -> None:
+        tx.run(
+            """
+            MATCH (w:World {world_id: $world_id}), (s:Scene {scene_id: $scene_id})
+            MERGE (w)-[:OPENS_WITH {type: 'pregame'}]->(s)
+            """,
+            world_id=world_id,
+            scene_id=scene_id,
+        )
+
+    def _write_choice_link(self, tx, choice_id: str, scene_id: str) -> None:
+        # Create LEADS_TO relationship from choice -> new scene
+        tx.run(
+            """
+            MATCH (c:Choice {choice_id: $choice_id})
+            MATCH (s:Scene {scene_id: $scene_id})
+            MERGE (c)-[:LEADS_TO]->(s)
+            """,
+            choice_id=choice_id,
+            scene_id=scene_id,
+        )
+
+    def _write_npc_memory(self, tx, npc_id: str, props: Dict, interaction: Dict) -> None:
+        # Standing as plain NPC properties; the exchange as its own node, linked to its scene
+        tx.run(
+            """
+            MATCH (n:NPC {npc_id: $npc_id})
+            SET n += $props
+            MERGE (i:Interaction {interaction_id: $interaction.interaction_id})
+            SET i += $interaction
+            MERGE (n)-[:HAD_INTERACTION]->(i)
+            WITH i
+            OPTIONAL MATCH (s:Scene {scene_id: $interaction.scene_id})
+            FOREACH (_ IN CASE WHEN s IS NULL THEN [] ELSE [1] END | MERGE (i)-[:DURING]->(s))
+            """,
+            npc_id=npc_id,
+            props=props,
+            interaction=interaction,
+        )
+
+    # ----------------------
+    # Reads
+    # ----------------------
+    def _read(self, op: str, query: str, **params) -> list:
+        t0 = time.perf_counter()
+        with self._driver().session() as session:
+            records = list(session.run(query, **params))
+        metrics.record_db(op, time.perf_counter() - t0, 1)
+        return records
+
+    def get_scene(self, scene_id: str) -> Dict | None:
+        records = self._read(
+            "get_scene",
+            "MATCH (s:Scene {scene_id: $scene_id}) RETURN s",
+            scene_id=scene_id,
+        )
+        return dict(records[0]["s"].items()) if records else None
+
+    def get_choices(self, scene_id: str) -> List[Dict]:
+        records = self._read(
+            "get_choices",
+            """
+            MATCH (s:Scene {scene_id: $scene_id})-[:OFFERS]->(c:Choice)
+            RETURN DISTINCT c
+            """,
+            scene_id=scene_id,
+        )
+        return [dict(record["c"].items()) for record in records]
+
+    def npc_memory(self, npc_id: str, limit: int = 5) -> Dict:
+        records = self._read(
+            "npc_memory",
+            """
+            MATCH (n:NPC {npc_id: $npc_id})
+            OPTIONAL MATCH (n)-[:HAD_INTERACTION]->(i:Interaction)
+            WITH n, i ORDER BY i.at DESC
+            WITH n, collect(properties(i))[..$limit] AS interactions
+            RETURN properties(n) AS npc, reverse(interactions) AS interactions
+            """,
+            npc_id=npc_id,
+            limit=max(limit, 0),
+        )
+        if not records:
+            return {"npc": None, "interactions": []}
+        return {"npc": records[0]["npc"], "interactions": records[0]["interactions"]}
+
+    @staticmethod
+    def _path_query(limit: int) -> str:
+        # Every scene but the opening one is reached by exactly one LEADS_TO,
+        # so walking OFFERS/LEADS_TO backwards yields a single path
+        return f"""
+            MATCH path = (first:Scene)-[:OFFERS|LEADS_TO*0..{2 * (max(limit, 1) - 1)}]->(s:Scene {{scene_id: $scene_id}})
+            WITH path
+            ORDER BY length(path) DESC
+            LIMIT 1
+        """
+
+    @staticmethod
+    def _path_entries(nodes: List[Dict]) -> List[Dict]:
+        entries = [{"choice": None, "scene": nodes[0]}]
+        for i in range(1, len(nodes) - 1, 2):
+            entries.append({"choice": nodes[i], "scene": nodes[i + 1]})
+        return entries
+
+    def history(self, scene_id: str, limit: int = 50) -> List[Dict]:
+        records = self._read(
+            "history",
+            self._path_query(limit) + "RETURN [n IN nodes(path) | properties(n)] AS nodes",
+            scene_id=scene_id,
+        )
+        return self._path_entries(records[0]["nodes"]) if records else []
+
+    def retrieve(self, scene_id: str, limit: int = 50, recent_scenes: int = 3) -> Dict:
+        records = self._read(
+            "retrieve",
+            self._path_query(limit) + """
+            WITH path, [n IN nodes(path) WHERE n:Scene] AS scenes
+            UNWIND CASE WHEN $recent > 0 THEN reverse(scenes[-$recent..]) ELSE [null] END AS recent
+            OPTIONAL MATCH (recent)-[:HAS_NPC]->(npc:NPC)
+            OPTIONAL MATCH (faction:Faction {faction_id: npc.faction_ref})
+            RETURN [n IN nodes(path) | properties(n)] AS nodes,
+                   collect(DISTINCT properties(npc)) AS npcs,
+                   collect(DISTINCT properties(faction)) AS factions
+            """,
+            scene_id=scene_id,
+            recent=recent_scenes,
+        )
+        if not records:
+            return {"path": [], "npcs": [], "factions": []}
+        record = records[0]
+        return {"path": self._path_entries(record["nodes"]), "npcs": record["npcs"], "factions": record["factions"]}
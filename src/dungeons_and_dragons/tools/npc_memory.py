@@ -0,0 +1,177 @@
+# src/dungeons_and_dragons/tools/npc_memory.py
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict
+
+# NPC properties worth putting in front of the NPC agent, in render order
+FACT_KEYS = ("desc", "role", "motivation", "personality", "faction_name", "characteristics", "secret", "goal")
+
+
+@dataclass
+class NPCMemory:
+    """What one NPC knows and feels: structured facts, standing with the player, last interactions."""
+    npc_id: str
+    name: str
+    facts: Dict = field(default_factory=dict)
+    disposition: int = 0 # -5 hostile … +5 devoted, toward the player
+    relationship: str = ""
+    interaction_count: int = 0
+    last_scene_id: str | None = None
+    interactions: deque = field(default_factory=deque)
+
+    def props(self) -> Dict:
+        """Graph properties of the memory (flat primitives, no JSON blobs)."""
+        return {
+            "disposition": self.disposition,
+            "relationship": self.relationship,
+            "interaction_count": self.interaction_count,
+            "last_scene_id": self.last_scene_id,
+        }
+
+    def render(self) -> str:
+        lines = [f"NPC: {self.name} (id {self.npc_id})"]
+        for key in FACT_KEYS:
+            value = self.facts.get(key)
+            if value:
+                lines.append(f"{key.replace('_', ' ').capitalize()}: {', '.join(value) if isinstance(value, list) else value}")
+        standing = f"Toward the player: disposition {self.disposition:+d}"
+        if self.relationship:
+            standing += f" — {self.relationship}"
+        lines.append(standing)
+        if self.interactions:
+            lines.append(f"Last {len(self.interactions)} of {self.interaction_count} interactions (oldest first):")
+            for i in self.interactions:
+                lines.append(f"- Player: {i['player']}\n  {self.name}: {i['npc']}")
+        return "\n".join(lines)
+
+
+def _facts(props: Dict) -> Dict:
+    return {k: props[k] for k in FACT_KEYS if props.get(k) not in (None, "", [])}
+
+
+class NPCMemoryBank:
+    """
+    Per-NPC memories keyed by npc_id (already unique per world), held in an
+    LRU of ``capacity`` entries with the last ``max_interactions`` exchanges
+    each. Facts are refreshed from every NPC the scribe saves; misses are
+    loaded from the store in one read. Names resolve through a per-world
+    name → id index that is not evicted (a few bytes per NPC), so an NPC
+    can be addressed by name after its memory left the LRU. Interactions and standing changes
+    are written to the graph as NPC properties and
+    (NPC)-[:HAD_INTERACTION]->(Interaction)-[:DURING]->(Scene).
+    """
+
+    def __init__(
+        self,
+        persist: Callable[..., object],
+        load: Callable[[str, int], Dict],
+        capacity: int = 128,
+        max_interactions: int = 5,
+    ):
+        self._persist = persist
+        self._load = load
+        self.capacity = capacity
+        self.max_interactions = max_interactions
+        self.hits = 0
+        self.misses = 0
+        self._memories: OrderedDict[str, NPCMemory] = OrderedDict()
+        self._names: Dict[str, Dict[str, str]] = {} # world_id -> lowercased name -> npc_id
+        self._lock = threading.Lock()
+
+    def _put(self, memory: NPCMemory) -> NPCMemory:
+        world_id, _, _ = memory.npc_id.partition(".")
+        self._names.setdefault(world_id, {})[memory.name.lower()] = memory.npc_id
+        self._memories[memory.npc_id] = memory
+        self._memories.move_to_end(memory.npc_id)
+        while len(self._memories) > self.capacity:
+            self._memories.popitem(last=False)
+        return memory
+
+    def observe(self, npc_id: str, props: Dict) -> None:
+        """An NPC was saved: refresh its facts (standing and interactions are kept)."""
+        with self._lock:
+            memory = self._memories.get(npc_id)
+            if memory is None:
+                memory = NPCMemory(npc_id, props.get("name") or npc_id, interactions=deque(maxlen=self.max_interactions))
+            memory.name = props.get("name") or memory.name
+            memory.facts.update(_facts(props))
+            self._put(memory)
+
+    def get(self, npc_id: str) -> NPCMemory | None:
+        with self._lock:
+            memory = self._memories.get(npc_id)
+            if memory is not None:
+                self.hits += 1
+                self._memories.move_to_end(npc_id)
+                return memory
+            self.misses += 1
+
+        loaded = self._load(npc_id, self.max_interactions)
+        props = loaded.get("npc")
+        if props is None:
+            return None
+        memory = NPCMemory(
+            npc_id,
+            props.get("name") or npc_id,
+            facts=_facts(props),
+            disposition=int(props.get("disposition") or 0),
+            relationship=props.get("relationship") or "",
+            interaction_count=int(props.get("interaction_count") or 0),
+            last_scene_id=props.get("last_scene_id"),
+            interactions=deque(loaded.get("interactions") or [], maxlen=self.max_interactions),
+        )
+        with self._lock:
+            # Another thread may have loaded or recorded it meanwhile; keep theirs
+            return self._memories.get(npc_id) or self._put(memory)
+
+    def resolve(self, world_id: str, name_or_id: str) -> NPCMemory | None:
+        """An NPC of ``world_id`` by (case-insensitive) name, else by id or raw id."""
+        with self._lock:
+            npc_id = self._names.get(world_id, {}).get(name_or_id.strip().lower())
+        if npc_id is None:
+            # Not a known name: try it as an id (which may need a store read)
+            npc_id = name_or_id if name_or_id.startswith(f"{world_id}.") else f"{world_id}.{name_or_id}"
+        return self.get(npc_id)
+
+    def record(
+        self,
+        npc_id: str,
+        scene_id: str | None,
+        player_text: str,
+        npc_text: str,
+        disposition_delta: int = 0,
+        relationship: str | None = None,
+    ) -> NPCMemory:
+        """Remember one exchange and persist it together with the NPC's new standing."""
+        memory = self.get(npc_id)
+        if memory is None:
+            raise ValueError(f"Unknown NPC '{npc_id}'")
+
+        row = {
+            "interaction_id": str(uuid.uuid4()),
+            "scene_id": scene_id,
+            "player": player_text,
+            "npc": npc_text,
+            "at": time.time(),
+        }
+        with self._lock:
+            memory.interactions.append(row)
+            memory.interaction_count += 1
+            memory.disposition = max(-5, min(5, memory.disposition + disposition_delta))
+            if relationship is not None:
+                memory.relationship = relationship
+            if scene_id:
+                memory.last_scene_id = scene_id
+            props = memory.props()
+
+        self._persist("npc_memory", npc_id, props, row)
+        return memory
+
+    def drop_world(self, world_id: str) -> None:
+        with self._lock:
+            self._names.pop(world_id, None)
+            for npc_id in [k for k in self._memories if k.startswith(f"{world_id}.")]:
+                del self._memories[npc_id]
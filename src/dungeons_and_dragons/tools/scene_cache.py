@@ -0,0 +1,107 @@
+# src/dungeons_and_dragons/tools/scene_cache.py
+import copy
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+
+class SceneCache:
+    """
+    Write-through cache of what the scribe has persisted in this process:
+    bounded LRUs of recently saved worlds and of recent scenes and their
+    choices (shared by all sessions; scene ids are unique per world).
+
+    Entries are filled from saves and from store reads. With write-behind a
+    save is cached before the store has it, so a hit is what the store will
+    hold once the queue drains; a mutation the store rejects (dead-lettered)
+    evicts what it touched via evict(), so reads fall back to the store
+    instead of serving data that was never written. Callers get copies and
+    cannot mutate cached state.
+    """
+
+    def __init__(self, max_scenes: int = 32, max_worlds: int = 16):
+        self.max_scenes = max_scenes
+        self.max_worlds = max_worlds
+        self.hits = 0
+        self.misses = 0
+        self._worlds: OrderedDict[str, Dict] = OrderedDict()
+        self._scenes: OrderedDict[str, Dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(self, scene_id: str) -> Dict:
+        entry = self._scenes.get(scene_id)
+        if entry is None:
+            entry = self._scenes[scene_id] = {"scene": None, "choices": None}
+        self._scenes.move_to_end(scene_id)
+        while len(self._scenes) > self.max_scenes:
+            self._scenes.popitem(last=False)
+        return entry
+
+    # --- World ---
+    def put_world(self, world: Dict) -> None:
+        with self._lock:
+            self._worlds[world["world_id"]] = copy.deepcopy(world)
+            self._worlds.move_to_end(world["world_id"])
+            while len(self._worlds) > self.max_worlds:
+                self._worlds.popitem(last=False)
+
+    def get_world(self, world_id: str) -> Dict | None:
+        with self._lock:
+            if world_id in self._worlds:
+                self._worlds.move_to_end(world_id)
+            return copy.deepcopy(self._worlds.get(world_id))
+
+    def drop_world(self, world_id: str) -> None:
+        with self._lock:
+            self._worlds.pop(world_id, None)
+
+    def evict(self, world_id: str | None = None, scene_ids: List[str] = ()) -> None:
+        with self._lock:
+            if world_id:
+                self._worlds.pop(world_id, None)
+            for scene_id in scene_ids:
+                self._scenes.pop(scene_id, None)
+
+    # --- Scenes ---
+    def put_scene(self, scene_id: str, scene: Dict) -> None:
+        with self._lock:
+            entry = self._entry(scene_id)
+            entry["scene"] = copy.deepcopy(scene)
+            if entry["choices"] is None:
+                # A freshly written scene has no choices until they are saved
+                entry["choices"] = []
+
+    def get_scene(self, scene_id: str) -> Dict | None:
+        with self._lock:
+            entry = self._scenes.get(scene_id)
+            if entry is None or entry["scene"] is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._scenes.move_to_end(scene_id)
+            return copy.deepcopy(entry["scene"])
+
+    # --- Choices ---
+    def put_choices(self, scene_id: str, choices: List[Dict]) -> None:
+        with self._lock:
+            entry = self._entry(scene_id)
+            # OFFERS edges are MERGEd, so repeated saves add to the scene's set
+            merged = {c["choice_id"]: c for c in entry["choices"] or []}
+            for choice in choices:
+                merged[choice["choice_id"]] = copy.deepcopy(choice)
+            entry["choices"] = list(merged.values())
+
+    def get_choices(self, scene_id: str) -> List[Dict] | None:
+        with self._lock:
+            entry = self._scenes.get(scene_id)
+            if entry is None or entry["choices"] is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._scenes.move_to_end(scene_id)
+            return copy.deepcopy(entry["choices"])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._worlds.clear()
+            self._scenes.clear()
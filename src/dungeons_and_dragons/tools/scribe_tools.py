@@ -1,399 +1,476 @@
 # src/dungeons_and_dragons/tools/scribe_tools.py
+import atexit
 import uuid
-import jsonschema
-from neo4j import GraphDatabase
 import json
 import os
-from dotenv import load_dotenv
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import Any, Dict, List
 
-from dungeons_and_dragons.schemas.world_schema import world_schema
-from dungeons_and_dragons.schemas.scene_schema import scene_schema
-from dungeons_and_dragons.schemas.choice_schema import choice_schema
-
-load_dotenv()
-
-NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "test")
+from dungeons_and_dragons.schemas.validation import normalize, normalize_and_validate, validate
+from dungeons_and_dragons.tools.npc_memory import NPCMemory, NPCMemoryBank
+from dungeons_and_dragons.tools.scene_cache import SceneCache
+from dungeons_and_dragons.tools.story_store import StoryStore, open_store
+from dungeons_and_dragons.tools.write_behind import WriteBehindQueue
 
 # ----------------------
 # Globals (current state)
 # ----------------------
-CURRENT_WORLD_ID: str | None = None
-CURRENT_SCENE_ID: str | None = None
-
-
-def _connect() -> GraphDatabase.driver:
-    return GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+@dataclass
+class ScribeState:
+    """The world and scene one game is positioned at."""
+    world_id: str | None = None
+    scene_id: str | None = None
 
-def _ensure_world_dict(payload: Any) -> Dict:
-    if payload is None:
-        raise ValueError("save_world: received None payload")
 
-    if isinstance(payload, str):
-        try:
-            payload = json.loads(payload)
-        except Exception as e:
-            raise ValueError(f"save_world: provided string is not valid JSON: {e}")
+# Each game session binds its own ScribeState (use_state); without one, the
+# process-wide default is used, as in the single-player CLI. The state object
+# is mutated in place so worker threads running with a copied context
+# (asyncio.to_thread) update the session they belong to.
+_STATE: ContextVar[ScribeState] = ContextVar("scribe_state", default=ScribeState())
 
-    if isinstance(payload, dict) and "world_json" in payload:
-        payload = payload["world_json"]
 
-    if isinstance(payload, dict) and "world" in payload:
-        payload = payload["world"]
+def current_state() -> ScribeState:
+    return _STATE.get()
 
-    if not isinstance(payload, dict):
-        raise ValueError(
-            f"save_world: expected dict after normalization, got {type(payload)}"
-        )
-
-    return payload
 
-def _ensure_scene_dict(payload: Any) -> Dict:
-    if payload is None:
-        raise ValueError("save_scene: received None payload")
+@contextmanager
+def use_state(state: ScribeState):
+    """Route scribe reads and writes in this context to ``state``."""
+    token = _STATE.set(state)
+    try:
+        yield state
+    finally:
+        _STATE.reset(token)
 
-    if isinstance(payload, str):
-        try:
-            payload = json.loads(payload)
-        except Exception as e:
-            raise ValueError(f"save_scene: provided string is not valid JSON: {e}")
 
-    if isinstance(payload, dict) and "scene_json" in payload:
-        payload = payload["scene_json"]
+def __getattr__(name: str):
+    # CURRENT_WORLD_ID / CURRENT_SCENE_ID read through to the active session
+    if name == "CURRENT_WORLD_ID":
+        return _STATE.get().world_id
+    if name == "CURRENT_SCENE_ID":
+        return _STATE.get().scene_id
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    if isinstance(payload, dict) and "scene" in payload:
-        payload = payload["scene"]
 
-    if not isinstance(payload, dict):
-        raise ValueError(
-            f"save_scene: expected dict after normalization, got {type(payload)}"
-        )
+# Write-through cache of the current world and recent scenes/choices
+SCENE_CACHE = SceneCache(
+    max_scenes=int(os.getenv("ORION_SCENE_CACHE_SIZE", "32")),
+    max_worlds=int(os.getenv("ORION_WORLD_CACHE_SIZE", "16")),
+)
 
-    return payload
+# Background persistence queue, set by enable_write_behind()
+WRITE_BEHIND: WriteBehindQueue | None = None
+# Seconds shutdown waits for queued writes before leaving them to the journal
+SHUTDOWN_FLUSH_TIMEOUT = float(os.getenv("ORION_WRITE_BEHIND_SHUTDOWN_S", "30"))
 
+# Storage backend (ORION_STORE), opened on first use or set by use_store()
+STORE: StoryStore | None = None
 
-def _ensure_choices_list(payload: Any) -> List[Dict]:
-    if payload is None:
-        raise ValueError("save_choices: received None payload")
+# Vector index of saved facts for recall (semantic_index.SemanticIndex), set by enable_semantic_index()
+SEMANTIC_INDEX = None
 
-    if isinstance(payload, str):
-        try:
-            payload = json.loads(payload)
-        except Exception as e:
-            raise ValueError(f"save_choices: provided string is not valid JSON: {e}")
 
-    if isinstance(payload, dict) and "choices_json" in payload:
-        payload = payload["choices_json"]
+def get_store() -> StoryStore:
+    global STORE
+    if STORE is None:
+        STORE = open_store()
+    return STORE
 
-    if isinstance(payload, dict) and "choices" in payload:
-        payload = payload["choices"]
 
-    if not isinstance(payload, list):
-        raise ValueError(
-            f"save_choices: expected list after normalization, got {type(payload)}"
-        )
+def use_store(store: StoryStore) -> StoryStore:
+    """Persist to ``store`` from now on (e.g. an in-memory one for tests and benchmarks)."""
+    global STORE
+    STORE = store
+    return store
 
-    # Ensure each element is a dict
-    for i, choice in enumerate(payload):
-        if not isinstance(choice, dict):
-            raise ValueError(
-                f"save_choices: expected dict for choice at index {i}, got {type(choice)}"
-            )
+def _is_flat_list(value) -> bool:
+    # Graph properties can hold homogeneous lists of strings or numbers as they are
+    return all(isinstance(v, str) for v in value) or all(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in value
+    )
 
-    return payload
 
 def _sanitize_props(props: dict) -> dict:
     safe_props = {}
     for k, v in props.items():
-        if isinstance(v, (dict, list)):
+        if isinstance(v, dict) or (isinstance(v, list) and not _is_flat_list(v)):
             # Store nested data as JSON string
             safe_props[k] = json.dumps(v)
         else:
             safe_props[k] = v
     return safe_props
 
-def _save_world_impl(world: Dict) -> str:
-    global CURRENT_WORLD_ID
-
-    driver = _connect()
-    with driver.session() as session:
-        world_id = world.get("world_id")
-
-        # Check if world exists
-        result = session.run(
-            "MATCH (w:World {world_id: $world_id}) RETURN w",
-            world_id=world_id
-        ) if world_id else None
-
-        if result and result.single():
-            # World exists → generate a fresh id
-            world_id = str(uuid.uuid4())
-            world["world_id"] = world_id
-
-        CURRENT_WORLD_ID = world_id # Update global state
-
-        # --- World node ---
-        session.run(
-            """
-            MERGE (w:World {world_id: $world_id})
-            SET w += $props
-            """,
-            world_id=world_id,
-            props={
-                "world_id": world.get("world_id"),
-                "name": world.get("name"),
-                "theme": world.get("theme"),
-                "terrain_desc": world.get("terrain_desc"),
-                "starting_region": world.get("starting_region"),
-                "lore": world.get("lore"),
-            },
+# ----------------------
+# Writes
+# ----------------------
+# Every save becomes one mutation (see story_store.Mutation) that the store
+# applies atomically, either right away or batched by the write-behind queue.
+
+def _persist(op: str, *args):
+    """Write now, or hand the mutation to the write-behind queue when it is enabled."""
+    if WRITE_BEHIND is not None:
+        WRITE_BEHIND.submit(op, list(args))
+        return None
+    return get_store().commit([(op, list(args))])[0]
+
+
+def _load_npc_memory(npc_id: str, limit: int) -> Dict:
+    flush() # Read-your-writes when write-behind is on
+    return get_store().npc_memory(npc_id, limit)
+
+
+# Per-NPC facts, standing with the player and last interactions, for NPC roleplay
+NPC_MEMORY = NPCMemoryBank(
+    persist=_persist,
+    load=_load_npc_memory,
+    capacity=int(os.getenv("ORION_NPC_MEMORY_SIZE", "128")),
+    max_interactions=int(os.getenv("ORION_NPC_MEMORY_TURNS", "5")),
+)
+
+
+def _observe_npcs(npc_rows: List[Dict]) -> None:
+    for row in npc_rows:
+        NPC_MEMORY.observe(row["id"], row["props"])
+
+
+def _evict_dead_letter(mutation) -> None:
+    # The store never got this write: stop serving it from the cache
+    op, args = mutation
+    if op == "world":
+        SCENE_CACHE.evict(world_id=args[0])
+    elif op in ("scene", "choices"):
+        SCENE_CACHE.evict(scene_ids=[args[0]])
+    elif op == "turn":
+        scene, _, choices = args
+        SCENE_CACHE.evict(scene_ids=[part[0] for part in (scene, choices) if part])
+
+
+def enable_write_behind(journal_path: str | None = None, max_pending: int | None = None) -> WriteBehindQueue:
+    """
+    Move graph writes off the caller's thread. Reads keep working because
+    every save is written through SCENE_CACHE before it is queued; writes
+    the store rejects are evicted from it again.
+    """
+    global WRITE_BEHIND
+
+    if WRITE_BEHIND is None:
+        WRITE_BEHIND = WriteBehindQueue(
+            apply_batch=lambda mutations: get_store().commit(mutations),
+            journal_path=journal_path or os.getenv("ORION_WRITE_BEHIND_JOURNAL", ".orion/write_behind.jsonl"),
+            max_pending=max_pending or int(os.getenv("ORION_WRITE_BEHIND_MAX_PENDING", "256")),
+            is_transient=lambda e: get_store().is_transient(e),
+            on_dead_letter=_evict_dead_letter,
         )
+        replayed = WRITE_BEHIND.replay()
+        if replayed:
+            print(f"📜 Replaying {replayed} unflushed graph writes from the journal")
+        atexit.register(WRITE_BEHIND.close, SHUTDOWN_FLUSH_TIMEOUT)
+    return WRITE_BEHIND
+
+
+def enable_semantic_index(embedder: str | None = None):
+    """
+    Embed scenes, NPCs, factions and lore into a SemanticIndex as they are
+    saved, for recall_facts(). ``embedder`` defaults to ORION_EMBEDDER.
+    """
+    global SEMANTIC_INDEX
+
+    if SEMANTIC_INDEX is None:
+        # NumPy is only needed once recall is on
+        from dungeons_and_dragons.tools.semantic_index import SemanticIndex, make_embedder
+
+        SEMANTIC_INDEX = SemanticIndex(make_embedder(embedder or os.getenv("ORION_EMBEDDER", "hashing")))
+    return SEMANTIC_INDEX
+
+
+def _index_world(world: Dict) -> None:
+    if SEMANTIC_INDEX is not None:
+        from dungeons_and_dragons.tools.semantic_index import world_facts
+
+        SEMANTIC_INDEX.add(world["world_id"], world_facts(world))
+
+
+def _index_scene(scene_id: str, props: Dict, npc_rows: List[Dict]) -> None:
+    if SEMANTIC_INDEX is not None:
+        from dungeons_and_dragons.tools.semantic_index import scene_facts
+
+        SEMANTIC_INDEX.add(current_state().world_id, scene_facts(scene_id, props, npc_rows))
+
+
+def flush(timeout: float | None = None) -> bool:
+    """Block until queued graph writes are committed (no-op without write-behind)."""
+    if WRITE_BEHIND is None:
+        return True
+    return WRITE_BEHIND.flush(timeout)
+
+
+def flush_on_exit() -> bool:
+    """flush() for shutdown: gives up after ORION_WRITE_BEHIND_SHUTDOWN_S, leaving the rest journaled."""
+    if flush(SHUTDOWN_FLUSH_TIMEOUT):
+        return True
+    print(f"⚠️ {WRITE_BEHIND.pending} graph writes still pending — they stay journaled and are replayed on the next start")
+    return False
+
+
+def forget_world(world_id: str) -> None:
+    """Drop a finished world's scenes, NPC memories and index from process memory (the store keeps them)."""
+    SCENE_CACHE.drop_world(world_id)
+    NPC_MEMORY.drop_world(world_id)
+    if SEMANTIC_INDEX is not None:
+        SEMANTIC_INDEX.drop_world(world_id)
+
+
+def _entity_rows(items: List[Dict], id_key: str, prefix: str) -> List[Dict]:
+    rows = []
+    for item in items:
+        raw_id = item.get(id_key) or str(uuid.uuid4())
+        rows.append({
+            "raw_id": raw_id,
+            "id": f"{prefix}.{raw_id}",
+            "props": _sanitize_props(item),
+        })
+    return rows
+
 
-        # --- Factions ---
-        for f in world.get("factions", []):
-            fid = f"{CURRENT_WORLD_ID}.{f.get("faction_id")}"
-
-            session.run(
-                """
-                MERGE (fa:Faction {faction_id: $faction_id})
-                SET fa += $props
-                WITH fa
-                MATCH (w:World {world_id: $world_id})
-                MERGE (w)-[:HAS_FACTION]->(fa)
-                """,
-                faction_id=fid,
-                props=_sanitize_props(f),
-                world_id=world_id,
-            )
-
-        # --- NPCs ---
-        for npc in world.get("npc", []) + world.get("npcs", []):
-            nid = f"{CURRENT_WORLD_ID}.{npc.get("npc_id")}"
-
-            session.run(
-                """
-                MERGE (n:NPC {npc_id: $npc_id})
-                SET n += $props
-                WITH n
-                MATCH (w:World {world_id: $world_id})
-                MERGE (w)-[:HAS_NPC]->(n)
-                """,
-                npc_id=nid,
-                props=_sanitize_props(npc),
-                world_id=world_id,
-            )
-
-    driver.close()
-    return f"World '{world.get('name')}' saved to Neo4j (world_id={world_id})."
+def _npc_rows(npcs: List[Dict], world_id: str) -> List[Dict]:
+    rows = _entity_rows(npcs, "npc_id", world_id)
+    for npc, row in zip(npcs, rows):
+        faction = npc.get("faction")
+        if isinstance(faction, dict) and faction.get("faction_id"):
+            # Id of the NPC's Faction node, so reads can join on it without parsing the JSON prop
+            row["props"]["faction_ref"] = f"{world_id}.{faction['faction_id']}"
+        if isinstance(faction, dict) and faction.get("name"):
+            row["props"]["faction_name"] = faction["name"]
+    return rows
+
+
+def _save_world_impl(world: Dict) -> str:
+    world_id = world.get("world_id")
+    props = {
+        "world_id": world_id,
+        "name": world.get("name"),
+        "theme": world.get("theme"),
+        "terrain_desc": world.get("terrain_desc"),
+        "starting_region": world.get("starting_region"),
+        "lore": world.get("lore"),
+    }
+    faction_rows = _entity_rows(world.get("factions", []), "faction_id", world_id)
+    npc_rows = _npc_rows(world.get("npc", []) + world.get("npcs", []), world_id)
+
+    stored_id = _persist("world", world_id, props, faction_rows, npc_rows) or world_id
+    if stored_id != world_id:
+        # The store moved the world to a fresh id (rekey_world); its NPCs moved with it
+        npc_rows = [{**r, "id": f"{stored_id}.{r['raw_id']}"} for r in npc_rows]
+    world_id = stored_id
+    world["world_id"] = world_id
+    current_state().world_id = world_id # Update session state
+    SCENE_CACHE.put_world(world)
+    _index_world(world)
+    _observe_npcs(npc_rows)
+
+    return f"World '{world.get('name')}' saved (world_id={world_id})."
+
+
+def _prepare_choices(choices: List[Dict], scene_id: str) -> List[Dict]:
+    rows = []
+    for choice in choices:
+        choice_id = choice.get("choice_id") or str(uuid.uuid4())
+        choice_id = f"{current_state().world_id}.{scene_id}.{choice_id}"
+        choice["choice_id"] = choice_id
+        rows.append({
+            "choice_id": choice_id,
+            "title": choice.get("title"),
+            "description": choice.get("description"),
+            "narration": choice.get("narration"),
+            "consequence": choice.get("consequence"),
+        })
+    return rows
+
+
+def _prepare_scene(scene: Dict) -> tuple[str, Dict, List[Dict]]:
+    scene_id = scene.get("scene_id") or str(uuid.uuid4())
+    world_id = current_state().world_id
+    scene_id = f"{world_id}.{scene_id}"
+    scene["scene_id"] = scene_id
+
+    props = {
+        "scene_id": scene_id,
+        "title": scene.get("title"),
+        "description": scene.get("description"),
+        "narration": scene.get("narration")
+    }
+    npc_rows = _npc_rows(scene.get("npcs", []), world_id)
+    for npc, row in zip(scene.get("npcs", []), npc_rows):
+        npc["npc_id"] = row["id"]
+
+    return scene_id, props, npc_rows
 
 
 def _save_choices_impl(choices: Dict) -> str:
-    global CURRENT_SCENE_ID
-    global CURRENT_WORLD_ID
-    if not CURRENT_SCENE_ID:
+    scene_id = current_state().scene_id
+    if not scene_id:
         raise RuntimeError("No CURRENT_SCENE_ID set — save a scene first before saving choices.")
 
-    driver = _connect()
-    with driver.session() as session:
-        for choice in choices:
-            choice_id = choice.get("choice_id") or str(uuid.uuid4())
-            choice_id = f"{CURRENT_WORLD_ID}.{CURRENT_SCENE_ID}.{choice_id}"
-            choice["choice_id"] = choice_id
-
-            # --- Merge Choice node ---
-            session.run(
-                """
-                MERGE (c:Choice {choice_id: $choice_id})
-                SET c += $props
-                """,
-                choice_id=choice_id,
-                props={
-                    "choice_id": choice_id,
-                    "title": choice.get("title"),
-                    "description": choice.get("description"),
-                    "narration": choice.get("narration"),
-                    "consequence": choice.get("consequence"),
-                }
-            )
-
-            # --- Scene OFFERS Choice ---
-            session.run(
-                """
-                MATCH (s:Scene {scene_id: $scene_id}), (c:Choice {choice_id: $choice_id})
-                MERGE (s)-[:OFFERS]->(c)
-                """,
-                scene_id=CURRENT_SCENE_ID,
-                choice_id=choice_id
-            )
-
-    driver.close()
-    return f"{len(choices)} choices saved and linked to Scene (scene_id={CURRENT_SCENE_ID})."
+    rows = _prepare_choices(choices, scene_id)
+    _persist("choices", scene_id, rows)
+    SCENE_CACHE.put_choices(scene_id, rows)
+    return f"{len(choices)} choices saved and linked to Scene (scene_id={scene_id})."
 
 
 def _save_scene_impl(scene: Dict) -> str:
-    global CURRENT_SCENE_ID
-
-    driver = _connect()
-    with driver.session() as session:
-        scene_id = scene.get("scene_id") or str(uuid.uuid4())
-        scene_id = f"{CURRENT_WORLD_ID}.{scene_id}"
-        scene["scene_id"] = scene_id
-
-        CURRENT_SCENE_ID = scene_id # Update global state
-
-        # Merge Scene node
-        session.run(
-            """
-            MERGE (s:Scene {scene_id: $scene_id})
-            SET s += $props
-            """,
-            scene_id=scene_id,
-            props={
-                "scene_id": scene_id,
-                "title": scene.get("title"),
-                "description": scene.get("description"),
-                "narration": scene.get("narration")
-            }
-        )
+    scene_id, props, npc_rows = _prepare_scene(scene)
+    _persist("scene", scene_id, props, npc_rows)
+    current_state().scene_id = scene_id # Update session state
+    SCENE_CACHE.put_scene(scene_id, props)
+    _index_scene(scene_id, props, npc_rows)
+    _observe_npcs(npc_rows)
 
-        # Link NPCs that appear in this scene
-        # Doesn't involve usage of existing NPCs in the world
-        for npc in scene.get("npcs", []):
-            npc_id = npc.get("npc_id") or str(uuid.uuid4())
-            npc["npc_id"] = f"{CURRENT_WORLD_ID}.{npc_id}"
-            session.run(
-                """
-                MERGE (n:NPC {npc_id: $npc_id})
-                SET n += $props
-                WITH n
-                MATCH (s:Scene {scene_id: $scene_id})
-                MERGE (s)-[:HAS_NPC]->(n)
-                """,
-                npc_id=npc_id,
-                props=_sanitize_props(npc),
-                scene_id=scene_id
-            )
-
-    driver.close()
     return f"Scene '{scene.get('title')}' saved (scene_id={scene_id})"
 
 
 def _link_pregame_scene_to_world(scene_id: str, world_id: str) -> str:
-    driver = _connect()
-    with driver.session() as session:
-        session.run(
-            """
-            MATCH (w:World {world_id: $world_id}), (s:Scene {scene_id: $scene_id})
-            MERGE (w)-[:OPENS_WITH {type: 'pregame'}]->(s)
-            """,
-            world_id=world_id,
-            scene_id=scene_id,
-        )
-    driver.close()
+    _persist("pregame_link", scene_id, world_id)
     return f"Pregame scene (scene_id={scene_id}) linked to World (world_id={world_id})."
 
 
 def save_world(world_json: dict):
-    world = _ensure_world_dict(world_json)
-
-    if not world or not isinstance(world, dict):
-        raise ValueError("save_world: Received empty or invalid world object")
-    
+    world = normalize("world", world_json)
     world["world_id"] = str(uuid.uuid4())
-
-    # Validate JSON
-    try:
-        jsonschema.validate(instance=world, schema=world_schema)
-    except jsonschema.ValidationError as e:
-        raise ValueError(f"World JSON validation failed at {list(e.path)}: {e.message}")
+    validate("world", world)
 
     return _save_world_impl(world)
 
 
-def save_choices(choice_json: dict):
-    choices = _ensure_choices_list(choice_json)
-
-    if not choices or not isinstance(choices, List):
-        raise ValueError("save_choice: Received empty or invalid list of choice objects")
-    
-    for choice in choices:
-        if not choice or not isinstance(choice, Dict):
-            raise ValueError("save_choice: Received empty or invalid list of choice objects")
+def _validated_choices(choice_json: Any) -> List[Dict]:
+    return normalize_and_validate("choice", choice_json, many=True, label="save_choices")
 
-        # Validate JSON
-        try:
-            jsonschema.validate(instance=choice, schema=choice_schema)
-        except jsonschema.ValidationError as e:
-            raise ValueError(f"Choice JSON validation failed at {list(e.path)}: {e.message}")
 
-    return _save_choices_impl(choices)
+def _validated_scene(scene_json: Any) -> Dict:
+    return normalize_and_validate("scene", scene_json)
 
 
-def save_scene(scene_json: dict):
-    scene = _ensure_scene_dict(scene_json)
+def save_choices(choice_json: dict):
+    return _save_choices_impl(_validated_choices(choice_json))
 
-    if not scene or not isinstance(scene, dict):
-        raise ValueError("save_scene: Received empty or invalid scene object")
-    
-    # Validate JSON
-    try:
-        jsonschema.validate(instance=scene, schema=scene_schema)
-    except jsonschema.ValidationError as e:
-        raise ValueError(f"Scene JSON validation failed at {list(e.path)}: {e.message}")
 
-    return _save_scene_impl(scene)
+def save_scene(scene_json: dict):
+    return _save_scene_impl(_validated_scene(scene_json))
 
 def attach_pregame_scene():
-    if not CURRENT_WORLD_ID:
+    state = current_state()
+    if not state.world_id:
         raise ValueError("No world_id available to attach pregame scene")
-    if not CURRENT_SCENE_ID:
+    if not state.scene_id:
         raise ValueError("No scene_id available to attach pregame scene")
 
-    return _link_pregame_scene_to_world(CURRENT_SCENE_ID, CURRENT_WORLD_ID)
+    return _link_pregame_scene_to_world(state.scene_id, state.world_id)
 
 
+# ----------------------
+# Per-turn commit
+# ----------------------
+class TurnCommit:
+    """
+    Stages everything a turn writes (next scene, LEADS_TO link from the chosen
+    choice, newly offered choices) and flushes it as one store commit.
+
+    Payloads are normalized and validated when staged; nothing reaches the store
+    and the session's ScribeState is untouched until commit(). On Neo4j, transient
+    errors are retried by the driver's managed transaction (NEO4J_MAX_RETRY_TIME).
+    """
+
+    def __init__(self):
+        self._scene: tuple | None = None
+        self._link_choice_id: str | None = None
+        self._choices: tuple | None = None
+
+    @property
+    def scene_id(self) -> str | None:
+        return self._scene[0] if self._scene else current_state().scene_id
+
+    def stage_scene(self, scene_json: Any) -> Dict:
+        scene = _validated_scene(scene_json)
+        self._scene = _prepare_scene(scene)
+        return scene
+
+    def stage_choice_link(self, choice_id: str) -> None:
+        self._link_choice_id = choice_id
+
+    def stage_choices(self, choice_json: Any) -> List[Dict]:
+        choices = _validated_choices(choice_json)
+        scene_id = self.scene_id
+        if not scene_id:
+            raise RuntimeError("No scene staged or CURRENT_SCENE_ID set — stage a scene before staging choices.")
+        self._choices = (scene_id, _prepare_choices(choices, scene_id))
+        return choices
 
+    def commit(self) -> str:
+        scene_id = self.scene_id
+        if self._link_choice_id and not scene_id:
+            raise RuntimeError("TurnCommit: cannot link a choice without a scene")
 
+        link = (self._link_choice_id, scene_id) if self._link_choice_id else None
 
+        _persist("turn", self._scene, link, self._choices)
+        current_state().scene_id = scene_id # Update session state
 
+        if self._scene:
+            SCENE_CACHE.put_scene(scene_id, self._scene[1])
+            _index_scene(*self._scene)
+            _observe_npcs(self._scene[2])
+        if self._choices:
+            SCENE_CACHE.put_choices(*self._choices)
 
+        choice_count = len(self._choices[1]) if self._choices else 0
+        return f"Turn committed (scene_id={scene_id}, choices={choice_count})."
 
 
 # ----------------------
-# NEO4J Data Accessors
+# Data Accessors
 # ----------------------
-def get_choices_for_scene():
-    global CURRENT_SCENE_ID
-    driver = _connect()
-    with driver.session() as session:
-        results = session.run(
-            """
-            MATCH (s:Scene {scene_id: $scene_id})-[:OFFERS]->(c:Choice)
-            RETURN DISTINCT c
-            """,
-            scene_id=CURRENT_SCENE_ID
-        )
-        choices = []
-        for record in results:
-            node_props = dict(record["c"].items())
-            choices.append(node_props)
+def get_choices_for_scene(scene_id: str | None = None):
+    scene_id = scene_id or current_state().scene_id
 
-        print(f"\n🎯 Available Choices for Scene {CURRENT_SCENE_ID}:", choices)
-        return choices
+    # Hot path: choices written earlier in this session are served from memory
+    choices = SCENE_CACHE.get_choices(scene_id)
+    if choices is None:
+        flush() # Read-your-writes when write-behind is on
+        choices = get_store().get_choices(scene_id)
+        # Nothing to cache for no scene or an unknown one; a scene's choices are cached when they are saved
+        if scene_id and choices:
+            SCENE_CACHE.put_choices(scene_id, choices)
+
+    print(f"\n🎯 Available Choices for Scene {scene_id}:", choices)
+    return choices
 
 
 def link_choice_to_scene(choice_id, scene_id):
-    driver = _connect()
-    with driver.session() as session:
-        # Create LEADS_TO relationship from choice -> new scene
-        session.run(
-            """
-            MATCH (c:Choice {choice_id: $choice_id})
-            MATCH (s:Scene {scene_id: $scene_id})
-            MERGE (c)-[:LEADS_TO]->(s)
-            """,
-            choice_id=choice_id,
-            scene_id=scene_id
-        )
\ No newline at end of file
+    _persist("choice_link", choice_id, scene_id)
+
+
+def get_story_history(scene_id: str | None = None, limit: int = 50) -> List[Dict]:
+    """Scenes and the choices taken between them, from the opening scene up to ``scene_id``."""
+    flush()
+    return get_store().history(scene_id or current_state().scene_id, limit=limit)
+
+
+def get_npc_memory(name_or_id: str) -> NPCMemory | None:
+    """An NPC of the current world by id or name, with its memory (see npc_memory.NPCMemoryBank)."""
+    return NPC_MEMORY.resolve(current_state().world_id, name_or_id)
+
+
+def record_npc_interaction(npc_id: str, player_text: str, npc_text: str, disposition_delta: int = 0, relationship: str | None = None) -> NPCMemory:
+    """Remember an exchange with an NPC in the current scene and persist it."""
+    return NPC_MEMORY.record(npc_id, current_state().scene_id, player_text, npc_text, disposition_delta, relationship)
+
+
+def get_story_graph(scene_id: str | None = None, limit: int = 50, recent_scenes: int = 3) -> Dict:
+    """
+    The story graph around ``scene_id`` in one read: the path from the
+    opening scene ({"path"}, as in get_story_history) and the NPCs of the
+    last ``recent_scenes`` scenes with their factions ({"npcs", "factions"}).
+    """
+    flush()
+    return get_store().retrieve(scene_id or current_state().scene_id, limit=limit, recent_scenes=recent_scenes)
@@ -0,0 +1,230 @@
+# src/dungeons_and_dragons/tools/semantic_index.py
+import json
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z0-9']+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+# Too common in narration to say anything about relevance
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i in is it its of on or she that the their them "
+    "they this to was were will with you your".split()
+)
+
+
+@dataclass
+class Fact:
+    kind: str # lore | faction | npc | scene
+    key: str
+    text: str
+    score: float = 0.0
+
+
+# ----------------------
+# Embedders
+# ----------------------
+class HashingEmbedder:
+    """
+    CPU-only, dependency-free embedding: words and word bigrams hashed into
+    ``dim`` signed buckets, L2-normalized. No model to download and
+    deterministic across processes; it matches on shared names and terms
+    rather than meaning, which is what recalling who/where/what needs.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _bucket(feature: str, dim: int) -> tuple:
+        h = zlib.crc32(feature.encode("utf-8"))
+        return h % dim, 1.0 if h & 0x80000000 else -1.0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                bucket, sign = self._bucket(feature, self.dim)
+                vectors[row, bucket] += sign
+        # Sublinear term frequency, so a name repeated ten times doesn't drown the rest
+        np.copyto(vectors, np.sign(vectors) * np.log1p(np.abs(vectors)))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEmbedder:
+    """A sentence-transformers model run on CPU (optional dependency)."""
+
+    def __init__(self, model: str):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError("ORION_EMBEDDER=st:<model> needs the sentence-transformers package") from e
+        self._model = SentenceTransformer(model, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def make_embedder(spec: str = "hashing"):
+    """``hashing`` (default), ``hashing:<dim>`` or ``st:<sentence-transformers model>``."""
+    name, _, arg = spec.partition(":")
+    if name == "hashing":
+        return HashingEmbedder(int(arg) if arg else 1024)
+    if name == "st":
+        return SentenceTransformerEmbedder(arg or "all-MiniLM-L6-v2")
+    raise ValueError(f"Unknown ORION_EMBEDDER '{spec}' (expected hashing[:dim] or st:<model>)")
+
+
+# ----------------------
+# Fact extraction
+# ----------------------
+def _passages(text: str, max_chars: int = 320) -> List[str]:
+    """Split prose into sentence-aligned passages of at most ~max_chars."""
+    passages, current = [], ""
+    for sentence in _SENTENCE.split(text.strip()):
+        if current and len(current) + len(sentence) > max_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current} {sentence}".strip()
+    if current:
+        passages.append(current)
+    return passages
+
+
+def _loads(value):
+    # Nested props are stored as JSON strings (scribe_tools._sanitize_props)
+    if isinstance(value, str) and value[:1] in "[{":
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            pass
+    return value
+
+
+def _npc_text(npc: Dict) -> str:
+    faction = _loads(npc.get("faction"))
+    characteristics = _loads(npc.get("characteristics"))
+    parts = [f"NPC {npc.get('name')}: {npc.get('desc') or npc.get('role') or ''}".rstrip(": ")]
+    if isinstance(faction, dict) and faction.get("name"):
+        parts.append(f"member of {faction['name']}")
+    if isinstance(characteristics, list) and characteristics:
+        parts.append(", ".join(map(str, characteristics)))
+    return "; ".join(parts)
+
+
+def _faction_text(faction: Dict) -> str:
+    details = "; ".join(
+        f"{k}: {', '.join(map(str, v)) if isinstance(v, list) else v}"
+        for k, v in faction.items()
+        if k not in ("faction_id", "name") and v not in (None, "", [])
+    )
+    return f"Faction {faction.get('name')}" + (f" — {details}" if details else "")
+
+
+def world_facts(world: Dict) -> List[Fact]:
+    world_id = world.get("world_id")
+    facts = [Fact("lore", f"world:{world_id}:lore:{i}", p) for i, p in enumerate(_passages(world.get("lore") or ""))]
+    for faction in world.get("factions", []):
+        facts.append(Fact("faction", f"faction:{world_id}.{faction.get('faction_id')}", _faction_text(faction)))
+    for npc in world.get("npc", []) + world.get("npcs", []):
+        facts.append(Fact("npc", f"npc:{world_id}.{npc.get('npc_id')}", _npc_text(npc)))
+    return facts
+
+
+def scene_facts(scene_id: str, scene: Dict, npc_rows: List[Dict]) -> List[Fact]:
+    title = scene.get("title")
+    text = scene.get("narration") or scene.get("description") or ""
+    facts = [Fact("scene", f"scene:{scene_id}:{i}", f"In '{title}': {p}") for i, p in enumerate(_passages(text))]
+    for row in npc_rows:
+        facts.append(Fact("npc", f"npc:{row['id']}", _npc_text(row["props"])))
+    return facts
+
+
+# ----------------------
+# Index
+# ----------------------
+class _Shelf:
+    """One world's facts: a row-per-fact matrix that grows by doubling."""
+
+    def __init__(self, dim: int):
+        self.vectors = np.zeros((64, dim), dtype=np.float32)
+        self.facts: List[Fact] = []
+        self.rows: Dict[str, int] = {}
+
+    def put(self, facts: List[Fact], vectors: np.ndarray) -> None:
+        for fact, vector in zip(facts, vectors):
+            row = self.rows.get(fact.key)
+            if row is None:
+                row = self.rows[fact.key] = len(self.facts)
+                self.facts.append(fact)
+                if row == len(self.vectors):
+                    self.vectors = np.concatenate([self.vectors, np.zeros_like(self.vectors)])
+            else:
+                self.facts[row] = fact # Re-saved entity: replace in place
+            self.vectors[row] = vector
+
+
+class SemanticIndex:
+    """
+    In-process vector index of a game's facts (scene passages, NPCs,
+    factions, world lore), kept per world so concurrent games never recall
+    each other's stories. Facts are embedded as the scribe saves them and
+    search() is one matrix-vector product per query, so recall costs the
+    same few milliseconds at turn 5 and turn 500.
+    """
+
+    def __init__(self, embedder=None):
+        self.embedder = embedder or HashingEmbedder()
+        self._shelves: Dict[str, _Shelf] = {}
+        self._lock = threading.Lock()
+
+    def add(self, world_id: str, facts: List[Fact]) -> None:
+        facts = [f for f in facts if f.text.strip()]
+        if not world_id or not facts:
+            return
+        vectors = self.embedder.embed([f.text for f in facts]) # Outside the lock: the slow part
+        with self._lock:
+            shelf = self._shelves.get(world_id)
+            if shelf is None:
+                shelf = self._shelves[world_id] = _Shelf(vectors.shape[1])
+            shelf.put(facts, vectors)
+
+    def search(self, world_id: str, query: str, k: int = 5, exclude: tuple = (), min_score: float = 0.05) -> List[Fact]:
+        """The ``k`` facts most similar to ``query``; keys starting with any of ``exclude`` are skipped."""
+        if not query.strip():
+            return []
+        q = self.embedder.embed([query])[0]
+        with self._lock:
+            shelf = self._shelves.get(world_id)
+            if shelf is None or not shelf.facts:
+                return []
+            scores = shelf.vectors[: len(shelf.facts)] @ q
+            facts = list(shelf.facts)
+
+        results = []
+        for row in np.argsort(-scores):
+            if scores[row] < min_score or len(results) >= k:
+                break
+            fact = facts[row]
+            if exclude and fact.key.startswith(exclude):
+                continue
+            results.append(Fact(fact.kind, fact.key, fact.text, float(scores[row])))
+        return results
+
+    def size(self, world_id: str) -> int:
+        with self._lock:
+            shelf = self._shelves.get(world_id)
+            return len(shelf.facts) if shelf else 0
+
+    def drop_world(self, world_id: str) -> None:
+        with self._lock:
+            self._shelves.pop(world_id, None)
@@ -0,0 +1,224 @@
+# src/dungeons_and_dragons/tools/sqlite_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List
+
+from dungeons_and_dragons import metrics
+from dungeons_and_dragons.tools.story_store import Mutation, StoryStore, rekey_world
+
+
+class SQLiteStore(StoryStore):
+    """
+    The story graph in a single SQLite file, for single-node deployments
+    without Neo4j.
+
+    Nodes are (label, id, props JSON) rows whose properties are merged with
+    json_patch (a null removes the property, like Cypher's SET +=); edges
+    are (rel, src, dst) rows indexed both ways. Each commit is one SQLite
+    transaction.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS nodes (
+                label TEXT NOT NULL,
+                id TEXT NOT NULL,
+                props TEXT NOT NULL,
+                PRIMARY KEY (label, id)
+            );
+            CREATE TABLE IF NOT EXISTS edges (
+                rel TEXT NOT NULL,
+                src TEXT NOT NULL,
+                dst TEXT NOT NULL,
+                UNIQUE (rel, src, dst)
+            );
+            CREATE INDEX IF NOT EXISTS edges_by_dst ON edges (rel, dst);
+            """
+        )
+        self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def is_transient(self, error: Exception) -> bool:
+        # Another process holding the file; anything else is the data's fault
+        return isinstance(error, sqlite3.OperationalError) and ("locked" in str(error) or "busy" in str(error))
+
+    # ----------------------
+    # Graph primitives
+    # ----------------------
+    @staticmethod
+    def _merge_node(cur, label: str, node_id: str, props: Dict) -> None:
+        cur.execute(
+            """
+            INSERT INTO nodes (label, id, props) VALUES (?, ?, json_patch('{}', ?))
+            ON CONFLICT (label, id) DO UPDATE SET props = json_patch(nodes.props, excluded.props)
+            """,
+            (label, node_id, json.dumps(props)),
+        )
+
+    @staticmethod
+    def _link(cur, rel: str, src_label: str, src: str, dst_label: str, dst: str) -> None:
+        cur.execute(
+            """
+            INSERT OR IGNORE INTO edges (rel, src, dst)
+            SELECT ?, ?, ?
+            WHERE EXISTS (SELECT 1 FROM nodes WHERE label = ? AND id = ?)
+              AND EXISTS (SELECT 1 FROM nodes WHERE label = ? AND id = ?)
+            """,
+            (rel, src, dst, src_label, src, dst_label, dst),
+        )
+
+    @staticmethod
+    def _node(cur, label: str, node_id: str) -> Dict | None:
+        row = cur.execute("SELECT props FROM nodes WHERE label = ? AND id = ?", (label, node_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _source(cur, rel: str, dst: str) -> str | None:
+        row = cur.execute("SELECT src FROM edges WHERE rel = ? AND dst = ? ORDER BY rowid LIMIT 1", (rel, dst)).fetchone()
+        return row[0] if row else None
+
+    # ----------------------
+    # Writes
+    # ----------------------
+    def commit(self, mutations: List[Mutation]) -> List[Any]:
+        t0 = time.perf_counter()
+        with self._lock, self._db:
+            cur = self._db.cursor()
+            results = [self._apply(cur, op, args) for op, args in mutations]
+        metrics.record_db(mutations[0][0] if len(mutations) == 1 else "batch", time.perf_counter() - t0, 0)
+        return results
+
+    def _write_world(self, cur, world_id: str, props: Dict, faction_rows: List[Dict], npc_rows: List[Dict]) -> str:
+        if world_id and self._node(cur, "World", world_id) is not None:
+            world_id, props, faction_rows, npc_rows = rekey_world(props, faction_rows, npc_rows)
+
+        self._merge_node(cur, "World", world_id, {**props, "world_id": world_id})
+        for row in faction_rows:
+            self._merge_node(cur, "Faction", row["id"], {**row["props"], "faction_id": row["id"]})
+            self._link(cur, "HAS_FACTION", "World", world_id, "Faction", row["id"])
+        for row in npc_rows:
+            self._merge_node(cur, "NPC", row["id"], {**row["props"], "npc_id": row["id"]})
+            self._link(cur, "HAS_NPC", "World", world_id, "NPC", row["id"])
+        return world_id
+
+    def _write_scene(self, cur, scene_id: str, props: Dict, npc_rows: List[Dict]) -> None:
+        self._merge_node(cur, "Scene", scene_id, {**props, "scene_id": scene_id})
+        for row in npc_rows:
+            self._merge_node(cur, "NPC", row["id"], {**row["props"], "npc_id": row["id"]})
+            self._link(cur, "HAS_NPC", "Scene", scene_id, "NPC", row["id"])
+
+    def _write_choices(self, cur, scene_id: str, rows: List[Dict]) -> None:
+        for row in rows:
+            self._merge_node(cur, "Choice", row["choice_id"], row)
+            self._link(cur, "OFFERS", "Scene", scene_id, "Choice", row["choice_id"])
+
+    def _write_pregame_link(self, cur, scene_id: str, world_id: str) -> None:
+        self._link(cur, "OPENS_WITH", "World", world_id, "Scene", scene_id)
+
+    def _write_choice_link(self, cur, choice_id: str, scene_id: str) -> None:
+        self._link(cur, "LEADS_TO", "Choice", choice_id, "Scene", scene_id)
+
+    def _write_npc_memory(self, cur, npc_id: str, props: Dict, interaction: Dict) -> None:
+        if self._node(cur, "NPC", npc_id) is None:
+            return
+        self._merge_node(cur, "NPC", npc_id, props)
+        self._merge_node(cur, "Interaction", interaction["interaction_id"], interaction)
+        self._link(cur, "HAD_INTERACTION", "NPC", npc_id, "Interaction", interaction["interaction_id"])
+        if interaction.get("scene_id"):
+            self._link(cur, "DURING", "Interaction", interaction["interaction_id"], "Scene", interaction["scene_id"])
+
+    # ----------------------
+    # Reads
+    # ----------------------
+    def get_scene(self, scene_id: str) -> Dict | None:
+        with self._lock:
+            return self._node(self._db, "Scene", scene_id)
+
+    def get_choices(self, scene_id: str) -> List[Dict]:
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT n.props FROM edges e
+                JOIN nodes n ON n.label = 'Choice' AND n.id = e.dst
+                WHERE e.rel = 'OFFERS' AND e.src = ?
+                ORDER BY e.rowid
+                """,
+                (scene_id,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def npc_memory(self, npc_id: str, limit: int = 5) -> Dict:
+        with self._lock:
+            npc = self._node(self._db, "NPC", npc_id)
+            rows = self._db.execute(
+                """
+                SELECT i.props FROM edges e
+                JOIN nodes i ON i.label = 'Interaction' AND i.id = e.dst
+                WHERE e.rel = 'HAD_INTERACTION' AND e.src = ?
+                ORDER BY e.rowid DESC LIMIT ?
+                """,
+                (npc_id, max(limit, 0)),
+            ).fetchall()
+        return {"npc": npc, "interactions": [json.loads(row[0]) for row in reversed(rows)]}
+
+    def _path(self, scene_id: str, limit: int) -> List[Dict]:
+        scene = self._node(self._db, "Scene", scene_id)
+        if scene is None:
+            return []
+
+        entries = []
+        while True:
+            entries.append({"choice": None, "scene": scene})
+            choice_id = self._source(self._db, "LEADS_TO", scene["scene_id"])
+            if len(entries) >= limit or choice_id is None:
+                break
+            previous_id = self._source(self._db, "OFFERS", choice_id)
+            if previous_id is None:
+                break
+            entries[-1]["choice"] = self._node(self._db, "Choice", choice_id)
+            scene = self._node(self._db, "Scene", previous_id)
+
+        entries.reverse()
+        return entries
+
+    def history(self, scene_id: str, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            return self._path(scene_id, limit)
+
+    def retrieve(self, scene_id: str, limit: int = 50, recent_scenes: int = 3) -> Dict:
+        with self._lock:
+            path = self._path(scene_id, limit)
+            recent = [entry["scene"]["scene_id"] for entry in reversed(path[-recent_scenes:] if recent_scenes > 0 else [])]
+            npcs: Dict[str, Dict] = {}
+            factions: Dict[str, Dict] = {}
+            for recent_id in recent:
+                rows = self._db.execute(
+                    """
+                    SELECT n.id, n.props, f.props FROM edges e
+                    JOIN nodes n ON n.label = 'NPC' AND n.id = e.dst
+                    LEFT JOIN nodes f ON f.label = 'Faction' AND f.id = json_extract(n.props, '$.faction_ref')
+                    WHERE e.rel = 'HAS_NPC' AND e.src = ?
+                    ORDER BY e.rowid
+                    """,
+                    (recent_id,),
+                ).fetchall()
+                for npc_id, npc, faction in rows:
+                    npcs.setdefault(npc_id, json.loads(npc))
+                    if faction:
+                        faction = json.loads(faction)
+                        factions.setdefault(faction["faction_id"], faction)
+        return {"path": path, "npcs": list(npcs.values()), "factions": list(factions.values())}
@@ -0,0 +1,127 @@
+# src/dungeons_and_dragons/tools/story_store.py
+import os
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Tuple
+
+# (op, args) as built by scribe_tools and journaled by WriteBehindQueue:
+#   ("world", [world_id, props, faction_rows, npc_rows])  -> returns the stored world_id
+#   ("scene", [scene_id, props, npc_rows])
+#   ("choices", [scene_id, rows])
+#   ("pregame_link", [scene_id, world_id])
+#   ("choice_link", [choice_id, scene_id])
+#   ("turn", [scene | None, link | None, choices | None])  # args of the three above
+#   ("npc_memory", [npc_id, props, interaction])          # standing props + one Interaction row
+Mutation = Tuple[str, list]
+
+
+class StoryStore(ABC):
+    """
+    Persistence for the story graph:
+
+      (World)-[:HAS_FACTION]->(Faction), (World)-[:HAS_NPC]->(NPC),
+      (World)-[:OPENS_WITH]->(Scene)-[:OFFERS]->(Choice)-[:LEADS_TO]->(Scene),
+      (Scene)-[:HAS_NPC]->(NPC),
+      (NPC)-[:HAD_INTERACTION]->(Interaction)-[:DURING]->(Scene)
+
+    Writes arrive as batches of mutations and are applied atomically by
+    commit(). Implementations provide one ``_write_<op>(target, *args)``
+    per op, where ``target`` is whatever their transaction handle is.
+    Properties are merged into existing nodes (like Cypher's ``SET +=``),
+    and relationships are only created when both ends exist. A backend
+    missing one of the abstract methods fails when it is constructed,
+    not in the middle of a game.
+    """
+
+    name = "store"
+
+    @abstractmethod
+    def commit(self, mutations: List[Mutation]) -> List[Any]:
+        """Apply ``mutations`` in one transaction; returns each op's result."""
+        ...
+
+    @abstractmethod
+    def get_scene(self, scene_id: str) -> Dict | None:
+        ...
+
+    @abstractmethod
+    def get_choices(self, scene_id: str) -> List[Dict]:
+        """Choices the scene OFFERS."""
+        ...
+
+    @abstractmethod
+    def history(self, scene_id: str, limit: int = 50) -> List[Dict]:
+        """
+        The path that led to ``scene_id``, oldest first, as
+        ``{"choice": <choice taken or None>, "scene": <scene>}`` entries
+        (at most ``limit`` scenes, ending with ``scene_id`` itself).
+        """
+        ...
+
+    @abstractmethod
+    def retrieve(self, scene_id: str, limit: int = 50, recent_scenes: int = 3) -> Dict:
+        """
+        history(scene_id, limit) as ``path`` plus, in the same read, the
+        NPCs that appear in the last ``recent_scenes`` scenes of it (newest
+        first, as ``npcs``) and the factions those NPCs belong to
+        (``factions``).
+        """
+        ...
+
+    @abstractmethod
+    def npc_memory(self, npc_id: str, limit: int = 5) -> Dict:
+        """The NPC's properties (``npc``, None if unknown) and its last ``limit`` interactions, oldest first."""
+        ...
+
+    def check_health(self) -> bool:
+        return True
+
+    def is_transient(self, error: Exception) -> bool:
+        """Whether a failed commit() may succeed if retried (as opposed to bad data)."""
+        return isinstance(error, (ConnectionError, TimeoutError))
+
+    def close(self) -> None:
+        pass
+
+    def _apply(self, target: Any, op: str, args: list) -> Any:
+        return getattr(self, f"_write_{op}")(target, *args)
+
+    def _write_turn(self, target: Any, scene: list | None, link: list | None, choices: list | None) -> None:
+        if scene:
+            self._write_scene(target, *scene)
+        if link:
+            self._write_choice_link(target, *link)
+        if choices:
+            self._write_choices(target, *choices)
+
+
+def rekey_world(props: Dict, faction_rows: List[Dict], npc_rows: List[Dict]) -> tuple:
+    """A world with this id already exists: move the world and its rows to a fresh id."""
+    world_id = str(uuid.uuid4())
+    props = {**props, "world_id": world_id}
+    faction_rows = [{**r, "id": f"{world_id}.{r['raw_id']}"} for r in faction_rows]
+    npc_rows = [{**r, "id": f"{world_id}.{r['raw_id']}", "props": _rekey_faction_ref(r["props"], world_id)} for r in npc_rows]
+    return world_id, props, faction_rows, npc_rows
+
+
+def _rekey_faction_ref(props: Dict, world_id: str) -> Dict:
+    if not props.get("faction_ref"):
+        return props
+    return {**props, "faction_ref": f"{world_id}.{props['faction_ref'].split('.', 1)[-1]}"}
+
+
+def open_store(kind: str | None = None) -> StoryStore:
+    """Build the backend named by ``kind`` or ORION_STORE (neo4j, memory, sqlite)."""
+    kind = (kind or os.getenv("ORION_STORE", "neo4j")).lower()
+
+    # Backends are imported on demand so memory/sqlite play doesn't need the neo4j driver
+    if kind == "neo4j":
+        from dungeons_and_dragons.tools.neo4j_store import Neo4jStore
+        return Neo4jStore()
+    if kind == "memory":
+        from dungeons_and_dragons.tools.memory_store import MemoryStore
+        return MemoryStore()
+    if kind == "sqlite":
+        from dungeons_and_dragons.tools.sqlite_store import SQLiteStore
+        return SQLiteStore(os.getenv("ORION_SQLITE_PATH", ".orion/story.sqlite"))
+    raise ValueError(f"Unknown ORION_STORE '{kind}' (expected neo4j, memory or sqlite)")
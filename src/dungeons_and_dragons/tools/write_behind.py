@@ -0,0 +1,215 @@
+# src/dungeons_and_dragons/tools/write_behind.py
+import json
+import os
+import queue
+import threading
+import time
+from typing import Callable, List, Tuple
+
+Mutation = Tuple[str, list]
+
+
+class WriteBehindQueue:
+    """
+    Background persistence for scribe mutations.
+
+    submit() appends the mutation to a local append-only journal and hands it
+    to a worker thread, which drains up to ``batch_size`` mutations at a time
+    and applies them with ``apply_batch`` (one transaction per batch). Once a
+    batch commits an ack line is journaled; unacked entries are replayed by
+    replay() on the next start.
+
+    Durability: submit() only writes the entry to the OS (no fsync on the
+    caller's thread), so a process crash loses nothing that was submitted.
+    With ``fsync`` the worker syncs the journal once per batch, before
+    applying it, so an OS crash or power loss can lose the mutations
+    submitted since the last batch started — at most one batch drain,
+    longer while the store is down and the worker is retrying.
+
+    Failures for which ``is_transient(error)`` holds (store unreachable,
+    deadlock, ...) are retried with backoff. Any other failure is permanent:
+    the batch is retried one mutation at a time to isolate the bad one,
+    which is written to the dead-letter file (``<journal>.dead``) with its
+    error and acked, so it can't block the queue; ``on_dead_letter(mutation)``
+    then lets the caller drop whatever it cached from it.
+
+    The queue is bounded: when ``max_pending`` mutations are waiting, submit()
+    blocks until the worker catches up.
+    """
+
+    def __init__(
+        self,
+        apply_batch: Callable[[List[Mutation]], None],
+        journal_path: str,
+        max_pending: int = 256,
+        batch_size: int = 32,
+        fsync: bool = True,
+        is_transient: Callable[[Exception], bool] | None = None,
+        dead_letter_path: str | None = None,
+        on_dead_letter: Callable[[Mutation], None] | None = None,
+    ):
+        self._apply_batch = apply_batch
+        self._is_transient = is_transient or (lambda e: isinstance(e, (ConnectionError, TimeoutError)))
+        self._journal_path = journal_path
+        self._dead_letter_path = dead_letter_path or f"{journal_path}.dead"
+        self._on_dead_letter = on_dead_letter
+        self.dead_letters = 0
+        self._batch_size = batch_size
+        self._fsync = fsync
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._journal_lock = threading.Lock()
+        self._seq = 0
+        self._closed = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(journal_path)), exist_ok=True)
+        self._journal = open(journal_path, "a", encoding="utf-8")
+
+        self._worker = threading.Thread(target=self._run, name="scribe-write-behind", daemon=True)
+        self._worker.start()
+
+    # ----------------------
+    # Journal
+    # ----------------------
+    def _append(self, entry: dict) -> None:
+        # Handed to the OS only; _sync() makes it durable
+        self._journal.write(json.dumps(entry) + "\n")
+        self._journal.flush()
+
+    def _sync(self) -> None:
+        with self._journal_lock:
+            if self._fsync and not self._journal.closed:
+                os.fsync(self._journal.fileno())
+
+    def _compact(self, entries: List[dict] | None = None) -> None:
+        # Everything else journaled so far is acked: swap in a journal holding
+        # only ``entries``, written and synced before the old one is replaced
+        tmp_path = f"{self._journal_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as tmp:
+            for entry in entries or []:
+                tmp.write(json.dumps(entry) + "\n")
+            tmp.flush()
+            if self._fsync:
+                os.fsync(tmp.fileno())
+        self._journal.close()
+        os.replace(tmp_path, self._journal_path)
+        self._journal = open(self._journal_path, "a", encoding="utf-8")
+
+    def replay(self) -> int:
+        """Re-submit mutations journaled by a previous run that never committed."""
+        pending: dict[int, Mutation] = {}
+        acked = 0
+        with self._journal_lock:
+            with open(self._journal_path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final line from a crash mid-append
+                        continue
+                    if "ack" in entry:
+                        acked = max(acked, entry["ack"])
+                    else:
+                        pending[entry["seq"]] = (entry["op"], entry["args"])
+
+            entries = []
+            for _, (op, args) in sorted(m for m in pending.items() if m[0] > acked):
+                self._seq += 1
+                entries.append({"seq": self._seq, "op": op, "args": args})
+            # The unacked mutations are re-journaled in the same step that drops the old journal
+            self._compact(entries)
+
+        for entry in entries:
+            self._queue.put((entry["seq"], (entry["op"], entry["args"])))
+        return len(entries)
+
+    # ----------------------
+    # Producer side
+    # ----------------------
+    def submit(self, op: str, args: list) -> None:
+        if self._closed:
+            raise RuntimeError("WriteBehindQueue is closed")
+
+        with self._journal_lock:
+            self._seq += 1
+            seq = self._seq
+            self._append({"seq": seq, "op": op, "args": args})
+        # Blocks when max_pending mutations are already waiting (back-pressure)
+        self._queue.put((seq, (op, args)))
+
+    @property
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every submitted mutation is committed. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float | None = None) -> bool:
+        drained = self.flush(timeout)
+        self._closed = True
+        with self._journal_lock:
+            self._journal.close()
+        return drained
+
+    # ----------------------
+    # Worker
+    # ----------------------
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # One fsync covers every mutation submitted since the last batch
+            self._sync()
+            self._apply(batch)
+
+            with self._journal_lock:
+                if not self._journal.closed:
+                    self._append({"ack": batch[-1][0]})
+                    if self._queue.empty() and self._seq == batch[-1][0]:
+                        self._compact()
+
+            for _ in batch:
+                self._queue.task_done()
+
+    def _apply(self, batch: List[Tuple[int, Mutation]]) -> None:
+        backoff = 0.1
+        while True:
+            try:
+                self._apply_batch([mutation for _, mutation in batch])
+                return
+            except Exception as e:
+                if not self._is_transient(e):
+                    if len(batch) > 1:
+                        # The batch rolled back as a whole: find the bad mutation(s)
+                        for item in batch:
+                            self._apply([item])
+                    else:
+                        self._dead_letter(batch[0], e)
+                    return
+                # Keep the batch (it is still in the journal) and retry
+                print(f"⚠️ Write-behind flush failed, retrying in {backoff:.1f}s: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
+
+    def _dead_letter(self, item: Tuple[int, Mutation], error: Exception) -> None:
+        seq, (op, args) = item
+        print(f"❌ Write-behind dropped mutation #{seq} ({op}): {error} — kept in {self._dead_letter_path}")
+        self.dead_letters += 1
+        with self._journal_lock:
+            with open(self._dead_letter_path, "a", encoding="utf-8") as dead:
+                dead.write(json.dumps({"seq": seq, "op": op, "args": args, "error": repr(error), "at": time.time()}) + "\n")
+        if self._on_dead_letter is not None:
+            try:
+                self._on_dead_letter((op, args))
+            except Exception as e:
+                print(f"⚠️ Write-behind dead-letter hook failed for #{seq}: {e}")
@@ -0,0 +1,142 @@
+# src/dungeons_and_dragons/world_pool.py
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict
+
+from dungeons_and_dragons.game import Crews, setup_game
+from dungeons_and_dragons.tools.scribe_tools import ScribeState, forget_world, use_state
+
+
+@dataclass
+class PooledWorld:
+    """A game set up ahead of time: world, opening scene and its choices are persisted under ``scribe``."""
+    scribe: ScribeState
+    world_data: Dict
+    scene_data: Dict
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class WorldPool:
+    """
+    Keeps up to ``size`` ready-to-play worlds, set up in the background by
+    ``workers`` threads with a crew set of their own each (``build_crews()``),
+    so starting a game is claim() instead of a full setup_game().
+
+    A claim takes the oldest world and wakes a worker to replace it. Worlds
+    not claimed within ``max_age`` seconds are discarded and replaced, so
+    players never get one made with prompts or models long since changed;
+    discarded worlds stay in the store like any abandoned game. A failed
+    setup is retried after an exponential backoff (capped at 5 minutes).
+    """
+
+    def __init__(
+        self,
+        build_crews: Callable[[], Crews],
+        size: int = 2,
+        workers: int = 1,
+        max_age: float = 6 * 3600,
+        parallelism: int = 0,
+    ):
+        self._build_crews = build_crews
+        self.size = size
+        self.workers = workers
+        self.max_age = max_age
+        self.parallelism = parallelism
+        self.stats: Counter = Counter() # built, claimed, missed, expired, failed
+        self._ready: deque[PooledWorld] = deque()
+        self._building = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def start(self) -> "WorldPool":
+        for i in range(self.workers):
+            threading.Thread(target=self._run, name=f"world-pool-{i}", daemon=True).start()
+        return self
+
+    # ----------------------
+    # Claiming
+    # ----------------------
+    def claim(self) -> PooledWorld | None:
+        """A ready world, or None when the pool is empty (the caller sets one up itself)."""
+        with self._cond:
+            self._expire()
+            if self._ready:
+                world = self._ready.popleft()
+                self.stats["claimed"] += 1
+            else:
+                world = None
+                self.stats["missed"] += 1
+            if len(self._ready) + self._building < self.size:
+                self._cond.notify()
+        return world
+
+    def status(self) -> Dict:
+        with self._cond:
+            return {"size": self.size, "ready": len(self._ready), "building": self._building, **self.stats}
+
+    def close(self) -> None:
+        """Stop refilling and forget the unclaimed worlds; setups in flight finish and are dropped."""
+        with self._cond:
+            self._closed = True
+            while self._ready:
+                forget_world(self._ready.popleft().scribe.world_id)
+            self._cond.notify_all()
+
+    # ----------------------
+    # Refill
+    # ----------------------
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.max_age
+        while self._ready and self._ready[0].created_at < cutoff:
+            forget_world(self._ready.popleft().scribe.world_id)
+            self.stats["expired"] += 1
+
+    def _wait_timeout(self) -> float | None:
+        # Wake up when the oldest ready world goes stale, or on a claim/close
+        if not self._ready:
+            return None
+        return max(self._ready[0].created_at + self.max_age - time.monotonic(), 0.0)
+
+    def _run(self) -> None:
+        crews = self._build_crews()
+        failures = 0
+        while True:
+            with self._cond:
+                while True:
+                    self._expire()
+                    if self._closed or len(self._ready) + self._building < self.size:
+                        break
+                    self._cond.wait(self._wait_timeout())
+                if self._closed:
+                    return
+                self._building += 1
+
+            try:
+                world = self._set_up(crews)
+            except Exception as e:
+                failures += 1
+                backoff = min(2 ** failures, 300)
+                print(f"⚠️ World pool setup failed ({e}) — retrying in {backoff}s")
+                with self._cond:
+                    self._building -= 1
+                    self.stats["failed"] += 1
+                    self._cond.wait_for(lambda: self._closed, timeout=backoff)
+                continue
+
+            failures = 0
+            with self._cond:
+                self._building -= 1
+                if self._closed:
+                    forget_world(world.scribe.world_id)
+                    return
+                self._ready.append(world)
+                self.stats["built"] += 1
+                print(f"🗺️ World pool: '{world.world_data.get('name')}' ready ({len(self._ready)}/{self.size})")
+
+    def _set_up(self, crews: Crews) -> PooledWorld:
+        scribe = ScribeState()
+        with use_state(scribe):
+            world_data, scene_data = setup_game(crews, parallelism=self.parallelism)
+        return PooledWorld(scribe, world_data, scene_data)